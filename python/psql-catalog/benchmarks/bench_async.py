@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare describe-all with PostgreSQLCatalog and AsyncPostgreSQLCatalog.
+
+Describes --schema with the per-table queries (the path whose cost grows with
+the number of tables) using the synchronous catalog, then with the async
+catalog and each --pool-sizes value, and reports the wall time and the speedup
+over the synchronous catalog. Both catalogs must return the same tables.
+
+With --latency-ms the connections go through the delaying TCP proxy of
+bench_fanout.py, to reproduce a remote server with a local database.
+
+Usage:
+    python benchmarks/bench_async.py --db $DB_CONN --schema public --pool-sizes 1,4,8,16
+    python benchmarks/bench_async.py --db $DB_CONN --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from bench_fanout import LatencyProxy
+from psql_catalog.async_catalog import AsyncPostgreSQLCatalog
+from psql_catalog.catalog import PostgreSQLCatalog
+
+console = Console()
+
+
+async def describe_async(dsn: str, args: argparse.Namespace, pool_size: int) -> Dict[str, Any]:
+    """Describe the schema with the async catalog and a pool of pool_size connections."""
+    async with AsyncPostgreSQLCatalog(dsn, args.backend, pool_size=pool_size) as catalog:
+        return await catalog.describe_all_tables(args.schema, args.constraints, batched=args.batched)
+
+
+def main() -> None:
+    """Command-line interface for the async catalog benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the async catalog against the synchronous one")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='public', help='Schema to describe')
+    parser.add_argument('--pool-sizes', default='1,4,8,16', help='Comma-separated async pool sizes')
+    parser.add_argument('--backend', default='pg_catalog', help='Catalog query backend')
+    parser.add_argument('--constraints', action='store_true', help='Include constraints')
+    parser.add_argument('--batched', action='store_true', help='Use the schema-wide queries instead')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated round-trip time to the server')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    dsn = LatencyProxy(args.db, args.latency_ms).dsn if args.latency_ms else args.db
+
+    start = time.perf_counter()
+    with PostgreSQLCatalog(dsn, args.backend) as catalog:
+        expected = catalog.describe_all_tables(args.schema, args.constraints, batched=args.batched)
+    results: Dict[str, float] = {'sync': time.perf_counter() - start}
+
+    for pool_size in (int(value) for value in args.pool_sizes.split(',')):
+        start = time.perf_counter()
+        described = asyncio.run(describe_async(dsn, args, pool_size))
+        results[f"async, pool of {pool_size}"] = time.perf_counter() - start
+        if described != expected:
+            console.print(f"[red]Async result with a pool of {pool_size} differs from the synchronous one[/red]")
+
+    title = f"describe-all of {args.schema} ({expected['_metadata']['total_processed']} tables"
+    title += f", {args.latency_ms:g} ms simulated round trip)" if args.latency_ms else ")"
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Catalog")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+    for name, seconds in results.items():
+        table.add_row(name, f"{seconds:.2f}", f"{results['sync'] / seconds:.1f}x")
+    console.print(table)
+
+    write_json_results(args.json_output, {
+        'schema': args.schema, 'tables': expected['_metadata']['total_processed'],
+        'latency_ms': args.latency_ms, 'results': results
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Measure encode/decode throughput of the result dataclass codec.
+
+Builds a synthetic DescribeAllResult (--tables tables with 8 columns, 2 indexes,
+3 constraints and 1 foreign key each, by default 10,000 tables) and compares:
+
+- asdict + json: the previous as_json (json.dumps(asdict(result)) with a default hook)
+  and from_json (cls(**json.loads(...)), which leaves nested tables as dicts)
+- codec (json): psql_catalog.codec with the json module
+- codec (orjson): psql_catalog.codec with orjson, when installed
+
+No database is needed.
+
+Usage:
+    python benchmarks/bench_codec.py --tables 10000 --repeat 3
+"""
+
+import argparse
+import json
+import statistics
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_json_argument, write_json_results
+from psql_catalog import codec
+from psql_catalog.serialization import DescribeAllResult, TableStructure, create_describe_all_result
+
+console = Console()
+
+
+def build_result(table_count: int) -> DescribeAllResult:
+    """Build a describe-all result with table_count similar tables."""
+    tables = {}
+    for t in range(table_count):
+        name = f"table_{t}"
+        tables[name] = TableStructure(
+            columns=[
+                {
+                    'column_name': f"column_{c}",
+                    'data_type': 'integer' if c % 2 else 'character varying',
+                    'is_nullable': 'YES' if c else 'NO',
+                    'column_default': f"nextval('{name}_id_seq'::regclass)" if c == 0 else None,
+                    'character_maximum_length': None if c % 2 else 255,
+                    'numeric_precision': 32 if c % 2 else None,
+                    'numeric_scale': 0 if c % 2 else None,
+                }
+                for c in range(8)
+            ],
+            indexes=[
+                {'index_name': f"{name}_pkey", 'column_name': 'column_0', 'is_unique': True, 'is_primary': True},
+                {'index_name': f"{name}_column_1_idx", 'column_name': 'column_1', 'is_unique': False, 'is_primary': False},
+            ],
+            constraints=[
+                {
+                    'constraint_name': f"{name}_{kind}",
+                    'constraint_type': kind.upper(),
+                    'table_name': name,
+                    'table_schema': 'public',
+                    'column_name': 'column_0',
+                    'foreign_table_column': None,
+                    'check_clause': None,
+                    'is_deferrable': 'NO',
+                    'initially_deferred': 'NO',
+                }
+                for kind in ('pkey', 'check', 'unique')
+            ],
+            foreign_key_details=[{
+                'constraint_name': f"{name}_fkey",
+                'column_name': 'column_1',
+                'foreign_table_schema': 'public',
+                'foreign_table_name': f"table_{(t + 1) % table_count}",
+                'foreign_column_name': 'column_0',
+                'on_update': 'NO ACTION',
+                'on_delete': 'CASCADE',
+                'is_deferrable': 'NO',
+                'initially_deferred': 'NO',
+            }],
+        )
+    return create_describe_all_result(tables, 'benchdb', 'public', show_constraints=True)
+
+
+def legacy_dumps(result: DescribeAllResult, indent: Optional[int]) -> str:
+    """The previous as_json implementation."""
+    def default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+    return json.dumps(asdict(result), indent=indent, default=default)
+
+
+def legacy_loads(document: str) -> DescribeAllResult:
+    """The previous from_json implementation."""
+    return DescribeAllResult(**json.loads(document))
+
+
+def best_of(action: Callable[[], Any], repeat: int) -> float:
+    """Median seconds of repeat runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Command-line interface for the codec benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the result dataclass codec")
+    parser.add_argument('--tables', type=int, default=10_000, help='Tables in the DescribeAllResult')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement')
+    parser.add_argument('--indent', type=int, default=2, help='JSON indentation (-1 for compact output)')
+    add_json_argument(parser)
+    args = parser.parse_args()
+    indent = None if args.indent < 0 else args.indent
+
+    result = build_result(args.tables)
+    document = legacy_dumps(result, indent)
+    size_mb = len(document.encode('utf-8')) / 2 ** 20
+
+    orjson_module = codec.orjson
+    implementations: Dict[str, Any] = {'asdict + json': None, 'codec (json)': None}
+    if orjson_module is not None:
+        implementations['codec (orjson)'] = orjson_module
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, backend in implementations.items():
+        if name == 'asdict + json':
+            encode, decode = (lambda: legacy_dumps(result, indent)), (lambda: legacy_loads(document))
+        else:
+            encode, decode = (lambda: codec.dumps(result, indent)), (lambda: codec.loads(DescribeAllResult, document))
+        codec.orjson = backend
+        try:
+            results[name] = {'encode_seconds': best_of(encode, args.repeat), 'decode_seconds': best_of(decode, args.repeat)}
+        finally:
+            codec.orjson = orjson_module
+
+    decoded = codec.loads(DescribeAllResult, codec.dumps(result, indent))
+    assert decoded == result, "codec round trip changed the result"
+
+    table = Table(
+        title=f"DescribeAllResult with {args.tables:,} tables ({size_mb:.1f} MB of JSON, indent={indent})",
+        show_header=True,
+        header_style="bold magenta"
+    )
+    table.add_column("Implementation")
+    table.add_column("Encode (s)", justify="right")
+    table.add_column("Encode MB/s", justify="right")
+    table.add_column("Decode (s)", justify="right")
+    table.add_column("Decode MB/s", justify="right")
+    for name, measured in results.items():
+        table.add_row(
+            name,
+            f"{measured['encode_seconds']:.3f}",
+            f"{size_mb / measured['encode_seconds']:.0f}",
+            f"{measured['decode_seconds']:.3f}",
+            f"{size_mb / measured['decode_seconds']:.0f}",
+        )
+    console.print(table)
+    console.print("asdict + json decode leaves the tables as plain dicts; the codec rebuilds TableStructure objects.")
+
+    write_json_results(args.json_output, {'tables': args.tables, 'size_mb': size_mb, 'indent': indent, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Command-line options and result output shared by the benchmark scripts.
+
+Every script takes the database as --db and can write its results to the JSON
+file given as --json; the helpers below keep those options and the file format
+(indented UTF-8 JSON) the same everywhere.
+"""
+
+import argparse
+import json
+from typing import Any, Dict, Optional
+
+
+def add_db_argument(parser: argparse.ArgumentParser, repeatable: bool = False) -> None:
+    """
+    Add the required --db option.
+
+    Args:
+        parser: Parser of the benchmark script
+        repeatable: Accept several --db options, collected in a list
+    """
+    if repeatable:
+        parser.add_argument('--db', action='append', required=True,
+                            help='PostgreSQL connection string (repeatable)')
+    else:
+        parser.add_argument('--db', required=True, help='PostgreSQL connection string')
+
+
+def add_json_argument(parser: argparse.ArgumentParser, help: str = 'Also write the results to this JSON file') -> None:
+    """Add the --json option, read back as args.json_output."""
+    parser.add_argument('--json', dest='json_output', help=help)
+
+
+def write_json_results(path: Optional[str], data: Dict[str, Any]) -> None:
+    """
+    Write benchmark results to a JSON file.
+
+    Args:
+        path: File given as --json, or None to write nothing
+        data: JSON-compatible results
+    """
+    if not path:
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
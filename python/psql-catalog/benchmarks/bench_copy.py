@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare COPY TO STDOUT exports with exports that fetch rows into Python.
+
+Exports the same table (or query) to a file with:
+
+- copy csv / copy binary: PostgreSQLCatalog.copy_query (no Python row objects)
+- rows csv: stream_query rows written with csv.writer
+- rows json: write_query_result_stream (the `query --json --output` path)
+
+and reports, for each, the elapsed time, the output size and throughput. With
+--memory each export runs a second time under tracemalloc to report its peak Python
+memory (tracing slows the row-based exports down a lot, so it is not timed).
+
+Usage:
+    python benchmarks/bench_copy.py --db $DB_CONN --query "SELECT * FROM big_table"
+    python benchmarks/bench_copy.py --db $DB_CONN --rows 2000000
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, IO
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.catalog import PostgreSQLCatalog
+from psql_catalog.serialization import write_query_result_stream
+
+console = Console()
+
+ROWS_QUERY = """
+    SELECT g AS id, md5(g::text) AS name, (g % 1000)::numeric(10, 2) AS amount, g % 7 = 0 AS flagged
+    FROM generate_series(1, {rows}) AS g
+"""
+
+
+def measure(path: str, mode: str, export: Callable[[IO], None], trace_memory: bool) -> Dict[str, float]:
+    """Run an export to path and return seconds, size in MB, MB/s and (optionally) peak MB."""
+    start = time.perf_counter()
+    with open(path, mode) as f:
+        export(f)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 2 ** 20
+    result = {'seconds': elapsed, 'size_mb': size_mb, 'mb_per_s': size_mb / elapsed}
+
+    if trace_memory:
+        tracemalloc.start()
+        with open(path, mode) as f:
+            export(f)
+        result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result
+
+
+def main() -> None:
+    """Command-line interface for the COPY export benchmark."""
+    parser = argparse.ArgumentParser(description="Compare COPY TO STDOUT with row-based exports")
+    add_db_argument(parser)
+    parser.add_argument('--query', help='Query to export (default: a generated result of --rows rows)')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows of the generated query')
+    parser.add_argument('--memory', action='store_true', help='Also report the peak Python memory of each export')
+    add_json_argument(parser)
+    args = parser.parse_args()
+    query = args.query or ROWS_QUERY.format(rows=args.rows)
+
+    def rows_csv(f: IO) -> None:
+        writer = csv.writer(f)
+        for row in catalog.stream_query(query):
+            writer.writerow(row.values())
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory, PostgreSQLCatalog(args.db) as catalog:
+        path = os.path.join(directory, 'export.out')
+        exports = {
+            'copy csv': ('wb', lambda f: catalog.copy_query(query, f, 'csv')),
+            'copy binary': ('wb', lambda f: catalog.copy_query(query, f, 'binary')),
+            'rows csv': ('w', rows_csv),
+            'rows json': ('w', lambda f: write_query_result_stream(query, catalog.stream_query(query), catalog.database_name, f)),
+        }
+        for name, (mode, export) in exports.items():
+            results[name] = measure(path, mode, export, args.memory)
+
+    table = Table(title="Export throughput", show_header=True, header_style="bold magenta")
+    table.add_column("Method")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Size (MB)", justify="right")
+    table.add_column("MB/s", justify="right")
+    if args.memory:
+        table.add_column("Peak Python memory (MB)", justify="right")
+    for name, measured in results.items():
+        cells = [name, f"{measured['seconds']:.2f}", f"{measured['size_mb']:.1f}", f"{measured['mb_per_s']:.1f}"]
+        if args.memory:
+            cells.append(f"{measured['peak_mb']:.2f}")
+        table.add_row(*cells)
+    console.print(table)
+
+    write_json_results(args.json_output, {'query': query, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compare the peak memory of the describe-all JSON writers.
+
+Writes the describe-all document of a schema to a file with:
+
+- document: describe_tables + create_describe_all_result + save_json_to_file
+  (the whole result is built, deep-copied by asdict and dumped as one string)
+- stream: iter_describe_tables + write_describe_all_stream (table by table)
+- ndjson: iter_describe_tables + write_describe_all_stream(ndjson=True)
+
+for both the batched (schema-wide) and the per-table describe, and reports the
+peak Python memory (tracemalloc), the elapsed time and the output size.
+
+Usage:
+    python benchmarks/bench_describe_all_json.py --db $DB_CONN --schema public --constraints
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.catalog import PostgreSQLCatalog
+from psql_catalog.serialization import (
+    TableStructure,
+    create_describe_all_result,
+    save_json_to_file,
+    write_describe_all_stream
+)
+
+console = Console()
+
+
+def measure(write: Callable[[], None], path: str) -> Dict[str, float]:
+    """Run a writer and return its peak memory in MB, the elapsed seconds and the file size in MB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    write()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'peak_mb': peak / 2 ** 20, 'seconds': elapsed, 'size_mb': os.path.getsize(path) / 2 ** 20}
+
+
+def main() -> None:
+    """Command-line interface for the describe-all JSON benchmark."""
+    parser = argparse.ArgumentParser(description="Compare the describe-all JSON writers")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='public', help='Schema to describe')
+    parser.add_argument('--constraints', action='store_true', help='Include constraints')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory, PostgreSQLCatalog(args.db) as catalog:
+        if not catalog.schema_exists(args.schema):
+            print(f"Error: schema '{args.schema}' does not exist", file=sys.stderr)
+            sys.exit(1)
+        table_names: List[str] = [row['table_name'] for row in catalog.list_tables(args.schema)]
+        path = os.path.join(directory, 'describe-all.json')
+
+        def document(batched: bool) -> None:
+            described, failed = catalog.describe_tables(table_names, args.schema, args.constraints, batched)
+            tables = {name: TableStructure(**data) for name, data in described.items()}
+            result = create_describe_all_result(tables, catalog.database_name, args.schema, args.constraints, failed)
+            save_json_to_file(result, path)
+
+        def stream(batched: bool, ndjson: bool) -> None:
+            described = catalog.iter_describe_tables(table_names, args.schema, args.constraints, batched)
+            with open(path, 'w', encoding='utf-8') as f:
+                write_describe_all_stream(
+                    described, catalog.database_name, args.schema, f, args.constraints, ndjson=ndjson
+                )
+
+        for batched in (True, False):
+            mode = 'batched' if batched else 'per-table'
+            results[f"document ({mode})"] = measure(lambda: document(batched), path)
+            results[f"stream ({mode})"] = measure(lambda: stream(batched, False), path)
+            results[f"ndjson ({mode})"] = measure(lambda: stream(batched, True), path)
+
+    table = Table(
+        title=f"describe-all JSON of {len(table_names)} tables in '{args.schema}'",
+        show_header=True,
+        header_style="bold magenta"
+    )
+    table.add_column("Writer")
+    table.add_column("Peak (MB)", justify="right")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Output (MB)", justify="right")
+    for name, measured in results.items():
+        table.add_row(name, f"{measured['peak_mb']:.2f}", f"{measured['seconds']:.2f}", f"{measured['size_mb']:.2f}")
+    console.print(table)
+
+    write_json_results(args.json_output, {'schema': args.schema, 'tables': len(table_names), 'results': results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compare JSON, Parquet and Arrow exports of the same query result.
+
+Exports a generated result (--rows rows of integers, text, numeric, timestamps and
+booleans) as JSON with write_query_result_stream (the `query --json --output` path,
+same layout as save_json_to_file) and with write_query_result_arrow to Parquet and to
+an Arrow IPC file, then reports the file size, the export time and the time to load
+the file back:
+
+- JSON: json.load
+- Parquet: pyarrow.parquet.read_table
+- Arrow: memory-mapped pyarrow.ipc.open_file(...).read_all() (zero-copy)
+
+Usage:
+    python benchmarks/bench_export.py --db $DB_CONN --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.catalog import PostgreSQLCatalog
+from psql_catalog.export import write_query_result_arrow
+from psql_catalog.serialization import write_query_result_stream
+
+console = Console()
+
+ROWS_QUERY = """
+    SELECT g AS id, md5(g::text) AS name, (g %% 1000)::numeric(10, 2) AS amount,
+           now() - g * interval '1 second' AS created_at, g %% 7 = 0 AS flagged
+    FROM generate_series(1, %s) AS g
+"""
+
+
+def timed(action: Callable[[], object]) -> float:
+    """Run an action and return the elapsed seconds."""
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Command-line interface for the export benchmark."""
+    parser = argparse.ArgumentParser(description="Compare JSON, Parquet and Arrow exports")
+    add_db_argument(parser)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows of the generated query')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory, PostgreSQLCatalog(args.db) as catalog:
+        paths = {name: os.path.join(directory, f"result.{name}") for name in ('json', 'parquet', 'arrow')}
+
+        def export_json() -> None:
+            with open(paths['json'], 'w', encoding='utf-8') as f:
+                rows = catalog.stream_query(ROWS_QUERY, (args.rows,))
+                write_query_result_stream(ROWS_QUERY, rows, catalog.database_name, f)
+
+        def export_arrow(file_format: str) -> None:
+            batches = catalog.stream_batches(ROWS_QUERY, (args.rows,))
+            write_query_result_arrow(batches, paths[file_format], file_format)
+
+        def load_json() -> None:
+            with open(paths['json'], encoding='utf-8') as f:
+                json.load(f)
+
+        def load_arrow() -> None:
+            with pa.memory_map(paths['arrow']) as source:
+                pa.ipc.open_file(source).read_all()
+
+        exports = {
+            'json': (export_json, load_json),
+            'parquet': (lambda: export_arrow('parquet'), lambda: pq.read_table(paths['parquet'])),
+            'arrow': (lambda: export_arrow('arrow'), load_arrow),
+        }
+        for name, (export, load) in exports.items():
+            export_seconds = timed(export)
+            results[name] = {
+                'size_mb': os.path.getsize(paths[name]) / 2 ** 20,
+                'export_seconds': export_seconds,
+                'load_seconds': timed(load),
+            }
+
+    table = Table(title=f"Export of {args.rows:,} rows", show_header=True, header_style="bold magenta")
+    table.add_column("Format")
+    table.add_column("Size (MB)", justify="right")
+    table.add_column("Export (s)", justify="right")
+    table.add_column("Load (s)", justify="right")
+    table.add_column("Size / load vs JSON", justify="right")
+    for name, measured in results.items():
+        table.add_row(
+            name,
+            f"{measured['size_mb']:.1f}",
+            f"{measured['export_seconds']:.2f}",
+            f"{measured['load_seconds']:.3f}",
+            f"{results['json']['size_mb'] / measured['size_mb']:.1f}x / "
+            f"{results['json']['load_seconds'] / measured['load_seconds']:.1f}x",
+        )
+    console.print(table)
+
+    write_json_results(args.json_output, {'rows': args.rows, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Measure the wall time of describe-many for several worker counts.
+
+Describes every (--db, --schema) target, repeated --copies times, with
+fan_out_describe and each --workers value, and reports the wall time, the summed
+per-target time and the speedup over one worker. Against remote servers the
+speedup grows with the network latency, since the workers overlap round trips.
+
+With --latency-ms the connections go through a local TCP proxy that delays
+every packet by half the given round-trip time in each direction, to reproduce
+remote servers with a local database.
+
+Usage:
+    python benchmarks/bench_fanout.py --db $DB_CONN --schema public --copies 16 --workers 1,4,8,16
+    python benchmarks/bench_fanout.py --db $DB_CONN --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from psycopg2.extensions import make_dsn, parse_dsn
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.fanout import DescribeTarget, fan_out_describe
+
+console = Console()
+
+
+class LatencyProxy:
+    """TCP proxy on 127.0.0.1 adding a fixed delay to every packet, run on its own thread."""
+
+    def __init__(self, dsn: str, latency_ms: float):
+        params = parse_dsn(dsn)
+        self.upstream_host = params.get('host', 'localhost')
+        self.upstream_port = int(params.get('port', 5432))
+        self.delay = latency_ms / 2000
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.dsn = make_dsn(dsn, host='127.0.0.1', port=self.port)
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    async def _open_upstream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.upstream_host.startswith('/'):
+            return await asyncio.open_unix_connection(f"{self.upstream_host}/.s.PGSQL.{self.upstream_port}")
+        return await asyncio.open_connection(self.upstream_host, self.upstream_port)
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def send() -> None:
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    writer.close()
+                    return
+                await asyncio.sleep(max(0.0, due - self.loop.time()))
+                writer.write(data)
+                await writer.drain()
+
+        sender = asyncio.create_task(send())
+        try:
+            while data := await reader.read(65536):
+                queue.put_nowait((self.loop.time() + self.delay, data))
+        except ConnectionError:
+            pass
+        queue.put_nowait((0.0, None))
+        await sender
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        upstream_reader, upstream_writer = await self._open_upstream()
+        await asyncio.gather(
+            self._pipe(client_reader, upstream_writer),
+            self._pipe(upstream_reader, client_writer),
+            return_exceptions=True
+        )
+
+
+def main() -> None:
+    """Command-line interface for the describe-many benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark parallel describe-all fan-out")
+    add_db_argument(parser, repeatable=True)
+    parser.add_argument('--schema', action='append', help='Schema to describe (repeatable; default: public)')
+    parser.add_argument('--copies', type=int, default=8, help='Times each target is repeated')
+    parser.add_argument('--workers', default='1,4,8', help='Comma-separated worker counts')
+    parser.add_argument('--backend', default='pg_catalog', help='Catalog query backend')
+    parser.add_argument('--constraints', action='store_true', help='Include constraints')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated round-trip time to the servers')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    dsns = [LatencyProxy(dsn, args.latency_ms).dsn for dsn in args.db] if args.latency_ms else args.db
+    targets: List[DescribeTarget] = [
+        DescribeTarget(dsn, schema) for dsn in dsns for schema in (args.schema or ['public'])
+    ] * args.copies
+
+    results: Dict[int, Dict[str, float]] = {}
+    for workers in (int(value) for value in args.workers.split(',')):
+        start = time.perf_counter()
+        outcomes = list(fan_out_describe(targets, workers, args.constraints, backend=args.backend))
+        wall = time.perf_counter() - start
+        failed = [outcome for outcome in outcomes if not outcome.ok]
+        if failed:
+            console.print(f"[red]{len(failed)} target(s) failed, e.g. {failed[0].target.label}: {failed[0].error}[/red]")
+        results[workers] = {'wall_seconds': wall, 'target_seconds': sum(outcome.seconds for outcome in outcomes)}
+
+    baseline = results[min(results)]['wall_seconds']
+    title = f"describe-many of {len(targets)} targets"
+    if args.latency_ms:
+        title += f" ({args.latency_ms:g} ms simulated round trip)"
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Workers", justify="right")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("Sum of targets (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+    for workers, measured in results.items():
+        table.add_row(
+            str(workers),
+            f"{measured['wall_seconds']:.2f}",
+            f"{measured['target_seconds']:.2f}",
+            f"{baseline / measured['wall_seconds']:.1f}x",
+        )
+    console.print(table)
+
+    write_json_results(args.json_output, {'targets': len(targets), 'latency_ms': args.latency_ms, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Measure interactive describe navigation with and without the lookup memo.
+
+Replays --commands 'describe <table> [--constraints]' commands of the REPL
+(table_exists, describe_table, list_indexes and, with --constraints,
+list_constraints and get_foreign_key_details) over tables picked at random
+among the first --tables tables of --schema, the way a user navigates back and
+forth, and reports the mean time per command and the memo hit rate.
+
+With --latency-ms the connections go through the delaying TCP proxy of
+bench_fanout.py, to reproduce a remote server with a local database.
+
+Usage:
+    python benchmarks/bench_memo.py --db $DB_CONN --schema public --tables 20 --commands 200
+    python benchmarks/bench_memo.py --db $DB_CONN --latency-ms 20
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from bench_fanout import LatencyProxy
+from psql_catalog.catalog import PostgreSQLCatalog
+from psql_catalog.memo import CatalogMemo
+
+console = Console()
+
+
+def navigate(dsn: str, args: argparse.Namespace, visits: List[str], memo: Optional[CatalogMemo]) -> float:
+    """Run the describe commands of every visit and return the mean milliseconds per command."""
+    with PostgreSQLCatalog(dsn, args.backend, memo=memo) as catalog:
+        start = time.perf_counter()
+        for table_name in visits:
+            if catalog.table_exists(table_name, args.schema):
+                catalog.describe_table(table_name, args.schema)
+                catalog.list_indexes(table_name, args.schema)
+                if args.constraints:
+                    catalog.list_constraints(table_name, args.schema)
+                    catalog.get_foreign_key_details(table_name, args.schema)
+        return (time.perf_counter() - start) * 1000 / len(visits)
+
+
+def main() -> None:
+    """Command-line interface for the lookup memo benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark repeated describe commands with the lookup memo")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='public', help='Schema to navigate')
+    parser.add_argument('--tables', type=int, default=20, help='Number of distinct tables visited')
+    parser.add_argument('--commands', type=int, default=200, help='Number of describe commands')
+    parser.add_argument('--backend', default='pg_catalog', help='Catalog query backend')
+    parser.add_argument('--constraints', action='store_true', help='Describe constraints too')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated round-trip time to the server')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed of the navigation')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    dsn = LatencyProxy(args.db, args.latency_ms).dsn if args.latency_ms else args.db
+    with PostgreSQLCatalog(dsn, args.backend) as catalog:
+        table_names = [row['table_name'] for row in catalog.list_tables(args.schema)][:args.tables]
+    if not table_names:
+        console.print(f"[red]No tables in schema '{args.schema}'[/red]")
+        return
+    visits = random.Random(args.seed).choices(table_names, k=args.commands)
+
+    memo = CatalogMemo()
+    results: Dict[str, Dict[str, Any]] = {
+        'no memo': {'ms_per_command': navigate(dsn, args, visits, None)},
+        'memo': {'ms_per_command': navigate(dsn, args, visits, memo), 'hit_rate': memo.stats.hit_rate},
+    }
+
+    title = f"{args.commands} describe commands over {len(table_names)} tables of {args.schema}"
+    if args.latency_ms:
+        title += f" ({args.latency_ms:g} ms simulated round trip)"
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Catalog")
+    table.add_column("ms / command", justify="right")
+    table.add_column("Hit rate", justify="right")
+    table.add_column("Speedup", justify="right")
+    baseline = results['no memo']['ms_per_command']
+    for name, measured in results.items():
+        hit_rate = measured.get('hit_rate')
+        table.add_row(
+            name,
+            f"{measured['ms_per_command']:.2f}",
+            f"{hit_rate:.0%}" if hit_rate is not None else "-",
+            f"{baseline / measured['ms_per_command']:.1f}x",
+        )
+    console.print(table)
+
+    write_json_results(args.json_output, {
+        'schema': args.schema, 'tables': len(table_names), 'commands': args.commands,
+        'latency_ms': args.latency_ms, 'results': results
+    })
+
+
+if __name__ == "__main__":
+    main()
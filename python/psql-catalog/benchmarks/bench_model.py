@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Measure the memory of a large describe-all catalog in each row representation.
+
+Simulates the schema-wide column query of a catalog with --tables tables of
+--columns columns (by default 50,000 x 20 = 1M columns): rows arrive as tuples
+of freshly decoded strings, as a database driver returns them, and are turned
+into the per-table column rows of describe-all with PostgreSQLCatalog's own
+grouping, as:
+
+- dicts: the default lists of dictionaries
+- ResultSet: compact_results=True (columnar, deduplicated per table column)
+- records: interned_rows=True (slotted model.Record rows with interned strings)
+
+and reports the memory retained by the grouped rows and the peak while building
+them (tracemalloc), and the build time. No database is needed.
+
+Usage:
+    python benchmarks/bench_model.py --tables 50000 --columns 20
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_json_argument, write_json_results
+from psql_catalog.catalog import PostgreSQLCatalog
+from psql_catalog.model import records_from_tuples
+from psql_catalog.resultset import ResultSet
+
+console = Console()
+
+COLUMNS = (
+    '_table_name', 'column_name', 'data_type', 'is_nullable', 'column_default',
+    'character_maximum_length', 'numeric_precision', 'numeric_scale'
+)
+TYPES = ('integer', 'character varying', 'timestamp with time zone', 'numeric', 'boolean', 'text')
+
+
+def fresh(value: str) -> str:
+    """A new string object equal to value, as a driver decodes every row separately."""
+    return value.encode().decode()
+
+
+def driver_batches(tables: int, columns: int, batch_size: int = 2000) -> Iterator[List[Tuple[Any, ...]]]:
+    """Yield the rows of the schema-wide column query in fetchmany() batches."""
+    batch = []
+    for t in range(tables):
+        table_name = f"table_{t:05d}"
+        for c in range(columns):
+            data_type = TYPES[(t + c) % len(TYPES)]
+            batch.append((
+                fresh(table_name), fresh(f"column_{c}"), fresh(data_type), fresh('NO' if c == 0 else 'YES'),
+                f"nextval('{table_name}_id_seq'::regclass)" if c == 0 else None,
+                255 if data_type == 'character varying' else None,
+                32 if data_type == 'integer' else None,
+                0 if data_type == 'integer' else None,
+            ))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def build_dicts(tables: int, columns: int) -> Any:
+    rows = [dict(zip(COLUMNS, row)) for batch in driver_batches(tables, columns) for row in batch]
+    return PostgreSQLCatalog._group_by_table(rows)
+
+
+def build_resultset(tables: int, columns: int) -> Any:
+    return PostgreSQLCatalog._group_by_table(ResultSet.from_batches(COLUMNS, driver_batches(tables, columns)))
+
+
+def build_records(tables: int, columns: int) -> Any:
+    return PostgreSQLCatalog._group_by_table(records_from_tuples(COLUMNS, driver_batches(tables, columns)))
+
+
+def measure(build: Callable[[int, int], Any], tables: int, columns: int) -> Dict[str, float]:
+    """Build the grouped rows and return the retained and peak MB and the seconds."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    grouped = build(tables, columns)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(grouped) == tables
+    del grouped
+    return {'retained_mb': current / 2 ** 20, 'peak_mb': peak / 2 ** 20, 'seconds': elapsed}
+
+
+def main() -> None:
+    """Command-line interface for the catalog model memory benchmark."""
+    parser = argparse.ArgumentParser(description="Compare the memory of the catalog row representations")
+    parser.add_argument('--tables', type=int, default=50000, help='Number of tables')
+    parser.add_argument('--columns', type=int, default=20, help='Columns per table')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    results = {
+        'dicts': measure(build_dicts, args.tables, args.columns),
+        'ResultSet': measure(build_resultset, args.tables, args.columns),
+        'records': measure(build_records, args.tables, args.columns),
+    }
+
+    table = Table(
+        title=f"Column rows of {args.tables} tables x {args.columns} columns",
+        show_header=True,
+        header_style="bold magenta"
+    )
+    table.add_column("Rows")
+    table.add_column("Retained (MB)", justify="right")
+    table.add_column("Peak (MB)", justify="right")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("vs dicts", justify="right")
+    baseline = results['dicts']['retained_mb']
+    for name, measured in results.items():
+        table.add_row(
+            name,
+            f"{measured['retained_mb']:.1f}",
+            f"{measured['peak_mb']:.1f}",
+            f"{measured['seconds']:.2f}",
+            f"{measured['retained_mb'] / baseline:.0%}",
+        )
+    console.print(table)
+
+    write_json_results(args.json_output, {'tables': args.tables, 'columns': args.columns, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
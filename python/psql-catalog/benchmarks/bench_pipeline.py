@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Measure per-table describe time over a high-latency link.
+
+Starts a local TCP proxy in front of the database that delays every chunk of data by
+half of the requested round-trip time in each direction, then describes the same
+tables through it with every execution mode of PostgreSQLCatalog:
+
+- simple:   one plain query per round trip (the default)
+- prepared: catalog queries prepared once per connection, still one round trip each
+- pipeline: all queries of all tables queued in a libpq pipeline (psycopg 3)
+- batched:  the schema-wide queries, for reference
+
+Usage:
+    python benchmarks/bench_pipeline.py --db $DB_CONN --schema public --tables 50 --rtt-ms 20
+    # database listening on a unix socket:
+    python benchmarks/bench_pipeline.py --db $DB_CONN --upstream /tmp/.s.PGSQL.5432
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from psycopg2.extensions import make_dsn, parse_dsn
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.catalog import EXECUTION_MODES, PostgreSQLCatalog
+
+console = Console()
+
+
+class LatencyProxy:
+    """TCP proxy that adds a fixed one-way delay to the traffic in both directions."""
+
+    def __init__(self, upstream: str, one_way_delay: float):
+        """
+        Initialize the proxy.
+
+        Args:
+            upstream: 'host:port' or the path of a unix socket to forward to
+            one_way_delay: Delay in seconds applied to each direction
+        """
+        self.upstream = upstream
+        self.delay = one_way_delay
+        self.port: Optional[int] = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> int:
+        """Start the proxy in a background thread and return its local port."""
+        self._thread.start()
+        self._ready.wait()
+        return self.port
+
+    def stop(self) -> None:
+        """Stop the proxy, dropping any connection still open."""
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _open_upstream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.upstream.startswith('/'):
+            return await asyncio.open_unix_connection(self.upstream)
+        host, port = self.upstream.rsplit(':', 1)
+        return await asyncio.open_connection(host, int(port))
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        server_reader, server_writer = await self._open_upstream()
+        try:
+            await asyncio.gather(
+                self._pipe(client_reader, server_writer),
+                self._pipe(server_reader, client_writer),
+                return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            # Proxy shutting down with the connection still open
+            client_writer.close()
+            server_writer.close()
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Forward data, delivering each chunk one delay after it was received (no bandwidth limit)."""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def deliver() -> None:
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    break
+                await asyncio.sleep(max(0.0, due - self._loop.time()))
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        sender = asyncio.ensure_future(deliver())
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                queue.put_nowait((self._loop.time() + self.delay, data))
+        finally:
+            queue.put_nowait((0.0, None))
+            await sender
+
+
+def proxied_dsn(connection_string: str, port: int) -> str:
+    """Point a connection string at the local proxy."""
+    params = parse_dsn(connection_string)
+    params.update(host='127.0.0.1', port=str(port), sslmode='disable')
+    return make_dsn(**params)
+
+
+def default_upstream(connection_string: str) -> str:
+    """Derive the proxy upstream from the connection string."""
+    params = parse_dsn(connection_string)
+    host = params.get('host', 'localhost')
+    port = params.get('port', '5432')
+    if host.startswith('/'):
+        return f"{host}/.s.PGSQL.{port}"
+    return f"{host}:{port}"
+
+
+def time_describe(
+    connection_string: str,
+    backend: str,
+    mode: str,
+    schema: str,
+    table_names: List[str],
+    constraints: bool,
+    repeat: int
+) -> float:
+    """Median milliseconds to describe the tables (connection setup excluded)."""
+    execution = 'simple' if mode == 'batched' else mode
+    timings = []
+    with PostgreSQLCatalog(connection_string, backend, execution=execution) as catalog:
+        # Warm up: prepares statements and opens the pipeline connection
+        catalog.describe_tables(table_names[:1], schema, constraints, batched=(mode == 'batched'))
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result, failed = catalog.describe_tables(table_names, schema, constraints, batched=(mode == 'batched'))
+            timings.append((time.perf_counter() - start) * 1000)
+            if failed:
+                console.print(f"[yellow]{mode}: {len(failed)} table(s) failed[/yellow]")
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Command-line interface for the pipeline benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark per-table describe over a high-latency link")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='public', help='Schema to describe')
+    parser.add_argument('--tables', type=int, default=50, help='Number of tables to describe')
+    parser.add_argument('--rtt-ms', type=float, default=20.0, help='Injected round-trip time in milliseconds')
+    parser.add_argument('--upstream', help="Database address for the proxy: 'host:port' or a unix socket path")
+    parser.add_argument('--backend', default='pg_catalog', help='Catalog query backend')
+    parser.add_argument('--constraints', action='store_true', help='Include constraints (four queries per table)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per measurement')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    with PostgreSQLCatalog(args.db, args.backend) as catalog:
+        if not catalog.schema_exists(args.schema):
+            print(f"Error: schema '{args.schema}' does not exist", file=sys.stderr)
+            sys.exit(1)
+        table_names = [row['table_name'] for row in catalog.list_tables(args.schema)][:args.tables]
+
+    proxy = LatencyProxy(args.upstream or default_upstream(args.db), args.rtt_ms / 2000)
+    dsn = proxied_dsn(args.db, proxy.start())
+    console.print(f"Describing {len(table_names)} tables of [cyan]{args.schema}[/cyan] "
+                  f"through a proxy with {args.rtt_ms:g} ms RTT")
+
+    results: Dict[str, float] = {}
+    try:
+        for mode in list(EXECUTION_MODES) + ['batched']:
+            results[mode] = time_describe(
+                dsn, args.backend, mode, args.schema, table_names, args.constraints, args.repeat
+            )
+    finally:
+        proxy.stop()
+
+    table = Table(title=f"Describe time, {args.rtt_ms:g} ms RTT", show_header=True, header_style="bold magenta")
+    table.add_column("Mode")
+    table.add_column("Median (ms)", justify="right")
+    table.add_column("Speedup vs simple", justify="right")
+    for mode, elapsed in results.items():
+        table.add_row(mode, f"{elapsed:.1f}", f"{results['simple'] / elapsed:.1f}x")
+    console.print(table)
+
+    write_json_results(args.json_output, {
+        'schema': args.schema,
+        'tables': len(table_names),
+        'rtt_ms': args.rtt_ms,
+        'constraints': args.constraints,
+        'repeat': args.repeat,
+        'results_ms': results
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare the memory used by list-of-dicts results and compact ResultSet results.
+
+Runs the same queries with PostgreSQLCatalog(compact_results=False) and
+PostgreSQLCatalog(compact_results=True) and reports, using tracemalloc, the memory
+retained by the result and the peak memory while building it:
+
+- a large generated query result (--rows rows, default 1,000,000)
+- the schema-wide column dump used by describe-all (describe_all_columns)
+
+Usage:
+    python benchmarks/bench_resultset.py --db $DB_CONN --rows 1000000 --schema public
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.catalog import PostgreSQLCatalog
+
+console = Console()
+
+ROWS_QUERY = """
+    SELECT g AS id, md5(g::text) AS name, g %% 7 = 0 AS flagged, now() AS created_at
+    FROM generate_series(1, %s) AS g
+"""
+
+
+def measure(connection_string: str, compact: bool, load: Callable[[PostgreSQLCatalog], Any]) -> Dict[str, float]:
+    """Load a result and return retained/peak memory in MB and the elapsed seconds."""
+    with PostgreSQLCatalog(connection_string, compact_results=compact) as catalog:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = load(catalog)
+        elapsed = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+    return {'retained_mb': retained / 2 ** 20, 'peak_mb': peak / 2 ** 20, 'seconds': elapsed}
+
+
+def main() -> None:
+    """Command-line interface for the result memory benchmark."""
+    parser = argparse.ArgumentParser(description="Compare list-of-dicts and ResultSet memory use")
+    add_db_argument(parser)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows of the generated query')
+    parser.add_argument('--schema', default='public', help='Schema for the column dump')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    with PostgreSQLCatalog(args.db) as catalog:
+        if not catalog.schema_exists(args.schema):
+            print(f"Error: schema '{args.schema}' does not exist", file=sys.stderr)
+            sys.exit(1)
+        column_count = sum(len(columns) for columns in catalog.describe_all_columns(args.schema).values())
+
+    workloads = {
+        f"query ({args.rows:,} rows)": lambda catalog: catalog.execute_query(ROWS_QUERY, (args.rows,)),
+        f"describe_all_columns ({column_count:,} columns)": lambda catalog: catalog.describe_all_columns(args.schema),
+    }
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, load in workloads.items():
+        results[name] = {
+            'dicts': measure(args.db, False, load),
+            'resultset': measure(args.db, True, load),
+        }
+
+    table = Table(title="Result memory (tracemalloc)", show_header=True, header_style="bold magenta")
+    table.add_column("Workload")
+    table.add_column("Dicts retained (MB)", justify="right")
+    table.add_column("ResultSet retained (MB)", justify="right")
+    table.add_column("Reduction", justify="right")
+    table.add_column("Dicts peak (MB)", justify="right")
+    table.add_column("ResultSet peak (MB)", justify="right")
+    table.add_column("Dicts / ResultSet time (s)", justify="right")
+    for name, measured in results.items():
+        dicts, compact = measured['dicts'], measured['resultset']
+        table.add_row(
+            name,
+            f"{dicts['retained_mb']:.1f}",
+            f"{compact['retained_mb']:.1f}",
+            f"{dicts['retained_mb'] / compact['retained_mb']:.1f}x" if compact['retained_mb'] else "-",
+            f"{dicts['peak_mb']:.1f}",
+            f"{compact['peak_mb']:.1f}",
+            f"{dicts['seconds']:.2f} / {compact['seconds']:.2f}",
+        )
+    console.print(table)
+
+    write_json_results(args.json_output, {'rows': args.rows, 'schema': args.schema, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
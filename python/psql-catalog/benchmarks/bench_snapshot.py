@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Compare reloading a catalog from a binary snapshot with reloading it from JSON.
+
+Builds the synthetic DescribeAllResult of bench_codec.py (--tables tables, by default
+4,000), saves it as a JSON document (save_json_to_file) and as a binary snapshot
+(save_snapshot), and measures:
+
+- json full load: codec.loads of the whole document
+- snapshot open + lookup: load_snapshot and decode a single table
+- snapshot full load: load_snapshot(...).to_result()
+
+along with the file sizes and the peak Python memory (tracemalloc) of each load.
+No database is needed.
+
+Usage:
+    python benchmarks/bench_snapshot.py --tables 4000 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_json_argument, write_json_results
+from bench_codec import build_result
+from psql_catalog import codec
+from psql_catalog.serialization import DescribeAllResult, save_json_to_file
+from psql_catalog.snapshot import load_snapshot, save_snapshot
+
+console = Console()
+
+
+def measure(action: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median seconds of repeat runs, then the peak memory in MB of one traced run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': statistics.median(timings), 'peak_mb': peak / 2 ** 20}
+
+
+def main() -> None:
+    """Command-line interface for the snapshot benchmark."""
+    parser = argparse.ArgumentParser(description="Compare binary snapshot and JSON catalog reloads")
+    parser.add_argument('--tables', type=int, default=4_000, help='Tables in the DescribeAllResult')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    result = build_result(args.tables)
+    lookup = f"table_{args.tables // 2}"
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'catalog.json')
+        snapshot_path = os.path.join(directory, 'catalog.pcs')
+        save_json_to_file(result, json_path)
+        save_snapshot(result, snapshot_path)
+        sizes = {'json': os.path.getsize(json_path) / 2 ** 20, 'snapshot': os.path.getsize(snapshot_path) / 2 ** 20}
+
+        def json_load() -> DescribeAllResult:
+            with open(json_path, 'rb') as f:
+                return codec.loads(DescribeAllResult, f.read())
+
+        def snapshot_lookup() -> Any:
+            with load_snapshot(snapshot_path) as snapshot:
+                return snapshot.table(lookup)
+
+        def snapshot_load() -> DescribeAllResult:
+            with load_snapshot(snapshot_path) as snapshot:
+                return snapshot.to_result()
+
+        assert snapshot_load() == json_load() == result, "snapshot and JSON reloads differ"
+        assert snapshot_lookup() == result.tables[lookup]
+
+        results = {
+            'json full load': measure(json_load, args.repeat),
+            'snapshot open + lookup': measure(snapshot_lookup, args.repeat),
+            'snapshot full load': measure(snapshot_load, args.repeat),
+        }
+
+    table = Table(
+        title=f"Reload of {args.tables:,} tables (JSON {sizes['json']:.1f} MB, snapshot {sizes['snapshot']:.1f} MB)",
+        show_header=True,
+        header_style="bold magenta"
+    )
+    table.add_column("Load")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Peak (MB)", justify="right")
+    for name, measured in results.items():
+        table.add_row(name, f"{measured['seconds'] * 1000:.2f}", f"{measured['peak_mb']:.2f}")
+    console.print(table)
+
+    write_json_results(args.json_output, {'tables': args.tables, 'size_mb': sizes, 'results': results})
+
+
+if __name__ == "__main__":
+    main()
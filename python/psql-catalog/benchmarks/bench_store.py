@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Measure search latency of the SQLite catalog store.
+
+Fills a temporary store with --databases copies of the synthetic catalog of
+bench_codec.py (--tables tables of 8 columns and 1 foreign key each; by default
+300 databases of 400 tables, about a million columns), where one table in 50 also
+has a customer_id column, and times:
+
+- exact column: search_columns('customer_id')
+- prefix glob: search_columns('customer_*')
+- infix glob: search_columns('*customer*')
+- regex: search_columns(r'^customer_(id|ref)$', regex=True)
+- column + type: search_columns('*_id', data_type='bigint')
+- fk target: search_foreign_keys('table_42')
+- table glob: search_tables('table_99*')
+
+No database is needed.
+
+Usage:
+    python benchmarks/bench_store.py --databases 300 --tables 400
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_json_argument, write_json_results
+from bench_codec import build_result
+from psql_catalog.store import CatalogStore
+
+console = Console()
+
+
+def measure(action: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median milliseconds of repeat runs and the number of matches."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = action()
+        timings.append(time.perf_counter() - start)
+    return {'ms': statistics.median(timings) * 1000, 'matches': len(matches)}
+
+
+def main() -> None:
+    """Command-line interface for the catalog store benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark catalog store searches")
+    parser.add_argument('--databases', type=int, default=300, help='Databases in the store')
+    parser.add_argument('--tables', type=int, default=400, help='Tables per database')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per search')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    tables = build_result(args.tables).tables
+    for number, structure in enumerate(tables.values()):
+        if number % 50 == 0:
+            structure.columns.append({'column_name': 'customer_id', 'data_type': 'bigint', 'is_nullable': 'NO'})
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'store.sqlite3')
+        with CatalogStore(path) as store:
+            start = time.perf_counter()
+            for number in range(args.databases):
+                store.replace_database(f"db{number:03d}", {'public': tables})
+            index_seconds = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 2 ** 20
+
+            searches = {
+                'exact column': lambda: store.search_columns('customer_id'),
+                'prefix glob': lambda: store.search_columns('customer_*'),
+                'infix glob': lambda: store.search_columns('*customer*'),
+                'regex': lambda: store.search_columns(r'^customer_(id|ref)$', regex=True),
+                'column + type': lambda: store.search_columns('*_id', data_type='bigint'),
+                'fk target': lambda: store.search_foreign_keys('table_42'),
+                'table glob': lambda: store.search_tables('table_99*'),
+            }
+            results = {name: measure(search, args.repeat) for name, search in searches.items()}
+
+    table = Table(
+        title=(f"{args.databases} databases x {args.tables} tables "
+               f"(~{args.databases * args.tables * 8:,} columns, {size_mb:.0f} MB, indexed in {index_seconds:.1f} s)"),
+        show_header=True,
+        header_style="bold magenta"
+    )
+    table.add_column("Search")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Matches", justify="right")
+    for name, measured in results.items():
+        table.add_row(name, f"{measured['ms']:.1f}", f"{measured['matches']:,}")
+    console.print(table)
+
+    write_json_results(args.json_output, {
+        'databases': args.databases, 'tables': args.tables, 'size_mb': size_mb,
+        'index_seconds': index_seconds, 'results': results
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite on a synthetic schema.
+
+Generates a schema with synthetic_schema.py (or reuses the one left by a
+previous run with the same parameters) and times, --repeat times each:
+
+- describe: the queries of 'describe TABLE --constraints' for --describe-samples
+  tables (reported per table)
+- describe-all: the batched describe of the whole schema with constraints
+  (and the per-table describe with --per-table)
+- describe-all (filtered): the batched describe of a page of --filtered-tables
+  tables selected by a TableFilter, which only introspects those tables
+- json document / json stream: the describe-all JSON output, built as one
+  document or streamed table by table
+- dependency graph: building the TableDependencyGraph of the schema, detecting
+  cycles and, without cycles, sorting it
+- dependency graph (lazy): building it straight from the catalog, which only
+  queries the table list and the foreign keys (TableDependencyGraph.from_catalog)
+- batch generators: the DROP, TRUNCATE, INSERT and constraint statements of
+  DatabaseBatchOperations (which refuse schemas with cycles)
+
+The results, with the schema parameters and the environment, are written to
+--json. Given the results of an earlier run as --baseline, every step whose
+median is more than --tolerance slower is reported as a regression and the
+exit status is 1, so that the suite can guard performance over time.
+
+Usage:
+    python benchmarks/bench_suite.py --db $DB_CONN --tables 10000 --json results.json
+    python benchmarks/bench_suite.py --db $DB_CONN --tables 10000 --baseline results.json
+    python benchmarks/bench_suite.py --db $DB_CONN --tables 50000 --fk-skew 2 --partitioned 100 --cycles 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg2
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog import __version__
+from psql_catalog.batch_operations import BatchOperationError, DatabaseBatchOperations
+from psql_catalog.catalog import PostgreSQLCatalog
+from psql_catalog.dependency_graph import CycleDetectionError, TableDependencyGraph
+from psql_catalog.filters import TableFilter
+from psql_catalog.serialization import (
+    TableStructure,
+    create_describe_all_result,
+    save_json_to_file,
+    write_describe_all_stream
+)
+from synthetic_schema import (
+    add_spec_arguments,
+    create_synthetic_schema,
+    drop_schema,
+    existing_spec,
+    spec_from_args
+)
+
+console = Console()
+
+
+def run_step(action: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Run a step repeat times and summarize the elapsed seconds."""
+    seconds = []
+    outcome = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outcome = action()
+        seconds.append(time.perf_counter() - start)
+    measured: Dict[str, Any] = {
+        'seconds': seconds,
+        'best': min(seconds),
+        'median': statistics.median(seconds),
+    }
+    if outcome is not None:
+        measured['outcome'] = outcome
+    return measured
+
+
+def git_commit() -> Optional[str]:
+    """The commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Add the ratio to the baseline median to every step and return the regressed steps."""
+    regressions = []
+    for name, measured in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get('median'):
+            continue
+        measured['baseline'] = previous['median']
+        measured['ratio'] = measured['median'] / previous['median']
+        if measured['ratio'] > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    """Command-line interface for the end-to-end benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark psql-catalog end to end on a synthetic schema")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='synthetic', help='Schema to generate and describe')
+    parser.add_argument('--regenerate', action='store_true',
+                        help='Generate the schema even if it exists with the same parameters')
+    parser.add_argument('--drop', action='store_true', help='Drop the schema when done')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs of every step')
+    parser.add_argument('--describe-samples', type=int, default=50, help='Tables described by the describe step')
+    parser.add_argument('--per-table', action='store_true', help='Also time the per-table describe-all')
+    parser.add_argument('--filtered-tables', type=int, default=40,
+                        help='Tables selected by the filtered describe-all step')
+    parser.add_argument('--backend', default='pg_catalog', help='Catalog query backend')
+    add_json_argument(parser, 'Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Results JSON of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Slowdown over the baseline median reported as a regression (0.25: 25%%)')
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    conn = psycopg2.connect(args.db)
+    try:
+        reuse = not args.regenerate and existing_spec(conn, args.schema) == spec.as_dict()
+        server_version = conn.server_version
+    finally:
+        conn.close()
+
+    generation: Optional[Dict[str, Any]] = None
+    if reuse:
+        console.print(f"[blue]Reusing schema {args.schema} generated with the same parameters[/blue]")
+    else:
+        console.print(f"[blue]Generating {spec.tables} tables in schema {args.schema}...[/blue]")
+        generation = create_synthetic_schema(args.db, spec, args.schema)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory, PostgreSQLCatalog(args.db, args.backend) as catalog:
+        table_names = [row['table_name'] for row in catalog.list_tables(args.schema)]
+        samples = random.Random(spec.seed).sample(table_names, min(args.describe_samples, len(table_names)))
+        path = os.path.join(directory, 'describe-all.json')
+
+        def describe() -> None:
+            for table_name in samples:
+                if catalog.table_exists(table_name, args.schema):
+                    catalog.describe_table(table_name, args.schema)
+                    catalog.list_indexes(table_name, args.schema)
+                    catalog.list_constraints(table_name, args.schema)
+                    catalog.get_foreign_key_details(table_name, args.schema)
+
+        results['describe'] = run_step(describe, args.repeat)
+        results['describe']['per_table_ms'] = results['describe']['median'] * 1000 / max(len(samples), 1)
+
+        results['describe-all'] = run_step(
+            lambda: len(catalog.describe_tables(table_names, args.schema, True, True)[0]), args.repeat
+        )
+        if args.per_table:
+            results['describe-all (per-table)'] = run_step(
+                lambda: len(catalog.describe_tables(table_names, args.schema, True, False)[0]), args.repeat
+            )
+
+        # A page from the middle of the schema, as selected by describe-all --offset/--limit
+        table_filter = TableFilter(offset=len(table_names) // 2, limit=args.filtered_tables)
+        results['describe-all (filtered)'] = run_step(
+            lambda: catalog.describe_all_tables(args.schema, True, table_filter=table_filter)['_metadata']['successful'],
+            args.repeat
+        )
+
+        described, failed = catalog.describe_tables(table_names, args.schema, True, True)
+
+        def json_document() -> int:
+            tables = {name: TableStructure(**data) for name, data in described.items()}
+            save_json_to_file(
+                create_describe_all_result(tables, catalog.database_name, args.schema, True, failed), path
+            )
+            return os.path.getsize(path)
+
+        def json_stream() -> int:
+            with open(path, 'w', encoding='utf-8') as f:
+                write_describe_all_stream(described.items(), catalog.database_name, args.schema, f, True)
+            return os.path.getsize(path)
+
+        results['json document'] = run_step(json_document, args.repeat)
+        results['json stream'] = run_step(json_stream, args.repeat)
+
+        with open(path, encoding='utf-8') as f:
+            schema_data = json.load(f)
+
+        def dependency_graph() -> str:
+            graph = TableDependencyGraph(schema_data)
+            if graph.has_cycles()[0]:
+                return 'cycles'
+            graph.get_insert_order()
+            graph.get_drop_order()
+            return 'sorted'
+
+        def batch_generators() -> str:
+            operations = DatabaseBatchOperations(path)
+            try:
+                operations.generate_disable_constraints_statements()
+                operations.generate_enable_constraints_statements()
+                operations.generate_drop_statements(cascade=True)
+                operations.generate_truncate_statements(restart_identity=True)
+                operations.generate_insert_template_statements()
+            except (BatchOperationError, CycleDetectionError):
+                return 'cycles'
+            return 'generated'
+
+        def dependency_graph_lazy() -> str:
+            graph = TableDependencyGraph.from_catalog(catalog, args.schema)
+            return 'cycles' if graph.has_cycles()[0] else 'acyclic'
+
+        results['dependency graph'] = run_step(dependency_graph, args.repeat)
+        results['dependency graph (lazy)'] = run_step(dependency_graph_lazy, args.repeat)
+        results['batch generators'] = run_step(batch_generators, args.repeat)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f).get('results', {}), args.tolerance)
+
+    title = f"psql-catalog end to end on {len(table_names)} tables of {args.schema} (median of {args.repeat})"
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Step")
+    table.add_column("Median (s)", justify="right")
+    table.add_column("Best (s)", justify="right")
+    table.add_column("Note")
+    if args.baseline:
+        table.add_column("vs baseline", justify="right")
+    for name, measured in results.items():
+        note = str(measured.get('outcome', ''))
+        if name == 'describe':
+            note = f"{measured['per_table_ms']:.2f} ms / table"
+        elif name.startswith('describe-all'):
+            note = f"{measured['outcome']} tables"
+        elif name.startswith('json'):
+            note = f"{measured['outcome'] / 2 ** 20:.1f} MB"
+        row = [name, f"{measured['median']:.3f}", f"{measured['best']:.3f}", note]
+        if args.baseline:
+            ratio = measured.get('ratio')
+            style = 'red' if name in regressions else 'green'
+            row.append(f"[{style}]{ratio:.2f}x[/{style}]" if ratio is not None else "-")
+        table.add_row(*row)
+    console.print(table)
+
+    write_json_results(args.json_output, {
+        'suite': 'psql-catalog end to end',
+        'timestamp': datetime.now().isoformat(),
+        'environment': {
+            'psql_catalog': __version__,
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'server_version': server_version,
+            'backend': args.backend,
+        },
+        'schema': args.schema,
+        'spec': spec.as_dict(),
+        'generation': generation,
+        'tables': len(table_names),
+        'results': results,
+        'regressions': regressions,
+    })
+
+    if args.drop:
+        conn = psycopg2.connect(args.db)
+        try:
+            drop_schema(conn, args.schema)
+        finally:
+            conn.close()
+
+    if regressions:
+        console.print(f"[red]Regressions over {args.tolerance:.0%}: {', '.join(regressions)}[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
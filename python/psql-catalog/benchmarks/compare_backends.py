@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare the latency of the catalog query backends.
+
+Runs every catalog method of PostgreSQLCatalog against the same schema with the
+information_schema and pg_catalog backends and reports the median latency of each
+method, so the difference can be measured on a real (large) catalog.
+
+Usage:
+    python benchmarks/compare_backends.py --db $DB_CONN --schema public --tables 50 --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from bench_common import add_db_argument, add_json_argument, write_json_results
+from psql_catalog.backends import available_backends
+from psql_catalog.catalog import PostgreSQLCatalog
+
+console = Console()
+
+
+def _median_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Run func repeat times and return the median wall-clock time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark_backend(
+    connection_string: str,
+    backend: str,
+    schema: str,
+    table_names: List[str],
+    repeat: int
+) -> Dict[str, float]:
+    """
+    Measure the median latency of each catalog method with one backend.
+
+    Per-table methods are timed over all sampled tables, so their value is the
+    total time to run the method once for every sampled table.
+
+    Returns:
+        Dictionary with method names as keys and median milliseconds as values
+    """
+    results: Dict[str, float] = {}
+
+    with PostgreSQLCatalog(connection_string, backend) as catalog:
+        results['list_schemas'] = _median_ms(catalog.list_schemas, repeat)
+        results['list_tables'] = _median_ms(lambda: catalog.list_tables(schema), repeat)
+        results['schema_exists'] = _median_ms(lambda: catalog.schema_exists(schema), repeat)
+
+        for method in ('table_exists', 'describe_table', 'list_indexes',
+                       'list_constraints', 'get_foreign_key_details'):
+            bound = getattr(catalog, method)
+            results[method] = _median_ms(
+                lambda: [bound(table_name, schema) for table_name in table_names], repeat
+            )
+
+        results['describe_all_tables (batched)'] = _median_ms(
+            lambda: catalog.describe_all_tables(schema, include_constraints=True), repeat
+        )
+
+    return results
+
+
+def main() -> None:
+    """Command-line interface for the backend comparison."""
+    parser = argparse.ArgumentParser(description="Compare catalog query backends")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='public', help='Schema to introspect')
+    parser.add_argument('--tables', type=int, default=20,
+                        help='Number of tables sampled for the per-table methods')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement')
+    add_json_argument(parser)
+    args = parser.parse_args()
+
+    with PostgreSQLCatalog(args.db) as catalog:
+        if not catalog.schema_exists(args.schema):
+            print(f"Error: schema '{args.schema}' does not exist", file=sys.stderr)
+            sys.exit(1)
+        all_tables = [row['table_name'] for row in catalog.list_tables(args.schema)]
+
+    table_names = all_tables[:args.tables]
+    console.print(f"Schema [cyan]{args.schema}[/cyan]: {len(all_tables)} tables, "
+                  f"{len(table_names)} sampled, {args.repeat} repetitions")
+
+    results = {
+        backend: benchmark_backend(args.db, backend, args.schema, table_names, args.repeat)
+        for backend in available_backends()
+    }
+
+    baseline, candidate = 'information_schema', 'pg_catalog'
+    table = Table(title="Median latency (ms)", show_header=True, header_style="bold magenta")
+    table.add_column("Method")
+    table.add_column(baseline, justify="right")
+    table.add_column(candidate, justify="right")
+    table.add_column("Speedup", justify="right")
+    for method in results[baseline]:
+        slow, fast = results[baseline][method], results[candidate][method]
+        speedup = f"{slow / fast:.1f}x" if fast > 0 else "-"
+        table.add_row(method, f"{slow:.2f}", f"{fast:.2f}", speedup)
+    console.print(table)
+
+    write_json_results(args.json_output, {
+        'schema': args.schema,
+        'total_tables': len(all_tables),
+        'sampled_tables': len(table_names),
+        'repeat': args.repeat,
+        'results_ms': results
+    })
+
+
+if __name__ == "__main__":
+    main()
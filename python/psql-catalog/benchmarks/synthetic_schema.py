@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic schema of any size in a PostgreSQL database.
+
+The tables t00000, t00001, ... get an id primary key and --columns columns on
+average (names and types drawn from a realistic pool), --indexes secondary
+indexes each and --fk-out foreign keys on average to earlier tables. The
+referenced table is drawn with a bias towards the first tables (--fk-skew: 0
+spreads the references evenly, higher values concentrate them on a few hub
+tables with a large fan-in). --partitioned tables are partitioned by range of
+id into --partitions partitions, and --cycles foreign key cycles of
+--cycle-length tables are closed afterwards with ALTER TABLE.
+
+Tables are created --chunk at a time per transaction, so schemas of tens of
+thousands of tables stay within max_locks_per_transaction. The generation
+parameters are stored as the schema comment, so that a benchmark can reuse an
+existing schema generated with the same parameters.
+
+Usage:
+    python benchmarks/synthetic_schema.py --db $DB_CONN --schema synthetic --tables 10000
+    python benchmarks/synthetic_schema.py --db $DB_CONN --tables 2000 --fk-skew 2 --partitioned 20 --cycles 5
+    python benchmarks/synthetic_schema.py --db $DB_CONN --schema synthetic --drop
+"""
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import psycopg2
+from psycopg2 import sql
+from rich.console import Console
+
+from bench_common import add_db_argument
+
+console = Console()
+
+# (column name, type) pool the columns are drawn from
+COLUMN_POOL: Tuple[Tuple[str, str], ...] = (
+    ('name', 'varchar(120)'),
+    ('email', 'varchar(255)'),
+    ('status', 'varchar(20)'),
+    ('code', 'char(8)'),
+    ('description', 'text'),
+    ('amount', 'numeric(12,2)'),
+    ('price', 'numeric(10,2)'),
+    ('quantity', 'integer'),
+    ('position', 'smallint'),
+    ('score', 'double precision'),
+    ('is_active', 'boolean'),
+    ('created_at', 'timestamptz'),
+    ('updated_at', 'timestamptz'),
+    ('valid_from', 'date'),
+    ('external_id', 'uuid'),
+    ('payload', 'jsonb'),
+    ('tags', 'text[]'),
+    ('version', 'bigint'),
+)
+
+
+@dataclass
+class SchemaSpec:
+    """Parameters of a synthetic schema."""
+
+    tables: int = 1000
+    columns: int = 8
+    indexes: int = 2
+    fk_out: float = 1.5
+    fk_skew: float = 1.0
+    partitioned: int = 0
+    partitions: int = 4
+    cycles: int = 0
+    cycle_length: int = 3
+    seed: int = 42
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def table_name(index: int) -> str:
+    """Name of the index-th synthetic table."""
+    return f"t{index:05d}"
+
+
+def _referenced(rng: random.Random, index: int, skew: float) -> int:
+    """Draw an earlier table to reference, biased towards the first tables by skew."""
+    return int(index * rng.random() ** (1 + skew))
+
+
+def iter_ddl(spec: SchemaSpec, schema: str) -> Iterator[Tuple[str, Dict[str, int]]]:
+    """
+    Generate the statements creating a synthetic schema, table by table.
+
+    Args:
+        spec: Schema parameters
+        schema: Schema to create the tables in (created by the caller)
+
+    Yields:
+        (SQL creating one table with its indexes and partitions, counts of the
+        objects it creates), then the statements closing the cycles
+    """
+    rng = random.Random(spec.seed)
+    partitioned = set(rng.sample(range(spec.tables), min(spec.partitioned, spec.tables)))
+    quoted_schema = '"' + schema.replace('"', '""') + '"'
+
+    for index in range(spec.tables):
+        name = table_name(index)
+        qualified = f"{quoted_schema}.{name}"
+        column_count = max(1, int(rng.gauss(spec.columns, spec.columns / 4)))
+        columns = [('id', 'bigint NOT NULL')]
+        seen: Dict[str, int] = {}
+        for column_name, column_type in rng.choices(COLUMN_POOL, k=column_count):
+            seen[column_name] = seen.get(column_name, 0) + 1
+            if seen[column_name] > 1:
+                column_name = f"{column_name}_{seen[column_name]}"
+            columns.append((column_name, column_type + (' NOT NULL' if rng.random() < 0.3 else '')))
+
+        foreign_keys = []
+        if index:
+            fk_count = min(index, int(rng.uniform(0, 2 * spec.fk_out) + 0.5))
+            targets = {_referenced(rng, index, spec.fk_skew) for _ in range(fk_count)}
+            for target in sorted(targets):
+                column_name = f"{table_name(target)}_id"
+                columns.append((column_name, 'bigint'))
+                foreign_keys.append(
+                    f"CONSTRAINT {name}_{column_name}_fkey FOREIGN KEY ({column_name}) "
+                    f"REFERENCES {quoted_schema}.{table_name(target)} (id)"
+                )
+
+        definitions = [f"{column_name} {column_type}" for column_name, column_type in columns]
+        definitions.append(f"CONSTRAINT {name}_pkey PRIMARY KEY (id)")
+        definitions.extend(foreign_keys)
+        statements = [f"CREATE TABLE {qualified} (\n    " + ",\n    ".join(definitions) + "\n)"]
+        counts = {'tables': 1, 'partitions': 0, 'foreign_keys': len(foreign_keys), 'indexes': 1}
+
+        if index in partitioned:
+            statements[0] += " PARTITION BY RANGE (id)"
+            for partition in range(spec.partitions):
+                statements.append(
+                    f"CREATE TABLE {quoted_schema}.{name}_p{partition} PARTITION OF {qualified} "
+                    f"FOR VALUES FROM ({partition * 1000000}) TO ({(partition + 1) * 1000000})"
+                )
+            counts['partitions'] = spec.partitions
+
+        indexed = rng.sample(columns[1:], min(spec.indexes, len(columns) - 1))
+        for position, (column_name, column_type) in enumerate(indexed):
+            method = 'USING gin ' if column_type.startswith(('jsonb', 'text[]')) else ''
+            statements.append(f"CREATE INDEX {name}_ix{position} ON {qualified} {method}({column_name})")
+            counts['indexes'] += 1
+
+        yield ";\n".join(statements) + ";", counts
+
+    for cycle in range(spec.cycles):
+        members = rng.sample(range(spec.tables), min(spec.cycle_length, spec.tables))
+        statements = []
+        for position, source in enumerate(members):
+            target = table_name(members[(position + 1) % len(members)])
+            column_name = f"cycle{cycle}_{target}_id"
+            statements.append(
+                f"ALTER TABLE {quoted_schema}.{table_name(source)} ADD COLUMN {column_name} bigint, "
+                f"ADD CONSTRAINT {table_name(source)}_{column_name}_fkey FOREIGN KEY ({column_name}) "
+                f"REFERENCES {quoted_schema}.{target} (id)"
+            )
+        yield ";\n".join(statements) + ";", {'tables': 0, 'partitions': 0, 'foreign_keys': len(members), 'indexes': 0}
+
+
+def drop_schema(conn: Any, schema: str, chunk: int = 200) -> None:
+    """
+    Drop a schema, its tables chunk by chunk to stay within max_locks_per_transaction.
+
+    The last tables go first: foreign keys reference earlier tables, so a chunk
+    rarely cascades into (and locks) tables of the following chunks.
+    """
+    with conn.cursor() as cur:
+        while True:
+            cur.execute(
+                """
+                SELECT c.relname
+                FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+                ORDER BY c.relname DESC
+                LIMIT %s
+                """,
+                (schema, chunk)
+            )
+            names = [row[0] for row in cur.fetchall()]
+            if not names:
+                break
+            cur.execute(sql.SQL("DROP TABLE {} CASCADE").format(
+                sql.SQL(', ').join(sql.Identifier(schema, name) for name in names)
+            ))
+            conn.commit()
+        cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(schema)))
+    conn.commit()
+
+
+def existing_spec(conn: Any, schema: str) -> Optional[Dict[str, Any]]:
+    """The generation parameters stored on a schema, or None if it does not exist or was not generated."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT obj_description(oid, 'pg_namespace') FROM pg_namespace WHERE nspname = %s", (schema,)
+        )
+        row = cur.fetchone()
+    conn.rollback()
+    if not row or not row[0]:
+        return None
+    try:
+        return json.loads(row[0]).get('synthetic_schema')
+    except ValueError:
+        return None
+
+
+def create_synthetic_schema(dsn: str, spec: SchemaSpec, schema: str, chunk: int = 200) -> Dict[str, Any]:
+    """
+    (Re)create a synthetic schema.
+
+    Args:
+        dsn: PostgreSQL connection string
+        spec: Schema parameters
+        schema: Schema to (re)create
+        chunk: Tables created per transaction
+
+    Returns:
+        Counts of the created tables, partitions, foreign keys and indexes and the elapsed seconds
+    """
+    totals = {'tables': 0, 'partitions': 0, 'foreign_keys': 0, 'indexes': 0}
+    start = time.perf_counter()
+    conn = psycopg2.connect(dsn)
+    try:
+        drop_schema(conn, schema, chunk)
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(schema)))
+            pending = 0
+            for statement, counts in iter_ddl(spec, schema):
+                cur.execute(statement)
+                for key, count in counts.items():
+                    totals[key] += count
+                pending += 1
+                if pending == chunk:
+                    conn.commit()
+                    pending = 0
+            cur.execute(sql.SQL("COMMENT ON SCHEMA {} IS %s").format(sql.Identifier(schema)),
+                        (json.dumps({'synthetic_schema': spec.as_dict()}),))
+            conn.commit()
+            # Outside a transaction block ANALYZE takes one transaction (and its locks) per table
+            conn.autocommit = True
+            cur.execute(sql.SQL("ANALYZE"))
+    finally:
+        conn.close()
+    return {**totals, 'seconds': time.perf_counter() - start}
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the SchemaSpec parameters to a parser."""
+    defaults = SchemaSpec()
+    parser.add_argument('--tables', type=int, default=defaults.tables, help='Number of tables')
+    parser.add_argument('--columns', type=int, default=defaults.columns, help='Mean number of columns per table')
+    parser.add_argument('--indexes', type=int, default=defaults.indexes, help='Secondary indexes per table')
+    parser.add_argument('--fk-out', type=float, default=defaults.fk_out, help='Mean foreign keys per table')
+    parser.add_argument('--fk-skew', type=float, default=defaults.fk_skew,
+                        help='Bias of the referenced tables towards a few hubs (0: uniform)')
+    parser.add_argument('--partitioned', type=int, default=defaults.partitioned, help='Number of partitioned tables')
+    parser.add_argument('--partitions', type=int, default=defaults.partitions, help='Partitions per partitioned table')
+    parser.add_argument('--cycles', type=int, default=defaults.cycles, help='Number of foreign key cycles')
+    parser.add_argument('--cycle-length', type=int, default=defaults.cycle_length, help='Tables per cycle')
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='Random seed')
+
+
+def spec_from_args(args: argparse.Namespace) -> SchemaSpec:
+    """Build a SchemaSpec from the arguments added by add_spec_arguments."""
+    return SchemaSpec(
+        tables=args.tables, columns=args.columns, indexes=args.indexes, fk_out=args.fk_out,
+        fk_skew=args.fk_skew, partitioned=args.partitioned, partitions=args.partitions,
+        cycles=args.cycles, cycle_length=args.cycle_length, seed=args.seed
+    )
+
+
+def main() -> None:
+    """Command-line interface of the synthetic schema generator."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic schema in a PostgreSQL database")
+    add_db_argument(parser)
+    parser.add_argument('--schema', default='synthetic', help='Schema to (re)create')
+    parser.add_argument('--chunk', type=int, default=200, help='Tables created per transaction')
+    parser.add_argument('--drop', action='store_true', help='Only drop the schema')
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    if args.drop:
+        conn = psycopg2.connect(args.db)
+        try:
+            drop_schema(conn, args.schema, args.chunk)
+        finally:
+            conn.close()
+        console.print(f"[green]Dropped schema {args.schema}[/green]")
+        return
+
+    created = create_synthetic_schema(args.db, spec_from_args(args), args.schema, args.chunk)
+    console.print(
+        f"[green]Created {created['tables']} tables, {created['partitions']} partitions, "
+        f"{created['foreign_keys']} foreign keys and {created['indexes']} indexes in "
+        f"{args.schema} in {created['seconds']:.1f} s[/green]"
+    )
+
+
+if __name__ == "__main__":
+    main()
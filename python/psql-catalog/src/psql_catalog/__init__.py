@@ -11,7 +11,45 @@ __author__ = "Seu Nome"
 __email__ = "seu.email@exemplo.com"
 
 from psql_catalog.catalog import PostgreSQLCatalog
-from psql_catalog.display import display_table, display_constraints, display_database_info, display_json
+from psql_catalog.async_catalog import AsyncPostgreSQLCatalog, AsyncConnectionPool
+from psql_catalog.backends import (
+    InformationSchemaBackend,
+    PgCatalogBackend,
+    available_backends,
+    get_backend
+)
+from psql_catalog.cache import CatalogSnapshotCache
+from psql_catalog.memo import CatalogMemo, MemoStats
+from psql_catalog.instrumentation import (
+    QueryEvent,
+    QueryStats,
+    SlowQueryLog,
+    LatencyHistogram,
+    add_query_hook,
+    remove_query_hook,
+    query_hook
+)
+from psql_catalog.profiling import SamplingProfiler, DeterministicProfiler, AllocationTracer
+from psql_catalog.pool import ConnectionPool, PoolStats, shared_pool, close_shared_pools
+from psql_catalog.consistent import ConsistentCatalog, SnapshotConnectionPool
+from psql_catalog.resultset import ResultSet, Row
+from psql_catalog.model import (
+    Record,
+    record_type,
+    intern_value,
+    compact_table,
+    compact_tables,
+    table_from_reflection
+)
+from psql_catalog.lazy import CatalogView, LazyTableStructure
+from psql_catalog.filters import TABLE_KINDS, TableFilter, glob_to_regex
+from psql_catalog.display import (
+    display_table,
+    display_table_stream,
+    display_constraints,
+    display_database_info,
+    display_json
+)
 from psql_catalog.serialization import (
     JSONSerializableMixin,
     CatalogResult,
@@ -20,21 +58,37 @@ from psql_catalog.serialization import (
     DescribeResult,
     QueryResult,
     InfoResult,
+    SearchResult,
     create_schemas_result,
     create_tables_result,
     create_describe_result,
     create_query_result,
     create_info_result,
+    create_search_result,
     output_json,
-    save_json_to_file
+    save_json_to_file,
+    write_query_result_stream,
+    write_describe_all_stream
+)
+from psql_catalog.export import (
+    EXPORT_FORMATS,
+    ArrowResultWriter,
+    arrow_schema,
+    write_query_result_arrow,
+    write_catalog_arrow
 )
+from psql_catalog.snapshot import CatalogSnapshot, save_snapshot, load_snapshot
+from psql_catalog.store import CatalogStore
+from psql_catalog.fanout import DescribeTarget, DescribeOutcome, describe_target, fan_out_describe
 from psql_catalog.exceptions import (
     PSQLCatalogError,
     DatabaseConnectionError,
     QueryExecutionError,
     TableNotFoundError,
     SchemaNotFoundError,
-    InvalidConnectionStringError
+    InvalidConnectionStringError,
+    ExportError,
+    SnapshotError
 )
 from psql_catalog.main import main
 from psql_catalog.dependency_graph import (
@@ -55,7 +109,46 @@ from psql_catalog.batch_operations import (
 
 __all__ = [
     "PostgreSQLCatalog",
+    "AsyncPostgreSQLCatalog",
+    "AsyncConnectionPool",
+    "InformationSchemaBackend",
+    "PgCatalogBackend",
+    "available_backends",
+    "get_backend",
+    "CatalogSnapshotCache",
+    "CatalogMemo",
+    "MemoStats",
+    "QueryEvent",
+    "QueryStats",
+    "SlowQueryLog",
+    "LatencyHistogram",
+    "add_query_hook",
+    "remove_query_hook",
+    "query_hook",
+    "SamplingProfiler",
+    "DeterministicProfiler",
+    "AllocationTracer",
+    "ConnectionPool",
+    "PoolStats",
+    "shared_pool",
+    "close_shared_pools",
+    "ConsistentCatalog",
+    "SnapshotConnectionPool",
+    "ResultSet",
+    "Row",
+    "Record",
+    "record_type",
+    "intern_value",
+    "compact_table",
+    "compact_tables",
+    "table_from_reflection",
+    "CatalogView",
+    "LazyTableStructure",
+    "TableFilter",
+    "TABLE_KINDS",
+    "glob_to_regex",
     "display_table",
+    "display_table_stream",
     "display_constraints",
     "display_database_info",
     "display_json",
@@ -66,19 +159,38 @@ __all__ = [
     "DescribeResult",
     "QueryResult",
     "InfoResult",
+    "SearchResult",
     "create_schemas_result",
     "create_tables_result",
     "create_describe_result",
     "create_query_result",
     "create_info_result",
+    "create_search_result",
     "output_json",
     "save_json_to_file",
+    "write_query_result_stream",
+    "write_describe_all_stream",
+    "EXPORT_FORMATS",
+    "ArrowResultWriter",
+    "arrow_schema",
+    "write_query_result_arrow",
+    "write_catalog_arrow",
+    "CatalogSnapshot",
+    "save_snapshot",
+    "load_snapshot",
+    "CatalogStore",
+    "DescribeTarget",
+    "DescribeOutcome",
+    "describe_target",
+    "fan_out_describe",
     "PSQLCatalogError",
     "DatabaseConnectionError",
     "QueryExecutionError",
     "TableNotFoundError",
     "SchemaNotFoundError",
     "InvalidConnectionStringError",
+    "ExportError",
+    "SnapshotError",
     "main",
     # Dependency analysis classes
     "TableDependencyGraph",
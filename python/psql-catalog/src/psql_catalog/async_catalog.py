@@ -0,0 +1,558 @@
+"""
+Asynchronous PostgreSQL catalog inspection for psql-catalog.
+
+AsyncPostgreSQLCatalog offers the methods of PostgreSQLCatalog as coroutines,
+running the same backend queries and returning the same row dictionaries, on
+psycopg 3 AsyncConnections checked out from an AsyncConnectionPool. Every query
+holds a connection only while it runs, so many tables, schemas or databases can
+be described concurrently on one event loop with asyncio.gather.
+
+psycopg 3 is an optional dependency: pip install 'psql-catalog[async]'.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from .backends import DEFAULT_BACKEND, get_backend
+from .catalog import PostgreSQLCatalog
+from .exceptions import DatabaseConnectionError, QueryExecutionError, SchemaNotFoundError
+from .instrumentation import record_query
+from .pool import PoolStats
+
+logger = logging.getLogger(__name__)
+
+# Default number of connections of the pool an AsyncPostgreSQLCatalog opens itself
+DEFAULT_ASYNC_POOL_SIZE = 8
+
+
+def _import_psycopg() -> Any:
+    """Import psycopg 3, which the async catalog requires."""
+    try:
+        import psycopg
+    except ImportError:
+        raise QueryExecutionError(
+            "The async catalog requires psycopg 3: pip install 'psql-catalog[async]'"
+        )
+    return psycopg
+
+
+class AsyncConnectionPool:
+    """
+    Pool of psycopg 3 AsyncConnections for a single event loop.
+
+    Connections are opened lazily up to maxconn, in autocommit mode and returning
+    rows as dictionaries. When every connection is checked out, getconn() waits (up
+    to timeout seconds) for one to be returned. Unlike ConnectionPool, idle
+    connections are not pinged by default: the async catalog checks out a
+    connection per query, where a ping would double the round trips, and retries
+    a query once on a new connection when the old one turns out to be broken.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        maxconn: int = DEFAULT_ASYNC_POOL_SIZE,
+        timeout: float = 30.0,
+        pre_ping: bool = False
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            maxconn: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before failing
+            pre_ping: Check idle connections with a round trip before handing them out
+
+        Raises:
+            ValueError: If maxconn is lower than 1
+        """
+        if maxconn < 1:
+            raise ValueError(f"Invalid pool limits: maxconn={maxconn}")
+
+        self.connection_string = connection_string
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.stats = PoolStats()
+
+        self._cond = asyncio.Condition()
+        self._idle: List[Any] = []
+        self._used: Dict[int, Any] = {}
+        self._size = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether closeall() has been called."""
+        return self._closed
+
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle and checked out)."""
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        """Number of checked out connections."""
+        return len(self._used)
+
+    async def getconn(self) -> Any:
+        """
+        Check out a connection, waiting for one to be returned if the pool is full.
+
+        Returns:
+            An open psycopg AsyncConnection
+
+        Raises:
+            DatabaseConnectionError: If the pool is closed, no connection became free
+                within the timeout, or a new connection could not be opened
+        """
+        conn = None
+        started = time.perf_counter()
+        waited = False
+
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise DatabaseConnectionError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.maxconn:
+                    self._size += 1
+                    break
+                if not waited:
+                    waited = True
+                    self.stats.waits += 1
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise DatabaseConnectionError(
+                        f"Timed out after {self.timeout}s waiting for a pooled connection "
+                        f"({self.maxconn} in use)"
+                    )
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+            self.stats.checkouts += 1
+            if waited:
+                self.stats.wait_time_ms += (time.perf_counter() - started) * 1000
+
+        try:
+            if conn is None:
+                conn = await self._open()
+            elif conn.closed or (self.pre_ping and not await self._is_alive(conn)):
+                logger.info("Pooled connection is no longer usable, reconnecting")
+                await self._close_quietly(conn)
+                conn = await self._open()
+                self.stats.reconnects += 1
+        except BaseException:
+            await self._release_slot()
+            raise
+
+        self._used[id(conn)] = conn
+        return conn
+
+    async def putconn(self, conn: Any, close: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection obtained from getconn()
+            close: Close the connection instead of keeping it for reuse
+        """
+        if self._used.pop(id(conn), None) is None:
+            logger.warning("Ignoring a connection that was not checked out from this pool")
+            return
+
+        if close or conn.closed or conn.broken or self._closed:
+            await self._close_quietly(conn)
+            await self._release_slot()
+            return
+
+        async with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """
+        Check out a connection for the duration of an async with block.
+
+        The connection is discarded instead of reused if the block fails with a
+        database error that left it broken.
+
+        Yields:
+            An open psycopg AsyncConnection
+        """
+        conn = await self.getconn()
+        try:
+            yield conn
+        finally:
+            await self.putconn(conn)
+
+    async def closeall(self) -> None:
+        """Close the idle connections; checked out connections are closed when returned."""
+        async with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            await self._close_quietly(conn)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.closeall()
+
+    async def _open(self) -> Any:
+        """Open a new connection."""
+        psycopg = _import_psycopg()
+        from psycopg.rows import dict_row
+
+        try:
+            conn = await psycopg.AsyncConnection.connect(
+                self.connection_string, autocommit=True, row_factory=dict_row
+            )
+        except psycopg.Error as e:
+            logger.error(f"Database connection failed: {e}")
+            raise DatabaseConnectionError(f"Failed to connect to database: {e}")
+        self.stats.connections_opened += 1
+        logger.debug("Opened pooled async database connection")
+        return conn
+
+    async def _is_alive(self, conn: Any) -> bool:
+        """Check a connection with a cheap round trip."""
+        psycopg = _import_psycopg()
+        self.stats.pings += 1
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except psycopg.Error as e:
+            logger.debug(f"Pooled connection failed pre-ping: {e}")
+            return False
+
+    async def _release_slot(self) -> None:
+        """Give back the slot of a connection that was closed or could not be opened."""
+        async with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    async def _close_quietly(conn: Any) -> None:
+        """Close a connection, ignoring errors."""
+        try:
+            await conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+
+class AsyncPostgreSQLCatalog:
+    """
+    Coroutine counterpart of PostgreSQLCatalog.
+
+    Each query checks out a connection from the pool only while it runs, so
+    coroutines sharing a catalog run their queries concurrently, up to the pool
+    size. Without an explicit pool, connect() opens one of pool_size connections
+    and disconnect() closes it; a pool passed in is left open for its owner.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        backend: str = DEFAULT_BACKEND,
+        pool: Optional[AsyncConnectionPool] = None,
+        pool_size: int = DEFAULT_ASYNC_POOL_SIZE
+    ):
+        """
+        Initialize the async catalog.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            backend: Catalog query backend
+            pool: Optional shared pool to check connections out from
+            pool_size: Size of the pool opened by connect() when no pool is given
+        """
+        self.connection_string = connection_string
+        self.backend = get_backend(backend)
+        self.pool = pool
+        self.pool_size = pool_size
+        self._owns_pool = pool is None
+        self._database_name: Optional[str] = None
+        self._query_names: Dict[str, str] = {
+            query: attr.lower() for attr, query in self.backend.statements().items()
+        }
+
+    @property
+    def database_name(self) -> str:
+        """Get the current database name (known after get_database_info() ran)."""
+        return self._database_name or 'unknown'
+
+    async def connect(self) -> bool:
+        """
+        Prepare the connection pool and check that the database can be reached.
+
+        Returns:
+            True if connection successful
+
+        Raises:
+            DatabaseConnectionError: If connection fails
+        """
+        if self.pool is None or (self._owns_pool and self.pool.closed):
+            self.pool = AsyncConnectionPool(self.connection_string, maxconn=self.pool_size)
+            self._owns_pool = True
+        conn = await self.pool.getconn()
+        await self.pool.putconn(conn)
+        logger.info("Successfully connected to PostgreSQL database")
+        return True
+
+    async def disconnect(self) -> None:
+        """Close the pool opened by connect(); a shared pool is left open."""
+        if self.pool is not None and self._owns_pool:
+            await self.pool.closeall()
+            logger.info("Database connection closed")
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
+
+    async def execute_query(
+        self,
+        query: str,
+        params: Optional[Union[Tuple, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a SQL query on a pooled connection and return the results.
+
+        A query that fails because its connection was lost is retried once on a
+        new connection.
+
+        Args:
+            query: SQL query to execute
+            params: Query parameters
+
+        Returns:
+            List of dictionaries representing query results
+
+        Raises:
+            DatabaseConnectionError: If not connected to the database
+            QueryExecutionError: If query execution fails
+        """
+        if self.pool is None:
+            raise DatabaseConnectionError("Not connected to database")
+
+        psycopg = _import_psycopg()
+        name = self._query_names.get(query, 'query')
+        started = time.perf_counter()
+        for attempt in (1, 2):
+            conn = await self.pool.getconn()
+            try:
+                cursor = await conn.execute(query, params)
+                results = await cursor.fetchall() if cursor.description else []
+                record_query(name, started, results)
+                return results
+            except psycopg.OperationalError as e:
+                if attempt == 1 and conn.broken:
+                    logger.warning(f"Database connection lost, reconnecting: {e}")
+                    continue
+                record_query(name, started, failed=True)
+                raise QueryExecutionError(f"Query execution failed: {e}")
+            except psycopg.Error as e:
+                record_query(name, started, failed=True)
+                raise QueryExecutionError(f"Query execution failed: {e}")
+            finally:
+                await self.pool.putconn(conn)
+        raise AssertionError("unreachable")
+
+    async def list_schemas(self) -> List[Dict[str, Any]]:
+        """List all user-defined schemas in the database."""
+        return await self.execute_query(self.backend.LIST_SCHEMAS)
+
+    async def list_tables(self, schema_name: str = 'public') -> List[Dict[str, Any]]:
+        """List all tables in a specific schema."""
+        return await self.execute_query(self.backend.LIST_TABLES, (schema_name,))
+
+    async def describe_table(self, table_name: str, schema_name: str = 'public') -> List[Dict[str, Any]]:
+        """Get detailed column information for a table."""
+        return await self.execute_query(self.backend.DESCRIBE_TABLE, (table_name, schema_name))
+
+    async def list_indexes(self, table_name: str, schema_name: str = 'public') -> List[Dict[str, Any]]:
+        """List all indexes for a specific table."""
+        return await self.execute_query(self.backend.LIST_INDEXES, (table_name, schema_name))
+
+    async def list_constraints(self, table_name: str, schema_name: str = 'public') -> List[Dict[str, Any]]:
+        """List all integrity constraints for a table."""
+        return await self.execute_query(self.backend.LIST_CONSTRAINTS, (table_name, schema_name))
+
+    async def get_foreign_key_details(self, table_name: str, schema_name: str = 'public') -> List[Dict[str, Any]]:
+        """Get detailed foreign key information including referential actions."""
+        return await self.execute_query(self.backend.FOREIGN_KEY_DETAILS, (table_name, schema_name))
+
+    async def get_database_info(self) -> Dict[str, Any]:
+        """Get general database information."""
+        result = await self.execute_query(self.backend.DATABASE_INFO)
+        info = result[0] if result else {}
+        self._database_name = info.get('database_name', self._database_name)
+        return info
+
+    async def table_exists(self, table_name: str, schema_name: str = 'public') -> bool:
+        """Check if a table exists in the specified schema."""
+        result = await self.execute_query(self.backend.TABLE_EXISTS, (schema_name, table_name))
+        return result[0]['exists'] if result else False
+
+    async def schema_exists(self, schema_name: str) -> bool:
+        """Check if a schema exists."""
+        result = await self.execute_query(self.backend.SCHEMA_EXISTS, (schema_name,))
+        return result[0]['exists'] if result else False
+
+    async def catalog_fingerprint(self, schema_name: Optional[str] = None) -> str:
+        """Get a fingerprint of the catalog that changes whenever DDL touches it."""
+        result = await self.execute_query(self.backend.CATALOG_FINGERPRINT, {'schema_name': schema_name})
+        return result[0]['fingerprint'] if result else ''
+
+    async def describe_all_columns(self, schema_name: str = 'public') -> Dict[str, List[Dict[str, Any]]]:
+        """Get column information for every table of a schema in a single query."""
+        return PostgreSQLCatalog._group_by_table(await self.execute_query(self.backend.ALL_COLUMNS, (schema_name,)))
+
+    async def list_all_indexes(self, schema_name: str = 'public') -> Dict[str, List[Dict[str, Any]]]:
+        """List the indexes of every table of a schema in a single query."""
+        return PostgreSQLCatalog._group_by_table(await self.execute_query(self.backend.ALL_INDEXES, (schema_name,)))
+
+    async def list_all_constraints(self, schema_name: str = 'public') -> Dict[str, List[Dict[str, Any]]]:
+        """List the integrity constraints of every table of a schema in a single query."""
+        return PostgreSQLCatalog._group_by_table(
+            await self.execute_query(self.backend.ALL_CONSTRAINTS, (schema_name,))
+        )
+
+    async def get_all_foreign_key_details(self, schema_name: str = 'public') -> Dict[str, List[Dict[str, Any]]]:
+        """Get foreign key details for every table of a schema in a single query."""
+        return PostgreSQLCatalog._group_by_table(
+            await self.execute_query(self.backend.ALL_FOREIGN_KEY_DETAILS, (schema_name,))
+        )
+
+    async def describe_all_tables(
+        self,
+        schema_name: str = 'public',
+        include_constraints: bool = False,
+        batched: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe all tables in a schema with their complete structure.
+
+        Args:
+            schema_name: Name of the schema to describe
+            include_constraints: Whether to include constraint information
+            batched: Whether to use the schema-wide queries instead of per-table ones
+
+        Returns:
+            Dictionary with table names as keys and table information as values,
+            plus the '_metadata' entry of PostgreSQLCatalog.describe_all_tables
+
+        Raises:
+            SchemaNotFoundError: If the schema does not exist
+        """
+        if not await self.schema_exists(schema_name):
+            raise SchemaNotFoundError(f"Schema '{schema_name}' does not exist")
+
+        tables = await self.list_tables(schema_name)
+        table_names = [table_info['table_name'] for table_info in tables]
+        result, failed_tables = await self.describe_tables(table_names, schema_name, include_constraints, batched)
+
+        result['_metadata'] = {
+            'failed_tables': failed_tables,
+            'total_processed': len(tables),
+            'successful': len(result)
+        }
+        return result
+
+    async def describe_tables(
+        self,
+        table_names: List[str],
+        schema_name: str = 'public',
+        include_constraints: bool = False,
+        batched: bool = True
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Describe the given tables of a schema.
+
+        In batched mode the schema-wide queries run concurrently, each on its own
+        connection. Otherwise the tables are described concurrently, each with its
+        own queries, as many at a time as the pool has connections.
+
+        Args:
+            table_names: Names of the tables to describe
+            schema_name: Schema containing the tables
+            include_constraints: Whether to include constraint information
+            batched: Whether to use the schema-wide queries instead of per-table ones
+
+        Returns:
+            Tuple of the described tables (in the order of table_names) and the
+            names of the tables that could not be described
+        """
+        if batched:
+            return await self._describe_tables_batched(table_names, schema_name, include_constraints), []
+
+        limit = asyncio.Semaphore(self.pool.maxconn if self.pool is not None else 1)
+
+        async def describe(table_name: str) -> Optional[Dict[str, Any]]:
+            async with limit:
+                return await self._describe_table_sections(table_name, schema_name, include_constraints)
+
+        described = await asyncio.gather(*(describe(table_name) for table_name in table_names))
+        return PostgreSQLCatalog._collect_described(zip(table_names, described))
+
+    async def _describe_tables_batched(
+        self,
+        table_names: List[str],
+        schema_name: str,
+        include_constraints: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """Describe the given tables with the schema-wide queries, run concurrently."""
+        queries = [self.describe_all_columns(schema_name), self.list_all_indexes(schema_name)]
+        if include_constraints:
+            queries += [self.list_all_constraints(schema_name), self.get_all_foreign_key_details(schema_name)]
+        columns, indexes, *constraint_sections = await asyncio.gather(*queries)
+        return dict(PostgreSQLCatalog._join_sections(table_names, columns, indexes, *constraint_sections))
+
+    async def _describe_table_sections(
+        self,
+        table_name: str,
+        schema_name: str,
+        include_constraints: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Describe one table with the per-table queries, or return None if that fails."""
+        sections = [self.describe_table(table_name, schema_name), self.list_indexes(table_name, schema_name)]
+        if include_constraints:
+            sections += [
+                self.list_constraints(table_name, schema_name),
+                self.get_foreign_key_details(table_name, schema_name),
+            ]
+        results = await asyncio.gather(*sections, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            logger.warning(f"Failed to describe table '{schema_name}.{table_name}': {errors[0]}")
+            return None
+
+        columns, indexes, *constraint_sections = results
+        constraints, fk_details = constraint_sections or (None, None)
+        return {
+            'columns': columns,
+            'indexes': indexes,
+            'constraints': constraints,
+            'foreign_key_details': fk_details
+        }
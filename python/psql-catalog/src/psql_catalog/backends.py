@@ -0,0 +1,765 @@
+"""
+Catalog query backends for psql-catalog.
+
+A backend holds the SQL texts used by PostgreSQLCatalog. Every backend returns rows
+with exactly the same keys for a given catalog method, so callers (display,
+serialization, dependency analysis) do not need to know which one is in use.
+
+Available backends:
+
+- information_schema: portable queries on the SQL-standard views (default)
+- pg_catalog: queries written directly on pg_class/pg_attribute/pg_constraint/pg_index,
+  which avoid the privilege checks and the joins of the information_schema views and
+  are much faster on large catalogs
+"""
+
+from typing import Dict, List, Type
+
+
+def _for_tables(query: str, table_column: str) -> str:
+    """
+    Restrict a schema-wide query to a list of tables.
+
+    Args:
+        query: Schema-wide query taking (schema_name,)
+        table_column: Expression holding the table name in the query
+
+    Returns:
+        The query taking (schema_name, table_names) parameters
+    """
+    head, order_by = query.rsplit('ORDER BY', 1)
+    return f"{head.rstrip()}\n            AND {table_column} = ANY(%s)\n        ORDER BY{order_by}"
+
+
+# Conditions of the FILTER_TABLES queries on the pg_class row c of each table (see
+# filters.TableFilter.query_params for the parameters; NULL disables a condition)
+_TABLE_FILTERS = """
+            AND (%(include)s::text[] IS NULL OR c.relname ~ ANY(%(include)s::text[]))
+            AND (%(exclude)s::text[] IS NULL OR NOT c.relname ~ ANY(%(exclude)s::text[]))
+            AND (%(kinds)s::text[] IS NULL OR CASE
+                    WHEN c.relispartition THEN 'partition'
+                    WHEN c.relkind = 'p' THEN 'partitioned'
+                    WHEN c.relkind = 'v' THEN 'view'
+                    WHEN c.relkind = 'f' THEN 'foreign'
+                    ELSE 'table'
+                END = ANY(%(kinds)s::text[]))"""
+
+
+class InformationSchemaBackend:
+    """
+    Catalog queries based on the information_schema views.
+
+    Per-table queries take (table_name, schema_name) parameters, schema-wide queries
+    take (schema_name,) and tag each row with the owning table in '_table_name'. The
+    TABLES_* queries are the schema-wide ones restricted to a list of tables, taking
+    (schema_name, table_names). FILTER_TABLES is LIST_TABLES with the conditions of
+    a filters.TableFilter, taking named parameters.
+    """
+
+    name = 'information_schema'
+
+    @classmethod
+    def statements(cls) -> Dict[str, str]:
+        """Get the SQL texts of the backend keyed by their constant name (e.g. 'DESCRIBE_TABLE')."""
+        return {
+            attr: getattr(cls, attr)
+            for attr in dir(cls)
+            if attr.isupper() and isinstance(getattr(cls, attr), str)
+        }
+
+    LIST_SCHEMAS = """
+        SELECT
+            schema_name,
+            schema_owner
+        FROM information_schema.schemata
+        WHERE schema_name NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+        ORDER BY schema_name;
+        """
+
+    LIST_TABLES = """
+        SELECT
+            table_name,
+            table_type,
+            table_schema
+        FROM information_schema.tables
+        WHERE table_schema = %s
+        ORDER BY table_name;
+        """
+
+    FILTER_TABLES = f"""
+        SELECT
+            t.table_name,
+            t.table_type,
+            t.table_schema
+        FROM information_schema.tables t
+            JOIN pg_namespace n ON n.nspname = t.table_schema
+            JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = t.table_name
+        WHERE t.table_schema = %(schema_name)s{_TABLE_FILTERS}
+        ORDER BY t.table_name
+        LIMIT %(limit)s OFFSET %(offset)s;
+        """
+
+    DESCRIBE_TABLE = """
+        SELECT
+            column_name,
+            data_type,
+            is_nullable,
+            column_default,
+            character_maximum_length,
+            numeric_precision,
+            numeric_scale
+        FROM information_schema.columns
+        WHERE table_name = %s AND table_schema = %s
+        ORDER BY ordinal_position;
+        """
+
+    LIST_INDEXES = """
+        SELECT
+            i.relname AS index_name,
+            a.attname AS column_name,
+            ix.indisunique AS is_unique,
+            ix.indisprimary AS is_primary
+        FROM
+            pg_class t,
+            pg_class i,
+            pg_index ix,
+            pg_attribute a,
+            pg_namespace n
+        WHERE
+            t.oid = ix.indrelid
+            AND i.oid = ix.indexrelid
+            AND a.attrelid = t.oid
+            AND a.attnum = ANY(ix.indkey)
+            AND t.relkind = 'r'
+            AND t.relname = %s
+            AND n.nspname = %s
+            AND n.oid = t.relnamespace
+        ORDER BY i.relname, a.attnum;
+        """
+
+    LIST_CONSTRAINTS = """
+        SELECT
+            tc.constraint_name,
+            tc.constraint_type,
+            tc.table_name,
+            tc.table_schema,
+            kcu.column_name,
+            CASE
+                WHEN tc.constraint_type = 'FOREIGN KEY' THEN
+                    ccu.table_schema || '.' || ccu.table_name || '.' || ccu.column_name
+                ELSE NULL
+            END AS foreign_table_column,
+            CASE
+                WHEN tc.constraint_type = 'CHECK' THEN cc.check_clause
+                ELSE NULL
+            END AS check_clause,
+            tc.is_deferrable,
+            tc.initially_deferred
+        FROM
+            information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            LEFT JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            LEFT JOIN information_schema.check_constraints AS cc
+                ON cc.constraint_name = tc.constraint_name
+                AND cc.constraint_schema = tc.table_schema
+        WHERE
+            tc.table_name = %s
+            AND tc.table_schema = %s
+        ORDER BY
+            CASE tc.constraint_type
+                WHEN 'PRIMARY KEY' THEN 1
+                WHEN 'FOREIGN KEY' THEN 2
+                WHEN 'UNIQUE' THEN 3
+                WHEN 'CHECK' THEN 4
+                ELSE 5
+            END,
+            tc.constraint_name,
+            kcu.ordinal_position;
+        """
+
+    FOREIGN_KEY_DETAILS = """
+        SELECT
+            tc.constraint_name,
+            kcu.column_name AS column_name,
+            ccu.table_schema AS foreign_table_schema,
+            ccu.table_name AS foreign_table_name,
+            ccu.column_name AS foreign_column_name,
+            rc.update_rule AS on_update,
+            rc.delete_rule AS on_delete,
+            tc.is_deferrable,
+            tc.initially_deferred
+        FROM
+            information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            JOIN information_schema.referential_constraints AS rc
+                ON tc.constraint_name = rc.constraint_name
+                AND tc.table_schema = rc.constraint_schema
+        WHERE
+            tc.constraint_type = 'FOREIGN KEY'
+            AND tc.table_name = %s
+            AND tc.table_schema = %s
+        ORDER BY tc.constraint_name, kcu.ordinal_position;
+        """
+
+    DATABASE_INFO = """
+        SELECT
+            current_database() as database_name,
+            current_user as current_user,
+            version() as version,
+            current_setting('server_encoding') as encoding,
+            current_setting('TimeZone') as timezone;
+        """
+
+    TABLE_EXISTS = """
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables
+            WHERE table_schema = %s AND table_name = %s
+        );
+        """
+
+    SCHEMA_EXISTS = """
+        SELECT EXISTS (
+            SELECT FROM information_schema.schemata
+            WHERE schema_name = %s
+        );
+        """
+
+    # Cheap change detector for the catalog of one schema: row counts and xmin sums of
+    # the catalog tables touched by DDL. Any CREATE/ALTER/DROP on the schema changes it.
+    # The namespace part alone (schema_name NULL) covers the list of schemas.
+    CATALOG_FINGERPRINT = """
+        SELECT md5(concat_ws('|',
+            (SELECT count(*) || ':' || coalesce(sum(xmin::text::bigint), 0)
+             FROM pg_namespace),
+            (SELECT count(*) || ':' || coalesce(sum(c.xmin::text::bigint), 0)
+             FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = %(schema_name)s),
+            (SELECT count(*) || ':' || coalesce(sum(a.xmin::text::bigint), 0)
+             FROM pg_attribute a
+                JOIN pg_class c ON c.oid = a.attrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = %(schema_name)s),
+            (SELECT count(*) || ':' || coalesce(sum(d.xmin::text::bigint), 0)
+             FROM pg_attrdef d
+                JOIN pg_class c ON c.oid = d.adrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = %(schema_name)s),
+            (SELECT count(*) || ':' || coalesce(sum(con.xmin::text::bigint), 0)
+             FROM pg_constraint con
+                JOIN pg_namespace n ON n.oid = con.connamespace
+             WHERE n.nspname = %(schema_name)s),
+            (SELECT count(*) || ':' || coalesce(sum(ix.xmin::text::bigint), 0)
+             FROM pg_index ix
+                JOIN pg_class c ON c.oid = ix.indrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE n.nspname = %(schema_name)s)
+        )) AS fingerprint;
+        """
+
+    ALL_COLUMNS = """
+        SELECT
+            table_name AS _table_name,
+            column_name,
+            data_type,
+            is_nullable,
+            column_default,
+            character_maximum_length,
+            numeric_precision,
+            numeric_scale
+        FROM information_schema.columns
+        WHERE table_schema = %s
+        ORDER BY table_name, ordinal_position;
+        """
+
+    ALL_INDEXES = """
+        SELECT
+            t.relname AS _table_name,
+            i.relname AS index_name,
+            a.attname AS column_name,
+            ix.indisunique AS is_unique,
+            ix.indisprimary AS is_primary
+        FROM
+            pg_class t,
+            pg_class i,
+            pg_index ix,
+            pg_attribute a,
+            pg_namespace n
+        WHERE
+            t.oid = ix.indrelid
+            AND i.oid = ix.indexrelid
+            AND a.attrelid = t.oid
+            AND a.attnum = ANY(ix.indkey)
+            AND t.relkind = 'r'
+            AND n.nspname = %s
+            AND n.oid = t.relnamespace
+        ORDER BY t.relname, i.relname, a.attnum;
+        """
+
+    ALL_CONSTRAINTS = """
+        SELECT
+            tc.table_name AS _table_name,
+            tc.constraint_name,
+            tc.constraint_type,
+            tc.table_name,
+            tc.table_schema,
+            kcu.column_name,
+            CASE
+                WHEN tc.constraint_type = 'FOREIGN KEY' THEN
+                    ccu.table_schema || '.' || ccu.table_name || '.' || ccu.column_name
+                ELSE NULL
+            END AS foreign_table_column,
+            CASE
+                WHEN tc.constraint_type = 'CHECK' THEN cc.check_clause
+                ELSE NULL
+            END AS check_clause,
+            tc.is_deferrable,
+            tc.initially_deferred
+        FROM
+            information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            LEFT JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            LEFT JOIN information_schema.check_constraints AS cc
+                ON cc.constraint_name = tc.constraint_name
+                AND cc.constraint_schema = tc.table_schema
+        WHERE
+            tc.table_schema = %s
+        ORDER BY
+            tc.table_name,
+            CASE tc.constraint_type
+                WHEN 'PRIMARY KEY' THEN 1
+                WHEN 'FOREIGN KEY' THEN 2
+                WHEN 'UNIQUE' THEN 3
+                WHEN 'CHECK' THEN 4
+                ELSE 5
+            END,
+            tc.constraint_name,
+            kcu.ordinal_position;
+        """
+
+    ALL_FOREIGN_KEY_DETAILS = """
+        SELECT
+            tc.table_name AS _table_name,
+            tc.constraint_name,
+            kcu.column_name AS column_name,
+            ccu.table_schema AS foreign_table_schema,
+            ccu.table_name AS foreign_table_name,
+            ccu.column_name AS foreign_column_name,
+            rc.update_rule AS on_update,
+            rc.delete_rule AS on_delete,
+            tc.is_deferrable,
+            tc.initially_deferred
+        FROM
+            information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            JOIN information_schema.referential_constraints AS rc
+                ON tc.constraint_name = rc.constraint_name
+                AND tc.table_schema = rc.constraint_schema
+        WHERE
+            tc.constraint_type = 'FOREIGN KEY'
+            AND tc.table_schema = %s
+        ORDER BY tc.table_name, tc.constraint_name, kcu.ordinal_position;
+        """
+
+    TABLES_COLUMNS = _for_tables(ALL_COLUMNS, 'table_name')
+    TABLES_INDEXES = _for_tables(ALL_INDEXES, 't.relname')
+    TABLES_CONSTRAINTS = _for_tables(ALL_CONSTRAINTS, 'tc.table_name')
+    TABLES_FOREIGN_KEY_DETAILS = _for_tables(ALL_FOREIGN_KEY_DETAILS, 'tc.table_name')
+
+
+class PgCatalogBackend(InformationSchemaBackend):
+    """
+    Catalog queries written directly on the pg_catalog tables.
+
+    The rows have the same keys and value conventions as the information_schema
+    backend ('YES'/'NO' flags, 'BASE TABLE'/'VIEW' table types, SQL-standard data
+    type names). Differences worth knowing:
+
+    - objects are listed regardless of the privileges of the current user
+    - constraints are reported one row per constrained column, with multi-column
+      foreign keys paired column by column, and CHECK constraints are included
+    """
+
+    name = 'pg_catalog'
+
+    LIST_SCHEMAS = """
+        SELECT
+            n.nspname AS schema_name,
+            pg_get_userbyid(n.nspowner) AS schema_owner
+        FROM pg_namespace n
+        WHERE n.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+        ORDER BY n.nspname;
+        """
+
+    LIST_TABLES = """
+        SELECT
+            c.relname AS table_name,
+            CASE c.relkind
+                WHEN 'v' THEN 'VIEW'
+                WHEN 'f' THEN 'FOREIGN'
+                ELSE 'BASE TABLE'
+            END AS table_type,
+            n.nspname AS table_schema
+        FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %s
+            AND c.relkind IN ('r', 'p', 'v', 'f')
+        ORDER BY c.relname;
+        """
+
+    FILTER_TABLES = f"""
+        SELECT
+            c.relname AS table_name,
+            CASE c.relkind
+                WHEN 'v' THEN 'VIEW'
+                WHEN 'f' THEN 'FOREIGN'
+                ELSE 'BASE TABLE'
+            END AS table_type,
+            n.nspname AS table_schema
+        FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %(schema_name)s
+            AND c.relkind IN ('r', 'p', 'v', 'f'){_TABLE_FILTERS}
+        ORDER BY c.relname
+        LIMIT %(limit)s OFFSET %(offset)s;
+        """
+
+    DESCRIBE_TABLE = """
+        SELECT
+            a.attname AS column_name,
+            CASE
+                WHEN t.typtype = 'd' THEN
+                    CASE
+                        WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY'
+                        WHEN bn.nspname = 'pg_catalog' THEN format_type(t.typbasetype, NULL)
+                        ELSE 'USER-DEFINED'
+                    END
+                WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+                WHEN tn.nspname = 'pg_catalog' THEN format_type(a.atttypid, NULL)
+                ELSE 'USER-DEFINED'
+            END AS data_type,
+            CASE
+                WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) THEN 'NO'
+                ELSE 'YES'
+            END AS is_nullable,
+            CASE
+                WHEN a.attgenerated = '' THEN pg_get_expr(ad.adbin, ad.adrelid)
+            END AS column_default,
+            information_schema._pg_char_max_length(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ) AS character_maximum_length,
+            information_schema._pg_numeric_precision(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ) AS numeric_precision,
+            information_schema._pg_numeric_scale(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ) AS numeric_scale
+        FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_type t ON t.oid = a.atttypid
+            JOIN pg_namespace tn ON tn.oid = t.typnamespace
+            LEFT JOIN pg_type bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+            LEFT JOIN pg_namespace bn ON bn.oid = bt.typnamespace
+            LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+        WHERE c.relname = %s
+            AND n.nspname = %s
+            AND c.relkind IN ('r', 'p', 'v', 'f')
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+        ORDER BY a.attnum;
+        """
+
+    LIST_CONSTRAINTS = """
+        SELECT
+            con.conname AS constraint_name,
+            CASE con.contype
+                WHEN 'p' THEN 'PRIMARY KEY'
+                WHEN 'f' THEN 'FOREIGN KEY'
+                WHEN 'u' THEN 'UNIQUE'
+                WHEN 'c' THEN 'CHECK'
+            END AS constraint_type,
+            c.relname AS table_name,
+            n.nspname AS table_schema,
+            a.attname AS column_name,
+            CASE
+                WHEN con.contype = 'f' THEN fn.nspname || '.' || fc.relname || '.' || fa.attname
+                ELSE NULL
+            END AS foreign_table_column,
+            CASE
+                WHEN con.contype = 'c' THEN substring(pg_get_constraintdef(con.oid) from 7)
+                ELSE NULL
+            END AS check_clause,
+            CASE WHEN con.condeferrable THEN 'YES' ELSE 'NO' END AS is_deferrable,
+            CASE WHEN con.condeferred THEN 'YES' ELSE 'NO' END AS initially_deferred
+        FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN LATERAL unnest(con.conkey, con.confkey)
+                WITH ORDINALITY AS k(attnum, fattnum, ordinal_position) ON true
+            LEFT JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            LEFT JOIN pg_class fc ON fc.oid = con.confrelid
+            LEFT JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+            LEFT JOIN pg_attribute fa ON fa.attrelid = con.confrelid AND fa.attnum = k.fattnum
+        WHERE con.contype IN ('p', 'f', 'u', 'c')
+            AND c.relname = %s
+            AND n.nspname = %s
+        ORDER BY
+            CASE con.contype
+                WHEN 'p' THEN 1
+                WHEN 'f' THEN 2
+                WHEN 'u' THEN 3
+                WHEN 'c' THEN 4
+                ELSE 5
+            END,
+            con.conname,
+            k.ordinal_position;
+        """
+
+    FOREIGN_KEY_DETAILS = """
+        SELECT
+            con.conname AS constraint_name,
+            a.attname AS column_name,
+            fn.nspname AS foreign_table_schema,
+            fc.relname AS foreign_table_name,
+            fa.attname AS foreign_column_name,
+            CASE con.confupdtype
+                WHEN 'a' THEN 'NO ACTION'
+                WHEN 'r' THEN 'RESTRICT'
+                WHEN 'c' THEN 'CASCADE'
+                WHEN 'n' THEN 'SET NULL'
+                WHEN 'd' THEN 'SET DEFAULT'
+            END AS on_update,
+            CASE con.confdeltype
+                WHEN 'a' THEN 'NO ACTION'
+                WHEN 'r' THEN 'RESTRICT'
+                WHEN 'c' THEN 'CASCADE'
+                WHEN 'n' THEN 'SET NULL'
+                WHEN 'd' THEN 'SET DEFAULT'
+            END AS on_delete,
+            CASE WHEN con.condeferrable THEN 'YES' ELSE 'NO' END AS is_deferrable,
+            CASE WHEN con.condeferred THEN 'YES' ELSE 'NO' END AS initially_deferred
+        FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+                WITH ORDINALITY AS k(attnum, fattnum, ordinal_position)
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            JOIN pg_class fc ON fc.oid = con.confrelid
+            JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+            JOIN pg_attribute fa ON fa.attrelid = con.confrelid AND fa.attnum = k.fattnum
+        WHERE con.contype = 'f'
+            AND c.relname = %s
+            AND n.nspname = %s
+        ORDER BY con.conname, k.ordinal_position;
+        """
+
+    TABLE_EXISTS = """
+        SELECT EXISTS (
+            SELECT FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s
+                AND c.relname = %s
+                AND c.relkind IN ('r', 'p', 'v', 'f')
+        );
+        """
+
+    SCHEMA_EXISTS = """
+        SELECT EXISTS (
+            SELECT FROM pg_namespace
+            WHERE nspname = %s
+        );
+        """
+
+    ALL_COLUMNS = """
+        SELECT
+            c.relname AS _table_name,
+            a.attname AS column_name,
+            CASE
+                WHEN t.typtype = 'd' THEN
+                    CASE
+                        WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY'
+                        WHEN bn.nspname = 'pg_catalog' THEN format_type(t.typbasetype, NULL)
+                        ELSE 'USER-DEFINED'
+                    END
+                WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+                WHEN tn.nspname = 'pg_catalog' THEN format_type(a.atttypid, NULL)
+                ELSE 'USER-DEFINED'
+            END AS data_type,
+            CASE
+                WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) THEN 'NO'
+                ELSE 'YES'
+            END AS is_nullable,
+            CASE
+                WHEN a.attgenerated = '' THEN pg_get_expr(ad.adbin, ad.adrelid)
+            END AS column_default,
+            information_schema._pg_char_max_length(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ) AS character_maximum_length,
+            information_schema._pg_numeric_precision(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ) AS numeric_precision,
+            information_schema._pg_numeric_scale(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ) AS numeric_scale
+        FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_type t ON t.oid = a.atttypid
+            JOIN pg_namespace tn ON tn.oid = t.typnamespace
+            LEFT JOIN pg_type bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+            LEFT JOIN pg_namespace bn ON bn.oid = bt.typnamespace
+            LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+        WHERE n.nspname = %s
+            AND c.relkind IN ('r', 'p', 'v', 'f')
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+        ORDER BY c.relname, a.attnum;
+        """
+
+    ALL_CONSTRAINTS = """
+        SELECT
+            c.relname AS _table_name,
+            con.conname AS constraint_name,
+            CASE con.contype
+                WHEN 'p' THEN 'PRIMARY KEY'
+                WHEN 'f' THEN 'FOREIGN KEY'
+                WHEN 'u' THEN 'UNIQUE'
+                WHEN 'c' THEN 'CHECK'
+            END AS constraint_type,
+            c.relname AS table_name,
+            n.nspname AS table_schema,
+            a.attname AS column_name,
+            CASE
+                WHEN con.contype = 'f' THEN fn.nspname || '.' || fc.relname || '.' || fa.attname
+                ELSE NULL
+            END AS foreign_table_column,
+            CASE
+                WHEN con.contype = 'c' THEN substring(pg_get_constraintdef(con.oid) from 7)
+                ELSE NULL
+            END AS check_clause,
+            CASE WHEN con.condeferrable THEN 'YES' ELSE 'NO' END AS is_deferrable,
+            CASE WHEN con.condeferred THEN 'YES' ELSE 'NO' END AS initially_deferred
+        FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN LATERAL unnest(con.conkey, con.confkey)
+                WITH ORDINALITY AS k(attnum, fattnum, ordinal_position) ON true
+            LEFT JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            LEFT JOIN pg_class fc ON fc.oid = con.confrelid
+            LEFT JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+            LEFT JOIN pg_attribute fa ON fa.attrelid = con.confrelid AND fa.attnum = k.fattnum
+        WHERE con.contype IN ('p', 'f', 'u', 'c')
+            AND n.nspname = %s
+        ORDER BY
+            c.relname,
+            CASE con.contype
+                WHEN 'p' THEN 1
+                WHEN 'f' THEN 2
+                WHEN 'u' THEN 3
+                WHEN 'c' THEN 4
+                ELSE 5
+            END,
+            con.conname,
+            k.ordinal_position;
+        """
+
+    ALL_FOREIGN_KEY_DETAILS = """
+        SELECT
+            c.relname AS _table_name,
+            con.conname AS constraint_name,
+            a.attname AS column_name,
+            fn.nspname AS foreign_table_schema,
+            fc.relname AS foreign_table_name,
+            fa.attname AS foreign_column_name,
+            CASE con.confupdtype
+                WHEN 'a' THEN 'NO ACTION'
+                WHEN 'r' THEN 'RESTRICT'
+                WHEN 'c' THEN 'CASCADE'
+                WHEN 'n' THEN 'SET NULL'
+                WHEN 'd' THEN 'SET DEFAULT'
+            END AS on_update,
+            CASE con.confdeltype
+                WHEN 'a' THEN 'NO ACTION'
+                WHEN 'r' THEN 'RESTRICT'
+                WHEN 'c' THEN 'CASCADE'
+                WHEN 'n' THEN 'SET NULL'
+                WHEN 'd' THEN 'SET DEFAULT'
+            END AS on_delete,
+            CASE WHEN con.condeferrable THEN 'YES' ELSE 'NO' END AS is_deferrable,
+            CASE WHEN con.condeferred THEN 'YES' ELSE 'NO' END AS initially_deferred
+        FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+                WITH ORDINALITY AS k(attnum, fattnum, ordinal_position)
+            JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+            JOIN pg_class fc ON fc.oid = con.confrelid
+            JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+            JOIN pg_attribute fa ON fa.attrelid = con.confrelid AND fa.attnum = k.fattnum
+        WHERE con.contype = 'f'
+            AND n.nspname = %s
+        ORDER BY c.relname, con.conname, k.ordinal_position;
+        """
+
+    TABLES_COLUMNS = _for_tables(ALL_COLUMNS, 'c.relname')
+    TABLES_CONSTRAINTS = _for_tables(ALL_CONSTRAINTS, 'c.relname')
+    TABLES_FOREIGN_KEY_DETAILS = _for_tables(ALL_FOREIGN_KEY_DETAILS, 'c.relname')
+
+
+BACKENDS: Dict[str, Type[InformationSchemaBackend]] = {
+    InformationSchemaBackend.name: InformationSchemaBackend,
+    PgCatalogBackend.name: PgCatalogBackend,
+}
+
+DEFAULT_BACKEND = InformationSchemaBackend.name
+
+
+def available_backends() -> List[str]:
+    """Get the names of the available catalog query backends."""
+    return list(BACKENDS.keys())
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> InformationSchemaBackend:
+    """
+    Get a catalog query backend by name.
+
+    Args:
+        name: Backend name ('information_schema' or 'pg_catalog')
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown catalog backend '{name}'. Available: {', '.join(available_backends())}"
+        )
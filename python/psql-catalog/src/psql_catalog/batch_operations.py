@@ -9,11 +9,14 @@ in the correct order based on their foreign key dependencies.
 import argparse
 import json
 import sys
+import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
 # Assuming the dependency_graph module is in the same package
 from psql_catalog import TableDependencyGraph, CycleDetectionError, analyze_schema_file
+from psql_catalog.instrumentation import record_query, statement_kind
+from psql_catalog.pool import ConnectionPool, close_shared_pools, shared_pool
 
 
 class BatchOperationError(Exception):
@@ -26,16 +29,19 @@ class DatabaseBatchOperations:
     Utility class for performing batch database operations in dependency order.
     """
 
-    def __init__(self, schema_json_path: str, connection_string: Optional[str] = None):
+    def __init__(self, schema_json_path: str, connection_string: Optional[str] = None, pool: Optional[ConnectionPool] = None):
         """
         Initialize batch operations handler.
 
         Args:
             schema_json_path: Path to the schema JSON file from psql-catalog
             connection_string: Optional PostgreSQL connection string for direct execution
+            pool: Optional connection pool to take connections from (shared with the
+                catalog) instead of opening a new connection per execution
         """
         self.schema_json_path = Path(schema_json_path)
-        self.connection_string = connection_string
+        self.connection_string = connection_string or (pool.connection_string if pool else None)
+        self.pool = pool
         self.dependency_graph = analyze_schema_file(str(self.schema_json_path))
 
     def generate_drop_statements(self, cascade: bool = False) -> List[str]:
@@ -262,25 +268,40 @@ class DatabaseBatchOperations:
         try:
             import psycopg2
 
-            with psycopg2.connect(self.connection_string) as conn:
-                with conn.cursor() as cursor:
-                    for i, stmt in enumerate(statements, 1):
-                        try:
-                            print(f"Executing statement {i}: {stmt.strip()}")
-                            cursor.execute(stmt)
-                            print(f"✓ Statement {i} executed successfully")
-                        except Exception as e:
-                            print(f"❌ Statement {i} failed: {e}")
-                            raise
-
-                    conn.commit()
-                    print(f"\n✓ All {len(statements)} statements executed successfully")
+            if self.pool is not None:
+                with self.pool.connection() as conn:
+                    self._run_statements(conn, statements)
+            else:
+                conn = psycopg2.connect(self.connection_string)
+                try:
+                    self._run_statements(conn, statements)
+                finally:
+                    conn.close()
 
         except ImportError:
             raise BatchOperationError("psycopg2 is required for direct statement execution")
         except Exception as e:
             raise BatchOperationError(f"Failed to execute statements: {e}")
 
+    @staticmethod
+    def _run_statements(conn: Any, statements: List[str]) -> None:
+        """Execute statements in a single transaction on an open connection."""
+        with conn:
+            with conn.cursor() as cursor:
+                for i, stmt in enumerate(statements, 1):
+                    started = time.perf_counter()
+                    try:
+                        print(f"Executing statement {i}: {stmt.strip()}")
+                        cursor.execute(stmt)
+                        record_query(statement_kind(stmt), started, row_count=max(cursor.rowcount, 0))
+                        print(f"✓ Statement {i} executed successfully")
+                    except Exception as e:
+                        record_query(statement_kind(stmt), started, failed=True)
+                        print(f"❌ Statement {i} failed: {e}")
+                        raise
+
+        print(f"\n✓ All {len(statements)} statements executed successfully")
+
 
 def main():
     """Command-line interface for batch operations."""
@@ -334,8 +355,10 @@ Examples:
         sys.exit(1)
 
     try:
-        # Initialize batch operations handler
-        batch_ops = DatabaseBatchOperations(args.schema_file, args.connection)
+        # Initialize batch operations handler; executed statements run on the
+        # process-wide pool, so other users of the connection string share it
+        pool = shared_pool(args.connection) if args.execute else None
+        batch_ops = DatabaseBatchOperations(args.schema_file, args.connection, pool=pool)
 
         if args.command == 'analyze':
             # Full analysis
@@ -419,6 +442,8 @@ Examples:
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        close_shared_pools()
 
 
 if __name__ == "__main__":
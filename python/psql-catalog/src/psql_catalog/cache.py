@@ -0,0 +1,185 @@
+"""
+Persistent catalog snapshot cache for psql-catalog.
+
+Catalog results are stored on disk, keyed by database, command, schema and options,
+together with a fingerprint of the catalog (see PostgreSQLCatalog.catalog_fingerprint).
+A cached snapshot is reused for as long as the fingerprint is unchanged, so repeated
+commands against an unchanged schema cost one cheap query instead of a full
+introspection.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from psycopg2.extensions import parse_dsn
+
+from .resultset import ResultSet, Row, to_builtin
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the default cache directory.
+
+    Uses $PSQL_CATALOG_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/psql-catalog
+    (~/.cache/psql-catalog).
+    """
+    if os.environ.get('PSQL_CATALOG_CACHE_DIR'):
+        return Path(os.environ['PSQL_CATALOG_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'psql-catalog'
+
+
+def database_identity(connection_string: str) -> Dict[str, str]:
+    """
+    Identify a database from its connection string, leaving out the password.
+
+    Args:
+        connection_string: PostgreSQL connection string
+
+    Returns:
+        Dictionary with host, port, dbname and user
+    """
+    try:
+        params = parse_dsn(connection_string)
+    except Exception:
+        params = {'dsn': connection_string.split('@')[-1]}
+    return {key: str(params.get(key, '')) for key in ('host', 'port', 'dbname', 'user', 'dsn')
+            if key in params}
+
+
+def database_label(connection_string: str) -> str:
+    """
+    Get a display name for a database: host:port/dbname (without credentials).
+
+    Args:
+        connection_string: PostgreSQL connection string
+
+    Returns:
+        The database label
+    """
+    identity = database_identity(connection_string)
+    if 'dsn' in identity:
+        return identity['dsn']
+    return f"{identity.get('host') or 'localhost'}:{identity.get('port') or '5432'}/{identity.get('dbname', '')}"
+
+
+class CatalogSnapshotCache:
+    """
+    On-disk cache of catalog results invalidated by a catalog fingerprint.
+
+    Each entry is a JSON file named after the hash of its key and holds the
+    fingerprint observed before the data was loaded.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, refresh: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the snapshot files (default: default_cache_dir())
+            refresh: Ignore existing snapshots and always reload (the new data is still stored)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, key: Dict[str, Any]) -> Path:
+        """Get the file that stores the entry for a key."""
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def load(
+        self,
+        catalog: Any,
+        command: str,
+        loader: Callable[[], Any],
+        schema: Optional[str] = None,
+        **params: Any
+    ) -> Any:
+        """
+        Get a catalog result from the cache, or load and store it.
+
+        Args:
+            catalog: Connected PostgreSQLCatalog used to compute the fingerprint
+            command: Command name the data belongs to (e.g. 'describe-all')
+            loader: Callable that queries the catalog; its result must be JSON serializable
+            schema: Schema the data belongs to (None for database-wide data)
+            **params: Command options that change the result
+
+        Returns:
+            The cached or freshly loaded data
+        """
+        key = {
+            'version': CACHE_FORMAT_VERSION,
+            'database': database_identity(catalog.connection_string),
+            'backend': catalog.backend.name,
+            'command': command,
+            'schema': schema,
+            'params': params,
+        }
+        path = self.entry_path(key)
+        fingerprint = catalog.catalog_fingerprint(schema)
+
+        if not self.refresh:
+            entry = self._read(path)
+            if entry is not None and entry.get('fingerprint') == fingerprint:
+                self.hits += 1
+                logger.debug(f"Catalog snapshot cache hit for {command} ({path.name})")
+                return entry['data']
+
+        self.misses += 1
+        data = loader()
+        self._write(path, {
+            'key': key,
+            'fingerprint': fingerprint,
+            'created_at': datetime.now().isoformat(),
+            'data': data,
+        })
+        return data
+
+    def clear(self) -> int:
+        """
+        Remove every snapshot from the cache directory.
+
+        Returns:
+            Number of removed snapshot files
+        """
+        removed = 0
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.glob('*.json'):
+                path.unlink()
+                removed += 1
+        return removed
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Read a cache entry, treating unreadable files as missing."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+            return None
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        """Write a cache entry atomically; failures only disable caching for this entry."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=lambda obj: to_builtin(obj) if isinstance(obj, (ResultSet, Row)) else dict(obj) if isinstance(obj, Mapping) else str(obj))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write catalog snapshot {path}: {e}")
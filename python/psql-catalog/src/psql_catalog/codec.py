@@ -0,0 +1,198 @@
+"""
+Typed JSON codec for the psql-catalog result dataclasses.
+
+Encoding never goes through dataclasses.asdict, which deep-copies every nested
+dict and list: with orjson installed (pip install 'psql-catalog[fast-json]') the
+dataclasses are serialized natively, otherwise each dataclass is turned into a
+shallow dictionary by an encoder compiled once per class and written by the json
+module.
+
+Decoding rebuilds the nested types declared by the dataclass annotations
+(TableStructure inside DescribeResult and DescribeAllResult, DatabaseInfo inside
+InfoResult, datetime fields, ...) with a decoder compiled once per class from its
+type hints, instead of passing the raw dictionaries to the constructor.
+
+orjson writes non-ASCII characters as UTF-8 instead of \\u escapes, and its compact
+output (indent=None) has no spaces after separators; separators() reports the
+separators in use for streaming writers that splice encoded fragments together.
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+
+from .resultset import ResultSet
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+T = TypeVar('T')
+
+_Converter = Callable[[Any], Any]
+
+_encoders: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+_decoders: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def _uses_orjson(indent: Optional[int]) -> bool:
+    """Whether orjson produces the requested layout (it only indents by two spaces)."""
+    return orjson is not None and indent in (None, 2)
+
+
+def _class_encoder(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """Get the shallow dictionary encoder of a dataclass, compiling it on first use."""
+    encoder = _encoders.get(cls)
+    if encoder is None:
+        names = tuple(f.name for f in fields(cls))
+        encoder = _encoders[cls] = lambda obj: {name: getattr(obj, name) for name in names}
+    return encoder
+
+
+def _default(obj: Any) -> Any:
+    """Encode the values that neither orjson nor json handle natively."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return _class_encoder(type(obj))(obj)
+    if isinstance(obj, ResultSet):
+        return obj.to_dicts()
+    if isinstance(obj, Mapping):
+        # Row views and model.Record rows
+        return dict(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, memoryview):
+        return obj.tobytes().hex()
+    if hasattr(obj, '__dict__'):
+        # Objects using JSONSerializableMixin without being dataclasses
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """
+    Encode a result dataclass (or any JSON-compatible value) to a JSON string.
+
+    Args:
+        obj: Value to encode; dataclasses, datetimes, Decimals, ResultSets and row mappings
+            are converted on the fly
+        indent: JSON indentation (None for compact output)
+
+    Returns:
+        The JSON document
+
+    Raises:
+        TypeError: If a value cannot be encoded
+    """
+    if _uses_orjson(indent):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        try:
+            return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # Values orjson rejects (e.g. integers over 64 bits) are left to the json
+            # module, which encodes them or raises TypeError
+            pass
+    if is_dataclass(obj) and not isinstance(obj, type):
+        obj = _class_encoder(type(obj))(obj)
+    return json.dumps(obj, indent=indent, default=_default)
+
+
+def separators(indent: Optional[int] = None) -> Tuple[str, str]:
+    """
+    Get the (item, key) separators dumps uses at the top level for an indentation.
+
+    Args:
+        indent: JSON indentation (None for compact output)
+
+    Returns:
+        Tuple of (item separator, key separator)
+    """
+    if indent is not None:
+        return ',', ': '
+    return (',', ':') if _uses_orjson(indent) else (', ', ': ')
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _parse_datetime(value: Any) -> Any:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _converter(hint: Any) -> _Converter:
+    """Compile the function that rebuilds a decoded JSON value of the given type."""
+    if isinstance(hint, type) and is_dataclass(hint):
+        return _class_decoder(hint)
+    if hint is datetime:
+        return _parse_datetime
+
+    origin = get_origin(hint)
+    args = get_args(hint)
+    if origin is Union:
+        options = [arg for arg in args if arg is not type(None)]
+        if len(options) != 1:
+            return _identity
+        inner = _converter(options[0])
+        if inner is _identity:
+            return _identity
+        return lambda value: None if value is None else inner(value)
+    if origin in (list, List) and args:
+        item = _converter(args[0])
+        if item is _identity:
+            return _identity
+        return lambda value: [item(v) for v in value] if isinstance(value, list) else value
+    if origin in (dict, Dict) and len(args) == 2:
+        item = _converter(args[1])
+        if item is _identity:
+            return _identity
+        return lambda value: {k: item(v) for k, v in value.items()} if isinstance(value, dict) else value
+    return _identity
+
+
+def _class_decoder(cls: type) -> Callable[[Dict[str, Any]], Any]:
+    """Get the decoder of a dataclass, compiling it from the type hints on first use."""
+    decoder = _decoders.get(cls)
+    if decoder is not None:
+        return decoder
+
+    # Registered before the field converters are compiled, so recursive types terminate
+    field_converters: Dict[str, _Converter] = {}
+
+    def decoder(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        return cls(**{
+            name: field_converters[name](item) if name in field_converters else item
+            for name, item in value.items()
+        })
+
+    _decoders[cls] = decoder
+    hints = get_type_hints(cls)
+    for f in fields(cls):
+        converter = _converter(hints.get(f.name, Any))
+        if converter is not _identity:
+            field_converters[f.name] = converter
+    return decoder
+
+
+def loads(cls: Type[T], data: Union[str, bytes]) -> T:
+    """
+    Decode a JSON document into an instance of cls, rebuilding its nested types.
+
+    Args:
+        cls: Result class (a dataclass, or any class taking the keys as keyword arguments)
+        data: JSON document
+
+    Returns:
+        The decoded instance
+    """
+    value = orjson.loads(data) if orjson is not None else json.loads(data)
+    if is_dataclass(cls):
+        return _class_decoder(cls)(value)
+    return cls(**value)
@@ -0,0 +1,356 @@
+"""
+Consistent, thread-safe catalog reads for psql-catalog.
+
+A plain PostgreSQLCatalog runs its queries in a READ COMMITTED transaction, so
+every statement sees the catalog as of its own start: DDL committed during a
+describe-all yields a torn view, and worker threads with their own connections
+see different states.
+
+SnapshotConnectionPool opens a leader connection that exports its snapshot
+(pg_export_snapshot) inside a REPEATABLE READ READ ONLY DEFERRABLE transaction,
+and every connection it hands out imports that snapshot (SET TRANSACTION
+SNAPSHOT) in a transaction of the same kind. All catalogs borrowing from the pool,
+on any thread, therefore read one and the same catalog state for as long as the
+pool is open. ConsistentCatalog wraps such a pool and describes the tables of
+one or many schemas on parallel worker threads.
+
+Functions that read the system caches instead of the snapshot (such as
+pg_get_indexdef or format_type) can still reflect DDL committed after the export,
+as with pg_dump.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import psycopg2
+from psycopg2 import extensions
+
+from .backends import DEFAULT_BACKEND
+from .catalog import PostgreSQLCatalog
+from .exceptions import DatabaseConnectionError, SchemaNotFoundError
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Default number of worker threads (and pooled connections) of a ConsistentCatalog
+DEFAULT_SNAPSHOT_WORKERS = 4
+
+T = TypeVar('T')
+
+
+class SnapshotConnectionPool(ConnectionPool):
+    """
+    Connection pool whose connections all read the same exported snapshot.
+
+    Every connection stays inside a REPEATABLE READ READ ONLY transaction that
+    imported the snapshot of the leader connection, also while idle in the pool.
+    When a failed query rolls that transaction back (through reset()), the
+    snapshot is imported again, so the connection keeps its view of the catalog.
+    The snapshot lives until closeall().
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        maxconn: int = DEFAULT_SNAPSHOT_WORKERS,
+        timeout: float = 30.0,
+        deferrable: bool = True
+    ):
+        """
+        Initialize the pool and export the snapshot.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            maxconn: Maximum number of open connections, not counting the leader
+            timeout: Seconds to wait for a free connection before failing
+            deferrable: Open the transactions as DEFERRABLE
+
+        Raises:
+            ValueError: If maxconn is lower than 1
+            DatabaseConnectionError: If the leader connection or the export fails
+        """
+        self.deferrable = deferrable
+        self._leader = self._connect(connection_string)
+        try:
+            with self._leader.cursor() as cursor:
+                cursor.execute("SELECT pg_export_snapshot()")
+                self.snapshot_id: str = cursor.fetchone()[0]
+        except psycopg2.Error as e:
+            self._leader.close()
+            raise DatabaseConnectionError(f"Failed to export a catalog snapshot: {e}")
+        logger.info(f"Exported catalog snapshot {self.snapshot_id}")
+
+        try:
+            super().__init__(connection_string, maxconn=maxconn, timeout=timeout, pre_ping=True)
+        except Exception:
+            self._leader.close()
+            raise
+
+    def reset(self, conn: extensions.connection) -> bool:
+        """
+        Keep a connection in its snapshot transaction, importing the snapshot again if it ended.
+
+        Args:
+            conn: Checked out connection
+
+        Returns:
+            True if the connection reads the snapshot, False if it should be discarded
+        """
+        if conn.closed:
+            return False
+        if conn.info.transaction_status == extensions.TRANSACTION_STATUS_INTRANS:
+            return True
+        if not super().reset(conn):
+            return False
+        try:
+            self._import_snapshot(conn)
+            return True
+        except psycopg2.Error as e:
+            logger.debug(f"Failed to import snapshot {self.snapshot_id} again: {e}")
+            return False
+
+    def closeall(self) -> None:
+        """Close the idle connections and end the exported snapshot."""
+        super().closeall()
+        if not self._leader.closed:
+            self._leader.close()
+
+    def _open(self) -> extensions.connection:
+        """Open a new connection reading the exported snapshot."""
+        conn = super()._open()
+        try:
+            self._set_session(conn)
+            self._import_snapshot(conn)
+        except psycopg2.Error as e:
+            conn.close()
+            raise DatabaseConnectionError(f"Failed to import catalog snapshot {self.snapshot_id}: {e}")
+        return conn
+
+    def _connect(self, connection_string: str) -> extensions.connection:
+        """Open the leader connection."""
+        try:
+            conn = psycopg2.connect(connection_string)
+        except psycopg2.Error as e:
+            logger.error(f"Database connection failed: {e}")
+            raise DatabaseConnectionError(f"Failed to connect to database: {e}")
+        self._set_session(conn)
+        return conn
+
+    def _set_session(self, conn: extensions.connection) -> None:
+        """Make the transactions of a connection REPEATABLE READ READ ONLY (DEFERRABLE)."""
+        conn.set_session(
+            isolation_level=extensions.ISOLATION_LEVEL_REPEATABLE_READ,
+            readonly=True,
+            deferrable=self.deferrable
+        )
+
+    def _import_snapshot(self, conn: extensions.connection) -> None:
+        """Start a transaction on the exported snapshot; it must be its first statement."""
+        with conn.cursor() as cursor:
+            cursor.execute("SET TRANSACTION SNAPSHOT %s", (self.snapshot_id,))
+
+
+class ConsistentCatalog:
+    """
+    Thread-safe catalog whose every query reads one exported snapshot.
+
+    The instance can be shared between threads: each call borrows its own
+    snapshot-synchronized connection from a SnapshotConnectionPool. The describe
+    methods spread their work over up to `workers` threads.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        backend: str = DEFAULT_BACKEND,
+        workers: int = DEFAULT_SNAPSHOT_WORKERS,
+        deferrable: bool = True,
+        timeout: float = 30.0
+    ):
+        """
+        Export the snapshot and prepare the pool of worker connections.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            backend: Catalog query backend
+            workers: Maximum number of worker threads and pooled connections
+            deferrable: Open the transactions as DEFERRABLE
+            timeout: Seconds to wait for a free connection before failing
+
+        Raises:
+            ValueError: If workers is lower than 1 or the backend is unknown
+            DatabaseConnectionError: If the snapshot cannot be exported
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+
+        self.connection_string = connection_string
+        self.backend = backend
+        self.workers = workers
+        self.pool = SnapshotConnectionPool(connection_string, maxconn=workers, timeout=timeout, deferrable=deferrable)
+        self._database_name: Optional[str] = None
+
+    @property
+    def snapshot_id(self) -> str:
+        """Identifier of the exported snapshot, usable with SET TRANSACTION SNAPSHOT."""
+        return self.pool.snapshot_id
+
+    @property
+    def database_name(self) -> str:
+        """Get the current database name."""
+        if self._database_name is None:
+            with self.catalog() as catalog:
+                self._database_name = catalog.database_name
+        return self._database_name
+
+    @contextmanager
+    def catalog(self) -> Iterator[PostgreSQLCatalog]:
+        """
+        Borrow a catalog reading the snapshot, for use on the current thread.
+
+        Yields:
+            A connected PostgreSQLCatalog
+        """
+        with PostgreSQLCatalog(self.connection_string, self.backend, pool=self.pool) as catalog:
+            yield catalog
+
+    def close(self) -> None:
+        """Close the worker connections and end the snapshot."""
+        self.pool.closeall()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def describe_tables(
+        self,
+        table_names: List[str],
+        schema_name: str = 'public',
+        include_constraints: bool = False,
+        batched: bool = True
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Describe the given tables of a schema on parallel workers.
+
+        In batched mode each schema-wide query runs on its own worker; otherwise
+        the tables are split into one contiguous chunk per worker.
+
+        Args:
+            table_names: Names of the tables to describe
+            schema_name: Schema containing the tables
+            include_constraints: Whether to include constraint information
+            batched: Whether to use the schema-wide queries instead of per-table ones
+
+        Returns:
+            Tuple of the described tables (in the order of table_names) and the
+            names of the tables that could not be described
+        """
+        if batched:
+            queries: List[Callable[[PostgreSQLCatalog], Any]] = [
+                lambda catalog: catalog.describe_all_columns(schema_name),
+                lambda catalog: catalog.list_all_indexes(schema_name),
+            ]
+            if include_constraints:
+                queries += [
+                    lambda catalog: catalog.list_all_constraints(schema_name),
+                    lambda catalog: catalog.get_all_foreign_key_details(schema_name),
+                ]
+            sections = self._run_parallel(queries)
+            return dict(PostgreSQLCatalog._join_sections(table_names, *sections)), []
+
+        chunk_size = -(-len(table_names) // self.workers) or 1
+        chunks = [table_names[start:start + chunk_size] for start in range(0, len(table_names), chunk_size)]
+        described_chunks = self._run_parallel([
+            lambda catalog, chunk=chunk: catalog.describe_tables(chunk, schema_name, include_constraints, batched=False)
+            for chunk in chunks
+        ])
+
+        result: Dict[str, Dict[str, Any]] = {}
+        failed_tables: List[str] = []
+        for described, failed in described_chunks:
+            result.update(described)
+            failed_tables.extend(failed)
+        return result, failed_tables
+
+    def describe_all_tables(
+        self,
+        schema_name: str = 'public',
+        include_constraints: bool = False,
+        batched: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe all tables in a schema, as PostgreSQLCatalog.describe_all_tables does.
+
+        Args:
+            schema_name: Name of the schema to describe
+            include_constraints: Whether to include constraint information
+            batched: Whether to use the schema-wide queries instead of per-table ones
+
+        Returns:
+            Dictionary with table names as keys and table information as values,
+            plus the '_metadata' entry
+
+        Raises:
+            SchemaNotFoundError: If the schema does not exist
+        """
+        with self.catalog() as catalog:
+            if not catalog.schema_exists(schema_name):
+                raise SchemaNotFoundError(f"Schema '{schema_name}' does not exist")
+            tables = catalog.list_tables(schema_name)
+
+        table_names = [table_info['table_name'] for table_info in tables]
+        result, failed_tables = self.describe_tables(table_names, schema_name, include_constraints, batched)
+        result['_metadata'] = {
+            'failed_tables': failed_tables,
+            'total_processed': len(tables),
+            'successful': len(result)
+        }
+        return result
+
+    def describe_schemas(
+        self,
+        schema_names: List[str],
+        include_constraints: bool = False,
+        batched: bool = True
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Describe several schemas from the same snapshot, one schema per worker.
+
+        Args:
+            schema_names: Names of the schemas to describe
+            include_constraints: Whether to include constraint information
+            batched: Whether to use the schema-wide queries instead of per-table ones
+
+        Returns:
+            Dictionary with schema names as keys and the describe_all_tables
+            result of each schema as values
+
+        Raises:
+            SchemaNotFoundError: If one of the schemas does not exist
+        """
+        def describe(catalog: PostgreSQLCatalog, schema_name: str) -> Dict[str, Dict[str, Any]]:
+            return catalog.describe_all_tables(schema_name, include_constraints, batched)
+
+        results = self._run_parallel([
+            lambda catalog, schema_name=schema_name: describe(catalog, schema_name)
+            for schema_name in schema_names
+        ])
+        return dict(zip(schema_names, results))
+
+    def _run_parallel(self, jobs: List[Callable[[PostgreSQLCatalog], T]]) -> List[T]:
+        """Run each job with its own borrowed catalog on the worker threads, keeping their order."""
+        def run(job: Callable[[PostgreSQLCatalog], T]) -> T:
+            with self.catalog() as catalog:
+                return job(catalog)
+
+        if len(jobs) <= 1:
+            return [run(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs)),
+                                thread_name_prefix='psql-catalog-snapshot') as executor:
+            return list(executor.map(run, jobs))
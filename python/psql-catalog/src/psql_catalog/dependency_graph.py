@@ -89,6 +89,23 @@ class TableDependencyGraph:
         with open(json_file_path, 'r', encoding='utf-8') as f:
             schema_data = json.load(f)
         self.load_from_schema_data(schema_data)
+
+    @classmethod
+    def from_catalog(cls, catalog: Any, schema_name: str = 'public') -> 'TableDependencyGraph':
+        """
+        Build the dependency graph of a schema straight from a connected catalog.
+
+        Only the table list and the foreign keys are queried (one query each, through
+        a lazy CatalogView), not the columns, indexes or other constraints.
+
+        Args:
+            catalog: Connected PostgreSQLCatalog
+            schema_name: Schema to analyze
+
+        Returns:
+            The dependency graph
+        """
+        return cls({'tables': catalog.catalog_view(schema_name)})
     
     def load_from_schema_data(self, schema_data: Dict[str, Any]) -> None:
         """
@@ -132,8 +149,8 @@ class TableDependencyGraph:
             table_info: Table information dictionary
         """
         # Check foreign_key_details first (more detailed info)
-        fk_details = table_info.get('foreign_key_details', [])
-        if fk_details:
+        fk_details = table_info.get('foreign_key_details')
+        if fk_details is not None:
             for fk in fk_details:
                 target_table = fk.get('foreign_table_name')
                 if target_table and target_table in self.nodes:
@@ -153,7 +170,7 @@ class TableDependencyGraph:
         
         # Fallback to constraints if foreign_key_details not available
         elif 'constraints' in table_info:
-            constraints = table_info.get('constraints', [])
+            constraints = table_info.get('constraints') or []
             for constraint in constraints:
                 if constraint.get('constraint_type') == 'FOREIGN KEY':
                     foreign_ref = constraint.get('foreign_table_column', '')
@@ -285,15 +302,15 @@ class TableDependencyGraph:
             cycle_str = " -> ".join(cycle) if cycle else "unknown"
             raise CycleDetectionError(f"Circular dependency detected: {cycle_str}")
         
-        # Kahn's algorithm for topological sorting
+        # Kahn's algorithm for topological sorting: a table is emitted once all the
+        # tables it waits for are, then the tables waiting for it are released
         if order == GraphTraversalOrder.FORWARD:
             # For INSERT: dependencies first
-            adjacency = self._adjacency_list
-            in_degree = {table: len(deps) for table, deps in adjacency.items()}
+            waits_for, releases = self._adjacency_list, self._reverse_adjacency_list
         else:
             # For DROP: dependents first (reverse the graph)
-            adjacency = self._reverse_adjacency_list
-            in_degree = {table: len(deps) for table, deps in adjacency.items()}
+            waits_for, releases = self._reverse_adjacency_list, self._adjacency_list
+        in_degree = {table: len(waits_for.get(table, ())) for table in self.nodes}
         
         # Initialize queue with nodes that have no dependencies
         queue = deque([table for table, degree in in_degree.items() if degree == 0])
@@ -304,7 +321,7 @@ class TableDependencyGraph:
             result.append(current)
             
             # Update in-degrees of neighbors
-            for neighbor in adjacency.get(current, set()):
+            for neighbor in releases.get(current, set()):
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
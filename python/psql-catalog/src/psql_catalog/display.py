@@ -3,7 +3,8 @@ Display and formatting utilities for psql-catalog.
 """
 
 import json
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -11,9 +12,12 @@ from rich.text import Text
 from rich.syntax import Syntax
 from rich.rule import Rule
 
+from .resultset import ResultSet
 from .serialization import CatalogResult, DescribeAllResult, TableStructure
 
 console = Console()
+# Diagnostics (e.g. --stats) go to stderr so they never mix with JSON written to stdout
+stderr_console = Console(stderr=True)
 
 
 def display_table(data: List[Dict[str, Any]], title: str) -> None:
@@ -148,7 +152,7 @@ def display_table(data: List[Dict[str, Any]], title: str) -> None:
     Display data in a rich table format.
 
     Args:
-        data: List of dictionaries containing the data to display
+        data: List of dictionaries (or a ResultSet) containing the data to display
         title: Title for the table
     """
     if not data:
@@ -157,18 +161,66 @@ def display_table(data: List[Dict[str, Any]], title: str) -> None:
 
     table = Table(title=title, show_header=True, header_style="bold magenta")
 
+    if isinstance(data, ResultSet):
+        # Compact result: read the column names once and the values without building Rows
+        columns, rows = data.columns, data.iter_tuples()
+    else:
+        columns, rows = data[0].keys(), (row.values() for row in data)
+
     # Add columns
-    if data:
-        for column in data[0].keys():
-            table.add_column(column.replace('_', ' ').title())
+    for column in columns:
+        table.add_column(column.replace('_', ' ').title())
 
-        # Add rows
-        for row in data:
-            table.add_row(*[str(value) if value is not None else "" for value in row.values()])
+    # Add rows
+    for values in rows:
+        table.add_row(*[str(value) if value is not None else "" for value in values])
 
     console.print(table)
 
 
+def display_table_stream(
+    rows: Iterable[Dict[str, Any]],
+    title: str,
+    page_size: int = 50,
+    max_rows: Optional[int] = None
+) -> int:
+    """
+    Display rows in rich tables of page_size rows, as they arrive.
+
+    The first page is printed as soon as its rows are available, and only one page
+    is held in memory at a time, so arbitrarily large results can be displayed.
+
+    Args:
+        rows: Iterable of dictionaries (e.g. PostgreSQLCatalog.stream_query)
+        title: Title for the table
+        page_size: Number of rows per printed table
+        max_rows: Stop after this many rows (None for no limit)
+
+    Returns:
+        Number of rows displayed
+    """
+    iterator = iter(rows)
+    shown = 0
+
+    while max_rows is None or shown < max_rows:
+        limit = page_size if max_rows is None else min(page_size, max_rows - shown)
+        page = list(islice(iterator, limit))
+        if not page:
+            break
+        page_title = title if shown == 0 else f"{title} (rows {shown + 1}-{shown + len(page)})"
+        display_table(page, page_title)
+        shown += len(page)
+
+    if shown == 0:
+        console.print(f"[yellow]No {title.lower()} found[/yellow]")
+    elif max_rows is not None and shown >= max_rows and next(iterator, None) is not None:
+        console.print(f"[yellow]Showing the first {shown} rows (row limit reached)[/yellow]")
+    else:
+        console.print(f"[dim]{shown} row(s)[/dim]")
+
+    return shown
+
+
 def display_constraints(
     constraints_data: List[Dict[str, Any]],
     fk_details: List[Dict[str, Any]],
@@ -305,6 +357,48 @@ def display_database_info(db_info: Dict[str, Any]) -> None:
     console.print(panel)
 
 
+def display_query_stats(summary: List[Dict[str, Any]], title: str = "Query statistics") -> None:
+    """
+    Display the per-query statistics of instrumentation.QueryStats on stderr.
+
+    Args:
+        summary: Rows of QueryStats.summary()
+        title: Title for the table
+    """
+    if not summary:
+        stderr_console.print("[yellow]No queries were run[/yellow]")
+        return
+
+    _print_stderr_table(summary, title, left=('query', 'histogram'))
+
+
+def display_profile(hotspots: List[Dict[str, Any]], title: str, caption: Optional[str] = None) -> None:
+    """
+    Display the hotspots of a profiling.py profiler on stderr.
+
+    Args:
+        hotspots: Rows of the profiler's hotspots()
+        title: Title for the table
+        caption: Optional line printed under the table
+    """
+    if not hotspots:
+        stderr_console.print("[yellow]Nothing was recorded by the profiler[/yellow]")
+    else:
+        _print_stderr_table(hotspots, title, left=('function', 'allocation_site'))
+    if caption:
+        stderr_console.print(f"[blue]{caption}[/blue]")
+
+
+def _print_stderr_table(rows: List[Dict[str, Any]], title: str, left: tuple) -> None:
+    """Print dictionaries as a table on stderr, right-aligning the columns not in left."""
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    for column in rows[0].keys():
+        table.add_column(column.replace('_', ' ').title(), justify="left" if column in left else "right")
+    for row in rows:
+        table.add_row(*[str(value) for value in row.values()])
+    stderr_console.print(table)
+
+
 def print_success(message: str) -> None:
     """Print a success message in green."""
     console.print(f"[green]{message}[/green]")
@@ -333,14 +427,18 @@ Available commands:
 - tables [schema]: List tables in schema (default: public)
 - describe <table> [schema] [--constraints]: Describe table structure
 - describe-all [schema] [--constraints]: Describe all tables in schema
-- query <sql>: Execute custom SQL query
+- query <sql>: Execute custom SQL query (rows are streamed page by page, up to --max-rows)
 - info: Show database connection information
+- pool: Show connection pool counters (checkouts, waits, reconnects)
+- cache: Show the hits and misses of the remembered catalog lookups
+- refresh [schema]: Forget the remembered lookups (of one schema, or all)
 - json: Toggle JSON output mode on/off
 - help: Show this help
 - quit: Exit interactive mode
 
 Options for describe and describe-all:
 - --constraints or -c: Show integrity constraints (PK, FK, UNIQUE, CHECK)
+- --per-table: (describe-all only) Query each table separately instead of the whole schema at once
 
 JSON mode:
 - Type 'json' to toggle JSON output format
@@ -353,5 +451,6 @@ Examples:
 - describe-all public --constraints
 - query SELECT * FROM pg_tables LIMIT 5;
 - json (to toggle JSON mode)
+- refresh public (after changing tables in public)
     """
     console.print(help_text)
@@ -31,3 +31,13 @@ class SchemaNotFoundError(PSQLCatalogError):
 class InvalidConnectionStringError(PSQLCatalogError):
     """Raised when connection string format is invalid."""
     pass
+
+
+class ExportError(PSQLCatalogError):
+    """Raised when results cannot be exported to Arrow or Parquet."""
+    pass
+
+
+class SnapshotError(PSQLCatalogError):
+    """Raised when a binary catalog snapshot cannot be written or read."""
+    pass
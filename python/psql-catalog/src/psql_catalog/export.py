@@ -0,0 +1,301 @@
+"""
+Arrow and Parquet export for psql-catalog.
+
+Query results are written as typed Arrow record batches while they are streamed
+from the server, using the PostgreSQL type of each column (from the cursor
+description) to pick the Arrow type, so large extracts never have to be held in
+memory and can be loaded zero-copy by Polars, pandas or DuckDB. Catalog snapshots
+(describe-all) are written as one row per table with the columns, indexes and
+constraints as nested lists.
+
+Requires pyarrow (pip install 'psql-catalog[arrow]').
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .exceptions import ExportError
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('parquet', 'arrow')
+
+# Rows per Parquet row group / Arrow IPC record batch for catalog snapshots
+SNAPSHOT_BATCH_SIZE = 1024
+
+# PostgreSQL type OIDs of the scalar types with a native Arrow equivalent
+_BOOL, _BYTEA, _INT8, _INT2, _INT4, _OID = 16, 17, 20, 21, 23, 26
+_FLOAT4, _FLOAT8, _NUMERIC = 700, 701, 1700
+_DATE, _TIME, _TIMESTAMP, _TIMESTAMPTZ, _INTERVAL = 1082, 1083, 1114, 1184, 1186
+
+# Array type OID -> element type OID
+_ARRAY_ELEMENTS = {
+    1000: _BOOL, 1005: _INT2, 1007: _INT4, 1016: _INT8, 1021: _FLOAT4, 1022: _FLOAT8,
+    1231: _NUMERIC, 1182: _DATE, 1115: _TIMESTAMP, 1185: _TIMESTAMPTZ,
+    1009: 25, 1015: 1043, 1014: 1042, 1003: 19,
+}
+
+
+def _require_pyarrow() -> None:
+    """Raise ExportError when pyarrow is not installed."""
+    if pa is None:
+        raise ExportError(
+            "Arrow and Parquet export require pyarrow: pip install 'psql-catalog[arrow]'"
+        )
+
+
+def _scalar_type(type_code: int, precision: Optional[int] = None, scale: Optional[int] = None) -> 'pa.DataType':
+    """
+    Get the Arrow type for a PostgreSQL scalar type.
+
+    Types without an Arrow equivalent (text, uuid, json, enums, ...) are exported
+    as strings. Numeric columns without a declared precision (reported as 65535) are
+    exported as strings too, since their scale can change from row to row and any
+    decimal or float type would round some values.
+    """
+    if type_code == _BOOL:
+        return pa.bool_()
+    if type_code == _INT2:
+        return pa.int16()
+    if type_code == _INT4:
+        return pa.int32()
+    if type_code == _INT8:
+        return pa.int64()
+    if type_code == _OID:
+        return pa.uint32()
+    if type_code == _FLOAT4:
+        return pa.float32()
+    if type_code == _FLOAT8:
+        return pa.float64()
+    if type_code == _NUMERIC and precision and precision <= 76:
+        return pa.decimal128(precision, scale or 0) if precision <= 38 else pa.decimal256(precision, scale or 0)
+    if type_code == _BYTEA:
+        return pa.binary()
+    if type_code == _DATE:
+        return pa.date32()
+    if type_code == _TIME:
+        return pa.time64('us')
+    if type_code == _TIMESTAMP:
+        return pa.timestamp('us')
+    if type_code == _TIMESTAMPTZ:
+        return pa.timestamp('us', tz='UTC')
+    if type_code == _INTERVAL:
+        return pa.duration('us')
+    return pa.string()
+
+
+def arrow_schema(description: Sequence[Any]) -> 'pa.Schema':
+    """
+    Build the Arrow schema of a query result from its cursor description.
+
+    Args:
+        description: DB-API cursor description (name, type_code, ..., precision, scale)
+
+    Returns:
+        Arrow schema with one nullable field per result column
+    """
+    _require_pyarrow()
+    fields = []
+    for column in description:
+        name, type_code = column[0], column[1]
+        precision = column[4] if len(column) > 4 else None
+        scale = column[5] if len(column) > 5 else None
+        if type_code in _ARRAY_ELEMENTS:
+            arrow_type = pa.list_(_scalar_type(_ARRAY_ELEMENTS[type_code]))
+        else:
+            arrow_type = _scalar_type(type_code, precision, scale)
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _string_value(value: Any) -> Any:
+    """Convert a value exported as an Arrow string (json documents are re-encoded)."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, memoryview):
+        return value.tobytes().hex()
+    return str(value)
+
+
+def _converter(arrow_type: 'pa.DataType') -> Optional[Callable[[Any], Any]]:
+    """Get the per-value conversion needed before building an Arrow array, if any."""
+    if pa.types.is_string(arrow_type):
+        return _string_value
+    if pa.types.is_binary(arrow_type):
+        return lambda value: value.tobytes() if isinstance(value, memoryview) else value
+    if pa.types.is_list(arrow_type) and pa.types.is_string(arrow_type.value_type):
+        return lambda value: None if value is None else [_string_value(item) for item in value]
+    return None
+
+
+class ArrowResultWriter:
+    """
+    Write row tuples to a Parquet or Arrow IPC file as typed record batches.
+
+    Each call to write_rows converts one batch of rows into an Arrow record batch
+    and appends it to the file, so memory use depends on the batch size only.
+    """
+
+    def __init__(self, path: str, schema: 'pa.Schema', file_format: str = 'parquet', compression: str = 'zstd'):
+        """
+        Open the output file.
+
+        Args:
+            path: Output file path
+            schema: Arrow schema of the rows (see arrow_schema)
+            file_format: 'parquet' or 'arrow' (Arrow IPC file, memory-mappable)
+            compression: Parquet compression codec
+
+        Raises:
+            ExportError: If pyarrow is missing or the format is unknown
+        """
+        _require_pyarrow()
+        if file_format not in EXPORT_FORMATS:
+            raise ExportError(f"Unknown export format '{file_format}'. Available: {', '.join(EXPORT_FORMATS)}")
+
+        self.schema = schema
+        self.file_format = file_format
+        self.row_count = 0
+        self._converters = [_converter(field.type) for field in schema]
+        if file_format == 'parquet':
+            self._writer = pq.ParquetWriter(path, schema, compression=compression)
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write_rows(self, rows: Sequence[Tuple[Any, ...]]) -> None:
+        """
+        Append a batch of row tuples.
+
+        Args:
+            rows: Row tuples in schema column order
+
+        Raises:
+            ExportError: If a value does not fit its column type
+        """
+        if not rows:
+            return
+        arrays = []
+        for field, convert, values in zip(self.schema, self._converters, zip(*rows)):
+            if convert is not None:
+                values = [convert(value) for value in values]
+            try:
+                arrays.append(pa.array(values, type=field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError) as e:
+                raise ExportError(f"Column '{field.name}' cannot be exported as {field.type}: {e}")
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.row_count += len(rows)
+
+    def write_table(self, table: 'pa.Table', batch_size: int = SNAPSHOT_BATCH_SIZE) -> None:
+        """Append an Arrow table, split into batches of at most batch_size rows."""
+        if self.file_format == 'parquet':
+            self._writer.write_table(table, row_group_size=batch_size)
+        else:
+            self._writer.write_table(table, max_chunksize=batch_size)
+        self.row_count += table.num_rows
+
+    def close(self) -> None:
+        """Finish the file (writes the Parquet footer / Arrow IPC footer)."""
+        self._writer.close()
+        if self.file_format == 'arrow':
+            self._sink.close()
+
+    def __enter__(self) -> 'ArrowResultWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def write_query_result_arrow(
+    batches: Iterable[Tuple[Sequence[Any], List[Tuple[Any, ...]]]],
+    path: str,
+    file_format: str = 'parquet',
+    max_rows: Optional[int] = None
+) -> int:
+    """
+    Write a streamed query result to a Parquet or Arrow IPC file.
+
+    Args:
+        batches: (cursor description, row tuples) pairs, as yielded by
+            PostgreSQLCatalog.stream_batches
+        path: Output file path
+        file_format: 'parquet' or 'arrow'
+        max_rows: Stop after this many rows (None for no limit)
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ExportError: If pyarrow is missing or a value does not fit its column type
+    """
+    _require_pyarrow()
+    writer: Optional[ArrowResultWriter] = None
+    try:
+        for description, rows in batches:
+            if writer is None:
+                writer = ArrowResultWriter(path, arrow_schema(description), file_format)
+            if max_rows is not None:
+                rows = rows[:max_rows - writer.row_count]
+            writer.write_rows(rows)
+            if max_rows is not None and writer.row_count >= max_rows:
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+
+    row_count = writer.row_count if writer is not None else 0
+    logger.debug(f"Exported {row_count} rows to {path} ({file_format})")
+    return row_count
+
+
+def write_catalog_arrow(
+    tables: Dict[str, Any],
+    schema_name: str,
+    path: str,
+    file_format: str = 'parquet'
+) -> int:
+    """
+    Write a describe-all snapshot to a Parquet or Arrow IPC file.
+
+    The file has one row per table: schema_name, table_name and the columns,
+    indexes, constraints and foreign_key_details sections as lists of structs
+    (null when a section was not loaded).
+
+    Args:
+        tables: Mapping of table name to TableStructure (or a dictionary of sections)
+        schema_name: Schema the tables belong to
+        path: Output file path
+        file_format: 'parquet' or 'arrow'
+
+    Returns:
+        Number of tables written
+
+    Raises:
+        ExportError: If pyarrow is missing or the format is unknown
+    """
+    _require_pyarrow()
+    sections = ('columns', 'indexes', 'constraints', 'foreign_key_details')
+
+    records = []
+    for table_name, structure in tables.items():
+        record = {'schema_name': schema_name, 'table_name': table_name}
+        for section in sections:
+            rows = structure.get(section) if isinstance(structure, dict) else getattr(structure, section)
+            record[section] = None if rows is None else [dict(row) for row in rows]
+        records.append(record)
+
+    table = pa.Table.from_pylist(records)
+    with ArrowResultWriter(path, table.schema, file_format) as writer:
+        writer.write_table(table)
+    return table.num_rows
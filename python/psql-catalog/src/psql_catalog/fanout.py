@@ -0,0 +1,197 @@
+"""
+Parallel describe-all over many databases and schemas for psql-catalog.
+
+Each (connection string, schema) target is described on a worker thread of a
+bounded ThreadPoolExecutor. Describing a schema is dominated by round trips to
+the server, during which psycopg2 releases the GIL, so threads overlap the
+network latency of many databases without any change to PostgreSQLCatalog.
+
+Targets that share a connection string (several schemas of one database) share a
+ConnectionPool, closed as soon as the last of them finishes, so a run over
+hundreds of databases never keeps more than max_workers connections open. With
+consistent=True that pool is a SnapshotConnectionPool, so all the schemas of a
+database are described from one exported snapshot.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+from .backends import DEFAULT_BACKEND
+from .cache import database_label
+from .catalog import PostgreSQLCatalog
+from .consistent import SnapshotConnectionPool
+from .exceptions import PSQLCatalogError, SchemaNotFoundError
+from .pool import ConnectionPool
+from .serialization import DescribeAllResult, TableStructure, create_describe_all_result
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class DescribeTarget:
+    """A schema of a database to describe."""
+
+    connection_string: str
+    schema: str = 'public'
+
+    @property
+    def label(self) -> str:
+        """Display name of the target: host:port/dbname/schema (without credentials)."""
+        return f"{database_label(self.connection_string)}/{self.schema}"
+
+
+@dataclass
+class DescribeOutcome:
+    """Result of describing one target: the describe-all result or the error."""
+
+    target: DescribeTarget
+    result: Optional[DescribeAllResult] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def describe_target(
+    target: DescribeTarget,
+    show_constraints: bool = False,
+    batched: bool = True,
+    backend: str = DEFAULT_BACKEND,
+    pool: Optional[ConnectionPool] = None
+) -> DescribeAllResult:
+    """
+    Describe all tables of one target.
+
+    Args:
+        target: Database and schema to describe
+        show_constraints: Whether to include constraint information
+        batched: Whether to use the schema-wide queries instead of per-table ones
+        backend: Catalog query backend
+        pool: Optional connection pool for the target's database
+
+    Returns:
+        The describe-all result of the schema
+
+    Raises:
+        SchemaNotFoundError: If the schema does not exist
+        DatabaseConnectionError: If the database cannot be reached
+        QueryExecutionError: If a catalog query fails
+    """
+    with PostgreSQLCatalog(target.connection_string, backend, pool=pool) as catalog:
+        if not catalog.schema_exists(target.schema):
+            raise SchemaNotFoundError(f"Schema '{target.schema}' does not exist")
+
+        table_names = [table_info['table_name'] for table_info in catalog.list_tables(target.schema)]
+        described, failed_tables = catalog.describe_tables(table_names, target.schema, show_constraints, batched)
+        return create_describe_all_result(
+            tables_data={name: TableStructure(**data) for name, data in described.items()},
+            database=catalog.database_name,
+            schema=target.schema,
+            show_constraints=show_constraints,
+            failed_tables=failed_tables
+        )
+
+
+def fan_out_describe(
+    targets: Iterable[DescribeTarget],
+    max_workers: int = DEFAULT_WORKERS,
+    show_constraints: bool = False,
+    batched: bool = True,
+    backend: str = DEFAULT_BACKEND,
+    consistent: bool = False
+) -> Iterator[DescribeOutcome]:
+    """
+    Describe many targets concurrently, yielding each outcome as soon as it is ready.
+
+    A failing target (unreachable database, missing schema, failing query) yields an
+    outcome with its error and does not stop the others.
+
+    Args:
+        targets: Databases and schemas to describe
+        max_workers: Maximum number of targets described at the same time
+        show_constraints: Whether to include constraint information
+        batched: Whether to use the schema-wide queries instead of per-table ones
+        backend: Catalog query backend
+        consistent: Describe the schemas of each database from one exported snapshot
+
+    Yields:
+        DescribeOutcome of each target, in completion order
+
+    Raises:
+        ValueError: If max_workers is lower than 1
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+    targets = list(targets)
+    remaining = Counter(target.connection_string for target in targets)
+    pool_sizes = {
+        dsn: min(count, max_workers) for dsn, count in remaining.items() if count > 1 or consistent
+    }
+    pools: Dict[str, ConnectionPool] = {}
+    lock = threading.Lock()
+    # Opening a pool connects to its database (and, with consistent=True, exports the
+    # snapshot), so it is guarded per database: a slow or unreachable one must not
+    # hold up the pools of the others
+    pool_locks = {dsn: threading.Lock() for dsn in pool_sizes}
+
+    def acquire_pool(dsn: str) -> Optional[ConnectionPool]:
+        if dsn not in pool_sizes:
+            return None
+        with pool_locks[dsn]:
+            pool = pools.get(dsn)
+            if pool is None:
+                pool_class = SnapshotConnectionPool if consistent else ConnectionPool
+                pool = pool_class(dsn, maxconn=pool_sizes[dsn])
+                with lock:
+                    pools[dsn] = pool
+            return pool
+
+    def release_pool(dsn: str) -> None:
+        with lock:
+            remaining[dsn] -= 1
+            pool = pools.pop(dsn, None) if remaining[dsn] == 0 else None
+        if pool is not None:
+            pool.closeall()
+
+    def run(target: DescribeTarget) -> DescribeOutcome:
+        start = time.perf_counter()
+        try:
+            result = describe_target(
+                target, show_constraints, batched, backend, pool=acquire_pool(target.connection_string)
+            )
+            return DescribeOutcome(target, result=result, seconds=time.perf_counter() - start)
+        except PSQLCatalogError as e:
+            logger.debug(f"Failed to describe {target.label}: {e}")
+            return DescribeOutcome(target, error=str(e), seconds=time.perf_counter() - start)
+        except Exception as e:
+            # Raw driver, OS or pool errors are reported on their target too, so that
+            # one failing target never stops the others
+            logger.debug(f"Failed to describe {target.label}", exc_info=True)
+            return DescribeOutcome(target, error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - start)
+        finally:
+            release_pool(target.connection_string)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='psql-catalog-describe')
+    futures = []
+    try:
+        futures = [executor.submit(run, target) for target in targets]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # When the consumer gives up early, queued targets are dropped and the pools
+        # they would have released are closed here
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+        for pool in pools.values():
+            pool.closeall()
@@ -0,0 +1,149 @@
+"""
+Table filters for psql-catalog.
+
+describe-all used to list every table of a schema and then describe them all,
+so describing the 40 billing_* tables of a 6,000 table schema introspected the
+other 5,960 as well. A TableFilter selects tables by name (include/exclude glob
+or regex patterns), by kind (regular, partitioned and partition tables, views,
+foreign tables) and by page (limit/offset). It is evaluated by the catalog SQL
+itself (the FILTER_TABLES backend query), and the describers then only query
+the selected tables.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Table kinds understood by FILTER_TABLES:
+# - table: regular table that is not a partition
+# - partitioned: partitioned table (the parent of partitions) that is not itself a partition
+# - partition: partition of a partitioned table
+# - view: view
+# - foreign: foreign table
+TABLE_KINDS = ('table', 'partitioned', 'partition', 'view', 'foreign')
+
+# Characters with a meaning in PostgreSQL regular expressions
+_REGEX_SPECIAL = set('\\.^$|()[]{}+*?')
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Translate a shell-style glob into an anchored PostgreSQL regular expression.
+
+    '*' matches any run of characters, '?' any single character and '[...]' (or
+    '[!...]') a character class; everything else is matched literally.
+
+    Args:
+        pattern: Glob pattern, e.g. 'billing_*'
+
+    Returns:
+        Regular expression matching the whole table name, e.g. '^billing_.*$'
+    """
+    parts = ['^']
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        i += 1
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        elif char == '[':
+            end = i
+            if end < n and pattern[end] == '!':
+                end += 1
+            if end < n and pattern[end] == ']':
+                end += 1
+            end = pattern.find(']', end)
+            if end < 0:
+                parts.append('\\[')
+                continue
+            body = pattern[i:end].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            elif body.startswith('^'):
+                body = '\\' + body
+            parts.append(f'[{body}]')
+            i = end + 1
+        elif char in _REGEX_SPECIAL:
+            parts.append('\\' + char)
+        else:
+            parts.append(char)
+    parts.append('$')
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class TableFilter:
+    """
+    Selection of the tables of a schema, evaluated by the catalog query.
+
+    Attributes:
+        include: Patterns a table name must match (any of them); empty selects every name
+        exclude: Patterns a table name must not match (none of them)
+        kinds: Table kinds to keep (see TABLE_KINDS); empty keeps every kind
+        limit: Maximum number of tables, in table name order
+        offset: Number of tables skipped before the first one returned
+        regex: Whether the patterns are PostgreSQL regular expressions (matched anywhere
+            in the name, like the ~ operator) instead of globs (matching the whole name)
+    """
+
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    kinds: Tuple[str, ...] = ()
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    regex: bool = False
+
+    def __post_init__(self) -> None:
+        # Accept any sequence but store tuples, so filters stay hashable (memo keys)
+        for name in ('include', 'exclude', 'kinds'):
+            value: Optional[Sequence[str]] = getattr(self, name)
+            object.__setattr__(self, name, tuple(value or ()))
+
+        unknown = [kind for kind in self.kinds if kind not in TABLE_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown table kind '{unknown[0]}'. Available: {', '.join(TABLE_KINDS)}")
+        for name in ('limit', 'offset'):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"Table {name} must not be negative, got {value}")
+
+    def __bool__(self) -> bool:
+        """Whether the filter can leave out any table."""
+        return bool(self.include or self.exclude or self.kinds or self.limit is not None or self.offset)
+
+    def _regexes(self, patterns: Tuple[str, ...]) -> Optional[List[str]]:
+        """Get patterns as the regular expressions sent to the server (None when there are none)."""
+        if not patterns:
+            return None
+        return list(patterns) if self.regex else [glob_to_regex(pattern) for pattern in patterns]
+
+    def query_params(self, schema_name: str) -> Dict[str, Any]:
+        """
+        Get the parameters of the FILTER_TABLES query.
+
+        Args:
+            schema_name: Schema whose tables are filtered
+
+        Returns:
+            Dictionary of named query parameters
+        """
+        return {
+            'schema_name': schema_name,
+            'include': self._regexes(self.include),
+            'exclude': self._regexes(self.exclude),
+            'kinds': list(self.kinds) or None,
+            'limit': self.limit,
+            'offset': self.offset,
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the filter as a JSON-compatible dictionary (used in snapshot cache keys)."""
+        return {
+            'include': list(self.include),
+            'exclude': list(self.exclude),
+            'kinds': list(self.kinds),
+            'limit': self.limit,
+            'offset': self.offset,
+            'regex': self.regex,
+        }
@@ -1,10 +1,17 @@
+import gzip
 import os
 import yaml # Importe a biblioteca PyYAML
-from typing import Optional, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
+from typing import Optional, Any, Callable, Iterable, Iterator, TextIO, Union
 from sqlalchemy import create_engine, inspect
-from sqlalchemy.engine import reflection
+from sqlalchemy.engine import Engine, make_url
 from pydantic import BaseModel, Field
 
+from psql_catalog.model import table_from_reflection
+from psql_catalog.serialization import TableStructure
+
 """
 No caso de usar psql -h localhost -p 54320 -U dcnr dcnrh # com senha cepel e schema dcnrapp
 preencha assim o script para setar as variáveis de ambiente:
@@ -16,6 +23,16 @@ export POSTGRES_PORT=54320
 export POSTGRES_DB=dcnrh
 export POSTGRES_TARGET_SCHEMA=dcnrapp
 
+Opcionalmente, para vários schemas (separados por vírgula) e reflexão em paralelo:
+
+export POSTGRES_TARGET_SCHEMA=dcnrapp,dcnrhist
+export POSTGRES_REFLECTION_WORKERS=4
+
+E para gravar um documento YAML por tabela e/ou o arquivo comprimido (.yaml.gz):
+
+export POSTGRES_YAML_DOCUMENTS=1
+export POSTGRES_YAML_GZIP=1
+
 E teste assim:
 echo POSTGRES_USER = $POSTGRES_USER
 echo POSTGRES_PASSWORD = $POSTGRES_PASSWORD
@@ -82,122 +99,260 @@ class TableSchema(BaseModel):
 
 # --- 3. Lógica de Introspecção e Mapeamento ---
 
-def inspect_database_schema(db_url: str, schema_name: str) -> list[TableSchema]:
+# Tabelas refletidas por lote: cada lote custa quatro consultas (colunas, chaves primárias,
+# índices e chaves estrangeiras) para todas as suas tabelas, em vez de quatro por tabela
+REFLECTION_BATCH_SIZE = 1000
+# Lotes refletidos em paralelo, cada um na sua conexão (1: sem threads)
+REFLECTION_WORKERS = int(os.getenv("POSTGRES_REFLECTION_WORKERS", "1"))
+# Arquivo YAML com um documento por tabela (em vez de uma lista) e/ou comprimido com gzip
+YAML_DOCUMENTS = os.getenv("POSTGRES_YAML_DOCUMENTS", "0") == "1"
+YAML_GZIP = os.getenv("POSTGRES_YAML_GZIP", "0") == "1"
+# Nível 6: quase a compressão do nível 9 do gzip, em bem menos tempo
+YAML_GZIP_LEVEL = 6
+
+def _table_schema(
+    schema_name: str,
+    table_name: str,
+    columns_info: list[dict[str, Any]],
+    pk_info: Optional[dict[str, Any]],
+    indexes_info: list[dict[str, Any]],
+    fks_info: list[dict[str, Any]]
+) -> TableSchema:
+    """
+    Converte o resultado da reflexão de uma tabela em um TableSchema.
+    """
+    columns_info = sorted(columns_info, key=lambda column: column['name'])
+    columns = [
+        ColumnSchema(
+            column_name=col['name'],
+            type=str(col['type']), # Converte o tipo do SQLAlchemy para string
+            nullable=col['nullable'],
+            default=col['default'],
+            autoincrement=col.get('autoincrement')
+        )
+        for col in columns_info
+    ]
+
+    primary_key = None
+    if pk_info and pk_info.get('constrained_columns'):
+        primary_key = PrimaryKeySchema(constrained_columns=pk_info['constrained_columns'])
+
+    indexes = [
+        IndexSchema(
+            index_name=idx['name'],
+            column_names=idx['column_names'],
+            unique=idx['unique']
+        )
+        for idx in indexes_info
+    ]
+
+    foreign_keys = [
+        ForeignKeySchema(
+            constrained_columns=fk['constrained_columns'],
+            referred_table=fk['referred_table'],
+            referred_columns=fk['referred_columns'],
+            name=fk.get('name'),
+            ondelete=fk.get('ondelete'),
+            onupdate=fk.get('onupdate')
+        )
+        for fk in fks_info
+    ]
+
+    return TableSchema(
+        table_name=table_name,
+        schema_name=schema_name,
+        columns=columns,
+        primary_key=primary_key,
+        indexes=indexes,
+        foreign_keys=foreign_keys
+    )
+
+def _reflect_batch(engine: Engine, schema_name: str, table_names: list[str], build: Callable[..., Any]) -> list[Any]:
+    """
+    Reflete um lote de tabelas de um schema com as APIs get_multi_* do SQLAlchemy 2.x
+    (uma consulta por tipo de informação para o lote inteiro) e aplica build a cada tabela,
+    na ordem de table_names.
+    """
+    with engine.connect() as connection:
+        # Um Inspector por lote: o cache de reflexão dele não acumula o schema inteiro
+        inspector = inspect(connection)
+        columns = inspector.get_multi_columns(schema=schema_name, filter_names=table_names)
+        primary_keys = inspector.get_multi_pk_constraint(schema=schema_name, filter_names=table_names)
+        indexes = inspector.get_multi_indexes(schema=schema_name, filter_names=table_names)
+        foreign_keys = inspector.get_multi_foreign_keys(schema=schema_name, filter_names=table_names)
+
+    tables = []
+    for table_name in table_names:
+        key = (schema_name, table_name)
+        tables.append(build(
+            schema_name,
+            table_name,
+            columns.pop(key, []),
+            primary_keys.pop(key, None),
+            indexes.pop(key, []),
+            foreign_keys.pop(key, [])
+        ))
+    return tables
+
+def _reflect_schemas(
+    db_url: str,
+    schema_names: Iterable[str],
+    build: Callable[..., Any],
+    workers: int = 1,
+    batch_size: int = REFLECTION_BATCH_SIZE
+) -> Iterator[Any]:
+    """
+    Reflete as tabelas dos schemas em lotes de batch_size tabelas e produz build(...) de
+    cada tabela, em ordem de schema e de nome. Com workers > 1 os lotes (de um ou de vários
+    schemas) são refletidos em paralelo, no máximo workers lotes à frente do consumidor,
+    então a memória usada não depende do tamanho dos schemas.
+    """
+    engine = create_engine(db_url, pool_size=max(workers, 1))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reflection') if workers > 1 else None
+    try:
+        with engine.connect() as connection:
+            inspector = inspect(connection)
+            existing_schemas = set(inspector.get_schema_names())
+            batches = []
+            for schema_name in schema_names:
+                # Valida se o schema existe
+                if schema_name not in existing_schemas:
+                    print(f"Erro: O schema '{schema_name}' não foi encontrado no banco de dados.")
+                    continue
+                table_names = sorted(inspector.get_table_names(schema=schema_name))
+                print(f"Inspecionando {len(table_names)} tabelas no schema: '{schema_name}'...")
+                for start in range(0, len(table_names), batch_size):
+                    batches.append((schema_name, table_names[start:start + batch_size]))
+
+        if executor is None:
+            for schema_name, table_names in batches:
+                yield from _reflect_batch(engine, schema_name, table_names, build)
+            return
+
+        pending: deque[Future] = deque()
+        for schema_name, table_names in batches:
+            pending.append(executor.submit(_reflect_batch, engine, schema_name, table_names, build))
+            if len(pending) >= workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        engine.dispose() # Garante que as conexões sejam fechadas
+
+def iter_database_schema(
+    db_url: str,
+    schema_names: Union[str, Iterable[str]],
+    workers: int = 1,
+    batch_size: int = REFLECTION_BATCH_SIZE
+) -> Iterator[TableSchema]:
+    """
+    Conecta-se ao banco de dados e produz um TableSchema por tabela dos schemas
+    especificados, à medida que cada lote de tabelas é refletido.
+    """
+    if isinstance(schema_names, str):
+        schema_names = [schema_names]
+    return _reflect_schemas(db_url, schema_names, _table_schema, workers, batch_size)
+
+def inspect_database_schema(db_url: str, schema_name: str, workers: int = 1) -> list[TableSchema]:
     """
     Conecta-se ao banco de dados, inspeciona o schema especificado
     e retorna uma lista de objetos TableSchema.
     """
     try:
-        engine = create_engine(db_url)
-        inspector = inspect(engine)
-
-        # Valida se o schema existe
-        if schema_name not in inspector.get_schema_names():
-            print(f"Erro: O schema '{schema_name}' não foi encontrado no banco de dados.")
-            return []
-
-        all_tables_schema: list[TableSchema] = []
-
-        print(f"Inspecionando tabelas no schema: '{schema_name}'...")
-        table_count = 0
-    
-        # Obter nomes das tabelas no schema
-        table_names = inspector.get_table_names(schema=schema_name)
-
-        for table_name in table_names:
-            table_count = table_count + 1
-            print(f"{table_count}\tProcessando tabela: {table_name}")
-
-            # 1. Obter informações das colunas
-            columns_info = inspector.get_columns(table_name, schema=schema_name)
-            columns_info.sort(key=lambda column: column['name'])
-            columns = [
-                ColumnSchema(
-                    column_name=col['name'],
-                    type=str(col['type']), # Converte o tipo do SQLAlchemy para string
-                    nullable=col['nullable'],
-                    default=col['default'],
-                    autoincrement=col.get('autoincrement')
-                )
-                for col in columns_info
-            ]
-
-            # 2. Obter informações da chave primária
-            pk_info = inspector.get_pk_constraint(table_name, schema=schema_name)
-            primary_key = None
-            if pk_info and pk_info.get('constrained_columns'):
-                primary_key = PrimaryKeySchema(constrained_columns=pk_info['constrained_columns'])
-
-            # 3. Obter informações dos índices
-            indexes_info = inspector.get_indexes(table_name, schema=schema_name)
-            indexes = [
-                IndexSchema(
-                    index_name=idx['name'],
-                    column_names=idx['column_names'],
-                    unique=idx['unique']
-                )
-                for idx in indexes_info
-            ]
-
-            # 4. Obter informações das chaves estrangeiras
-            fks_info = inspector.get_foreign_keys(table_name, schema=schema_name)
-            foreign_keys = [
-                ForeignKeySchema(
-                    constrained_columns=fk['constrained_columns'],
-                    referred_table=fk['referred_table'],
-                    referred_columns=fk['referred_columns'],
-                    name=fk.get('name'),
-                    ondelete=fk.get('ondelete'),
-                    onupdate=fk.get('onupdate')
-                )
-                for fk in fks_info
-            ]
-
-            # Criar o objeto TableSchema para a tabela atual
-            table_schema_obj = TableSchema(
-                table_name=table_name,
-                schema_name=schema_name,
-                columns=columns,
-                primary_key=primary_key,
-                indexes=indexes,
-                foreign_keys=foreign_keys
-            )
-            all_tables_schema.append(table_schema_obj)
-
+        # As tabelas já chegam ordenadas pelo atributo table_name
+        all_tables_schema = list(iter_database_schema(db_url, schema_name, workers))
     except Exception as e:
         print(f"Ocorreu um erro ao inspecionar o banco de dados: {e}")
         return []
-    finally:
-        engine.dispose() # Garante que a conexão seja fechada
 
-    # Ordenando a lista de tabelas pelo atributo table_name
-    all_tables_schema.sort(key=lambda table: table.table_name)
-    print(f"Foram processadas {table_count} tabelas no schema {POSTGRES_TARGET_SCHEMA} do database {DATABASE_URL}")
+    print(f"Foram processadas {len(all_tables_schema)} tabelas no schema {schema_name} do database {make_url(db_url)}")
     return all_tables_schema
 
+def inspect_database_catalog(db_url: str, schema_name: str, workers: int = 1) -> dict[str, TableStructure]:
+    """
+    Inspeciona o schema como inspect_database_schema, mas devolve o modelo compacto
+    do catálogo (psql_catalog.model): um TableStructure por tabela, com registros
+    slotted e strings internadas, no mesmo formato JSON do describe-all.
+    """
+    return {
+        table_name: table
+        for table_name, table in _reflect_schemas(
+            db_url,
+            [schema_name],
+            lambda schema, table_name, *sections: (table_name, table_from_reflection(schema, table_name, *sections)),
+            workers
+        )
+    }
+
 # --- Nova Função para Gerar YAML ---
 
-def generate_yaml_from_tables_schema(tables_schema: list[TableSchema], output_filename: str = "database_schema.yaml"):
+# Dumper em C (libyaml) quando o PyYAML foi compilado com ele: gera o mesmo YAML que o
+# dumper em Python puro, várias vezes mais rápido
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+YAML_OPTIONS = {'allow_unicode': True, 'sort_keys': False, 'indent': 2}
+
+def _open_yaml_output(output_filename: str, compress: Optional[bool]) -> TextIO:
+    """
+    Abre o arquivo de saída YAML, comprimido com gzip se compress for True ou, com
+    compress=None, se o nome terminar em .gz.
     """
-    Recebe uma lista de objetos TableSchema e gera um arquivo YAML.
+    if compress is None:
+        compress = output_filename.endswith('.gz')
+    if compress:
+        return gzip.open(output_filename, 'wt', encoding='utf-8', compresslevel=YAML_GZIP_LEVEL)
+    return open(output_filename, 'w', encoding='utf-8')
+
+def generate_yaml_from_tables_schema(
+    tables_schema: Iterable[TableSchema],
+    output_filename: str = "database_schema.yaml",
+    documents: bool = False,
+    compress: Optional[bool] = None
+) -> int:
     """
-    if not tables_schema:
+    Recebe os objetos TableSchema (uma lista ou o iterador de iter_database_schema) e
+    gera um arquivo YAML, gravando cada tabela assim que ela chega. Retorna o número
+    de tabelas gravadas.
+
+    Por padrão o arquivo é uma lista YAML com um item por tabela; com documents=True
+    cada tabela é um documento YAML (---), que pode ser lido tabela a tabela com
+    yaml.safe_load_all. Com compress (ou um nome terminado em .gz) o arquivo é gravado
+    comprimido com gzip.
+    """
+    tables = iter(tables_schema)
+    first = next(tables, None)
+    if first is None:
         print("Nenhum dado de tabela para gerar o arquivo YAML.")
-        return
-
-    # Converte a lista de modelos Pydantic para uma lista de dicionários Python
-    # O método .model_dump() do Pydantic (ou .dict() em versões mais antigas)
-    # converte o modelo em um dicionário compatível com serialização.
-    data_to_serialize = [table.model_dump(mode='json') for table in tables_schema]
+        return 0
 
+    count = 0
     try:
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            yaml.dump(data_to_serialize, f, allow_unicode=True, sort_keys=False, indent=2)
-        print(f"\nArquivo '{output_filename}' gerado com sucesso!")
+        with _open_yaml_output(output_filename, compress) as f:
+            if documents:
+                dumper = YAML_DUMPER(f, explicit_start=True, **YAML_OPTIONS)
+                try:
+                    dumper.open()
+                    for table in chain([first], tables):
+                        dumper.represent(table.model_dump(mode='json'))
+                        count += 1
+                    dumper.close()
+                finally:
+                    dumper.dispose()
+            else:
+                for table in chain([first], tables):
+                    # Cada tabela vira um item da lista YAML: o arquivo é o mesmo que o de
+                    # yaml.dump da lista inteira, sem manter todas as tabelas em memória.
+                    # O método .model_dump() do Pydantic converte o modelo em um dicionário
+                    # compatível com serialização.
+                    yaml.dump([table.model_dump(mode='json')], f, Dumper=YAML_DUMPER, **YAML_OPTIONS)
+                    count += 1
+        print(f"\nArquivo '{output_filename}' gerado com sucesso! ({count} tabelas)")
     except Exception as e:
         print(f"Erro ao gerar o arquivo YAML: {e}")
+    return count
 
-def print_table_structure():
+def print_table_structure(tables_description: Iterable[TableSchema]):
     for table in tables_description:
         print(f"\n## Tabela: {table.table_name} (Schema: {table.schema_name})")
 
@@ -225,15 +380,20 @@ def print_table_structure():
 if __name__ == "__main__":
     print("\nIniciando a introspecção do banco de dados...")
 
-    tables_description: list[TableSchema] = inspect_database_schema(DATABASE_URL, POSTGRES_TARGET_SCHEMA)
+    # POSTGRES_TARGET_SCHEMA aceita vários schemas separados por vírgula
+    schema_names = [name.strip() for name in TARGET_SCHEMA.split(',') if name.strip()]
+    output_filename = f"{'_'.join(schema_names)}_schema.yaml{'.gz' if YAML_GZIP else ''}"
+
+    tables_description: Iterable[TableSchema] = iter_database_schema(DATABASE_URL, schema_names, REFLECTION_WORKERS)
+    if CAN_PRINT_TABLE_STRUCTURE:
+        tables_description = list(tables_description)
 
-    if tables_description:
-        # Chama a função para gerar o arquivo YAML
-        generate_yaml_from_tables_schema(tables_description, f"{TARGET_SCHEMA}_schema.yaml")
+    # Chama a função para gerar o arquivo YAML à medida que as tabelas são refletidas
+    if generate_yaml_from_tables_schema(tables_description, output_filename, YAML_DOCUMENTS):
         if CAN_PRINT_TABLE_STRUCTURE:
             print(f"\n--- Estrutura das Tabelas no Schema '{POSTGRES_TARGET_SCHEMA}' ---")
-            print_table_structure()
+            print_table_structure(tables_description)
     else:
         print("Nenhuma tabela encontrada ou erro na introspecção.")
 
-    print(f"\nFim do Programa. Veja o arquivo {TARGET_SCHEMA}_schema.yaml")
+    print(f"\nFim do Programa. Veja o arquivo {output_filename}")
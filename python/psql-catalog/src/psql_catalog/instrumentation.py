@@ -0,0 +1,337 @@
+"""
+SQL-level instrumentation for psql-catalog.
+
+Every query run by PostgreSQLCatalog.execute_query (and its async and pipelined
+counterparts) and every statement run by the batch executor is reported, as a
+QueryEvent, to the hooks installed with add_query_hook(). A query is named after
+the backend statement it runs (describe_table, all_columns, ...), 'query' for
+ad-hoc SQL, and after its statement kind (DROP TABLE, ...) in the batch executor.
+
+Two hooks are provided: QueryStats keeps per-query latency histograms, row and
+byte counts (the --stats option of the CLI), and SlowQueryLog logs the queries
+slower than a threshold (--slow-ms). Without any hook installed, reporting costs
+one check per query.
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in milliseconds) of the latency histogram buckets; a last bucket holds the rest
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+_SPARK = ' ▁▂▃▄▅▆▇█'
+
+
+@dataclass(frozen=True)
+class QueryEvent:
+    """One executed query as reported to the hooks."""
+
+    name: str
+    seconds: float
+    rows: int = 0
+    bytes: int = 0
+    failed: bool = False
+
+    @property
+    def ms(self) -> float:
+        return self.seconds * 1000
+
+
+QueryHook = Callable[[QueryEvent], None]
+
+_hooks: Tuple[QueryHook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def add_query_hook(hook: QueryHook) -> None:
+    """
+    Install a hook called with the QueryEvent of every query, on the thread that ran it.
+
+    Args:
+        hook: Callable receiving QueryEvent objects; its exceptions are logged and ignored
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_query_hook(hook: QueryHook) -> None:
+    """
+    Uninstall a hook installed with add_query_hook(); unknown hooks are ignored.
+
+    Args:
+        hook: Previously installed hook
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(installed for installed in _hooks if installed is not hook)
+
+
+@contextmanager
+def query_hook(hook: QueryHook) -> Iterator[QueryHook]:
+    """
+    Install a hook for the duration of a with block.
+
+    Yields:
+        The installed hook
+    """
+    add_query_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_query_hook(hook)
+
+
+def instrumentation_enabled() -> bool:
+    """Whether any hook is installed."""
+    return bool(_hooks)
+
+
+def estimate_bytes(rows: Iterable[Any]) -> int:
+    """
+    Estimate the size of result rows: the length of text and binary values, 8 bytes for other values.
+
+    Args:
+        rows: Rows as tuples or mappings
+
+    Returns:
+        Approximate number of bytes of the values
+    """
+    total = 0
+    for row in rows:
+        for value in (row.values() if isinstance(row, Mapping) else row):
+            if value is None:
+                continue
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                total += len(value)
+            else:
+                total += 8
+    return total
+
+
+def record_query(
+    name: str,
+    started: float,
+    rows: Optional[Any] = None,
+    row_count: Optional[int] = None,
+    byte_count: int = 0,
+    failed: bool = False
+) -> None:
+    """
+    Report a finished query to the installed hooks.
+
+    Args:
+        name: Query name
+        started: time.perf_counter() value taken when the query started
+        rows: Result rows, counted and measured with estimate_bytes()
+        row_count: Number of rows when the rows themselves are not available
+        byte_count: Number of bytes when the rows themselves are not available
+        failed: Whether the query failed
+    """
+    hooks = _hooks
+    if not hooks:
+        return
+
+    seconds = time.perf_counter() - started
+    nbytes = byte_count
+    if rows is not None:
+        row_count = len(rows)
+        tuples = rows.iter_tuples() if hasattr(rows, 'iter_tuples') else rows
+        nbytes = estimate_bytes(tuples)
+    event = QueryEvent(name, seconds, row_count or 0, nbytes, failed)
+
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception as e:
+            logger.debug(f"Query hook {hook!r} failed: {e}")
+
+
+_STATEMENT_KIND = re.compile(
+    r'^\s*((?:create|alter|drop)\s+(?:unique\s+)?\w+|insert\s+into|delete\s+from|\w+)', re.IGNORECASE
+)
+
+
+def statement_kind(statement: str) -> str:
+    """
+    Name a SQL statement after its kind, e.g. 'DROP TABLE' or 'TRUNCATE'.
+
+    Args:
+        statement: SQL statement
+
+    Returns:
+        Upper-cased statement kind, or 'SQL' if it cannot be recognized
+    """
+    match = _STATEMENT_KIND.match(statement)
+    return ' '.join(match.group(1).upper().split()) if match else 'SQL'
+
+
+class LatencyHistogram:
+    """Latency distribution over the fixed LATENCY_BUCKETS_MS buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        """Record one latency, in milliseconds."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.min_ms = ms if self.count == 0 else min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.count += 1
+        self.total_ms += ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile by interpolating inside the bucket it falls in.
+
+        Args:
+            fraction: Percentile between 0 and 1 (e.g. 0.95)
+
+        Returns:
+            Estimated latency in milliseconds, between the minimum and maximum seen
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS_MS[bucket - 1] if bucket else 0.0
+                upper = LATENCY_BUCKETS_MS[bucket] if bucket < len(LATENCY_BUCKETS_MS) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += count
+        return self.max_ms
+
+    def sparkline(self) -> str:
+        """Draw the occupied range of buckets as one character per bucket."""
+        occupied = [bucket for bucket, count in enumerate(self.counts) if count]
+        if not occupied:
+            return ''
+        peak = max(self.counts)
+        return ''.join(
+            _SPARK[-(-count * (len(_SPARK) - 1) // peak)]
+            for count in self.counts[occupied[0]:occupied[-1] + 1]
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the histogram to a dictionary, keyed by bucket upper bound."""
+        bounds = [str(bound) for bound in LATENCY_BUCKETS_MS] + ['inf']
+        return {
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'min_ms': self.min_ms,
+            'max_ms': self.max_ms,
+            'buckets_ms': {bound: count for bound, count in zip(bounds, self.counts) if count},
+        }
+
+
+class QueryStats:
+    """Query hook keeping latency histograms, row and byte counts per query name."""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._rows: Dict[str, int] = {}
+        self._bytes: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: QueryEvent) -> None:
+        with self._lock:
+            histogram = self._histograms.get(event.name)
+            if histogram is None:
+                histogram = self._histograms[event.name] = LatencyHistogram()
+                self._rows[event.name] = self._bytes[event.name] = self._errors[event.name] = 0
+            histogram.add(event.ms)
+            self._rows[event.name] += event.rows
+            self._bytes[event.name] += event.bytes
+            self._errors[event.name] += event.failed
+
+    @property
+    def total_queries(self) -> int:
+        return sum(histogram.count for histogram in self._histograms.values())
+
+    def histogram(self, name: str) -> Optional[LatencyHistogram]:
+        """Get the latency histogram of a query name, if it ran."""
+        return self._histograms.get(name)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the recorded queries, slowest in total first.
+
+        Returns:
+            One dictionary per query name with calls, errors, latency figures
+            (total, share of the total, mean, p50, p95, max), rows and bytes
+        """
+        with self._lock:
+            grand_total = sum(histogram.total_ms for histogram in self._histograms.values()) or 1.0
+            rows = [
+                {
+                    'query': name,
+                    'calls': histogram.count,
+                    'errors': self._errors[name],
+                    'total_ms': round(histogram.total_ms, 2),
+                    'share': f"{histogram.total_ms / grand_total:.0%}",
+                    'mean_ms': round(histogram.mean_ms, 2),
+                    'p50_ms': round(histogram.percentile(0.5), 2),
+                    'p95_ms': round(histogram.percentile(0.95), 2),
+                    'max_ms': round(histogram.max_ms, 2),
+                    'rows': self._rows[name],
+                    'bytes': self._bytes[name],
+                    'histogram': histogram.sparkline(),
+                }
+                for name, histogram in self._histograms.items()
+            ]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the statistics, with the full histograms, to a dictionary."""
+        with self._lock:
+            return {
+                name: {
+                    **histogram.as_dict(),
+                    'rows': self._rows[name],
+                    'bytes': self._bytes[name],
+                    'errors': self._errors[name],
+                }
+                for name, histogram in self._histograms.items()
+            }
+
+
+class SlowQueryLog:
+    """Query hook logging a warning for every query slower than a threshold."""
+
+    def __init__(self, threshold_ms: float, log: Optional[logging.Logger] = None):
+        """
+        Args:
+            threshold_ms: Queries taking at least this many milliseconds are logged
+            log: Logger to write to (default: this module's logger)
+        """
+        self.threshold_ms = threshold_ms
+        self.log = log or logger
+
+    def __call__(self, event: QueryEvent) -> None:
+        if event.ms >= self.threshold_ms:
+            status = "failed after" if event.failed else "took"
+            self.log.warning(
+                f"Slow query {event.name} {status} {event.ms:.1f} ms ({event.rows} rows, {event.bytes} bytes)"
+            )
@@ -0,0 +1,189 @@
+"""
+Lazily populated catalog views for psql-catalog.
+
+describe and describe-all fetch every section of every table up front, even when
+the caller only reads one of them: building a dependency graph, for instance,
+only needs the foreign keys. A CatalogView holds the tables of a schema as
+LazyTableStructure objects whose sections (columns, indexes, constraints,
+foreign_key_details) are fetched the first time they are read. Reading a section
+of one table fetches that section for all the tables of the view still missing
+it, in a single query (PostgreSQLCatalog.fetch_section), so walking every table
+costs one query per section actually used, whatever the number of tables.
+
+Both classes are read-only mappings shaped like the describe-all JSON
+(view[table_name][section]), so code written for loaded describe-all results,
+such as TableDependencyGraph, and the JSON serializers accept them as they are.
+"""
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .serialization import TableStructure
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .catalog import PostgreSQLCatalog
+
+SECTIONS = ('columns', 'indexes', 'constraints', 'foreign_key_details')
+
+
+class LazyTableStructure(Mapping):
+    """
+    Description of one table of a CatalogView, each section fetched on first access.
+
+    Sections are readable as keys (table['columns']) or as attributes
+    (table.columns), like a TableStructure.
+    """
+
+    __slots__ = ('_view', 'table_name')
+
+    def __init__(self, view: 'CatalogView', table_name: str):
+        self._view = view
+        self.table_name = table_name
+
+    def __getitem__(self, section: str) -> List[Dict[str, Any]]:
+        if section not in SECTIONS:
+            raise KeyError(section)
+        return self._view.section(self.table_name, section)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SECTIONS)
+
+    def __len__(self) -> int:
+        return len(SECTIONS)
+
+    def __contains__(self, section: object) -> bool:
+        # Membership must not fetch the section
+        return section in SECTIONS
+
+    def __repr__(self) -> str:
+        return f"LazyTableStructure({self.table_name!r}, loaded={self.loaded_sections()!r})"
+
+    @property
+    def columns(self) -> List[Dict[str, Any]]:
+        """Column rows of the table."""
+        return self['columns']
+
+    @property
+    def indexes(self) -> List[Dict[str, Any]]:
+        """Index rows of the table."""
+        return self['indexes']
+
+    @property
+    def constraints(self) -> List[Dict[str, Any]]:
+        """Constraint rows of the table."""
+        return self['constraints']
+
+    @property
+    def foreign_key_details(self) -> List[Dict[str, Any]]:
+        """Foreign key rows of the table."""
+        return self['foreign_key_details']
+
+    def loaded_sections(self) -> Tuple[str, ...]:
+        """Get the sections already fetched for this table."""
+        return tuple(section for section in SECTIONS if self._view.is_loaded(self.table_name, section))
+
+    def to_table_structure(self) -> TableStructure:
+        """Fetch the missing sections and return the table as a TableStructure."""
+        return TableStructure(self.columns, self.indexes, self.constraints, self.foreign_key_details)
+
+
+class CatalogView(Mapping):
+    """
+    Tables of a schema whose sections are fetched on first access, batched across tables.
+
+    Use PostgreSQLCatalog.catalog_view() to create one. The catalog must stay
+    connected while sections are being read.
+    """
+
+    def __init__(
+        self,
+        catalog: 'PostgreSQLCatalog',
+        schema_name: str,
+        table_names: Iterable[str],
+        batch_size: Optional[int] = None
+    ):
+        """
+        Initialize the view.
+
+        Args:
+            catalog: Connected catalog the sections are fetched with
+            schema_name: Schema of the tables
+            table_names: Tables of the view
+            batch_size: Maximum tables per section query (None: all the pending tables)
+        """
+        self.catalog = catalog
+        self.schema_name = schema_name
+        self.batch_size = batch_size
+        self.queries = 0
+        self._tables: Dict[str, LazyTableStructure] = {
+            table_name: LazyTableStructure(self, table_name) for table_name in table_names
+        }
+        self._loaded: Dict[str, Dict[str, List[Dict[str, Any]]]] = {section: {} for section in SECTIONS}
+        # Tables still missing each section, in view order (dicts used as ordered sets)
+        self._pending: Dict[str, Dict[str, None]] = {section: dict.fromkeys(self._tables) for section in SECTIONS}
+
+    def __getitem__(self, table_name: str) -> LazyTableStructure:
+        return self._tables[table_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __repr__(self) -> str:
+        return f"CatalogView({self.schema_name!r}, {len(self)} tables, {self.queries} queries)"
+
+    def is_loaded(self, table_name: str, section: str) -> bool:
+        """Whether a section of a table has already been fetched."""
+        return table_name in self._loaded[section]
+
+    def section(self, table_name: str, section: str) -> List[Dict[str, Any]]:
+        """
+        Get one section of a table, fetching it (for all pending tables) if needed.
+
+        Args:
+            table_name: Table of the view
+            section: 'columns', 'indexes', 'constraints' or 'foreign_key_details'
+
+        Returns:
+            The section rows
+
+        Raises:
+            KeyError: If the table is not part of the view or the section is unknown
+        """
+        loaded = self._loaded[section]
+        if table_name not in loaded:
+            if table_name not in self._tables:
+                raise KeyError(table_name)
+            self._fetch(section, table_name)
+        return loaded[table_name]
+
+    def prefetch(self, *sections: str) -> None:
+        """
+        Fetch sections for all the tables that still miss them.
+
+        Args:
+            *sections: Sections to fetch (default: all of them)
+        """
+        for section in sections or SECTIONS:
+            pending = self._pending[section]
+            while pending:
+                self._fetch(section, next(iter(pending)))
+
+    def _fetch(self, section: str, table_name: str) -> None:
+        """Fetch a section of a table and of the other pending tables, up to batch_size."""
+        pending = self._pending[section]
+        batch = [table_name]
+        for other in pending:
+            if self.batch_size is not None and len(batch) >= self.batch_size:
+                break
+            if other != table_name:
+                batch.append(other)
+
+        rows = self.catalog.fetch_section(section, batch, self.schema_name)
+        self.queries += 1
+        loaded = self._loaded[section]
+        for name in batch:
+            loaded[name] = rows.pop(name, [])
+            pending.pop(name, None)
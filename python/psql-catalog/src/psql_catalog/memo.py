@@ -0,0 +1,212 @@
+"""
+In-session memoization of catalog lookups for psql-catalog.
+
+A CatalogMemo attached to a PostgreSQLCatalog (catalog.memo) keeps the results of
+the per-object lookups (table_exists, describe_table, list_indexes, ...) in a
+bounded LRU, each entry expiring after the TTL of its method. Repeating a lookup
+within the TTL costs no round trip, which makes navigating back and forth in the
+interactive mode instant. Unlike CatalogSnapshotCache nothing is written to disk
+and no fingerprint query is made: stale entries are only dropped by their TTL or
+an explicit invalidate()/clear() (the 'refresh' command of the REPL).
+"""
+
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Default maximum number of memoized results
+DEFAULT_MEMO_SIZE = 4096
+
+# Default seconds a memoized result stays valid
+DEFAULT_MEMO_TTL = 300.0
+
+
+@dataclass
+class MemoStats:
+    """Counters describing how a CatalogMemo has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the memo."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the counters to a dictionary."""
+        return {**asdict(self), 'hit_rate': round(self.hit_rate, 3)}
+
+
+class CatalogMemo:
+    """
+    Bounded LRU of catalog lookup results with a TTL per method.
+
+    The memo is thread-safe and can be shared by several catalogs: entries are
+    keyed by connection string and backend besides the method and its arguments.
+    Results are returned as shallow copies, so callers may add or remove rows; the
+    row dictionaries themselves are shared and must not be modified.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MEMO_SIZE,
+        ttl: float = DEFAULT_MEMO_TTL,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the memo.
+
+        Args:
+            maxsize: Maximum number of memoized results
+            ttl: Seconds a result stays valid
+            ttls: Per-method overrides of ttl, by method name (0 disables the method)
+            clock: Time source, in seconds
+
+        Raises:
+            ValueError: If maxsize is lower than 1
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.clock = clock
+        self.stats = MemoStats()
+        self.method_stats: Dict[str, MemoStats] = {}
+
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of memoized results, including expired ones not yet dropped."""
+        return len(self._entries)
+
+    def lookup(self, method: str, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """
+        Return the memoized result of a lookup, running the loader on a miss.
+
+        Args:
+            method: Name of the memoized method
+            key: Hashable identity of the call (catalog, method and arguments)
+            loader: Function computing the result; its exceptions are not memoized
+
+        Returns:
+            A shallow copy of the (possibly just loaded) result
+        """
+        ttl = self.ttls.get(method, self.ttl)
+        if ttl <= 0:
+            return loader()
+
+        now = self.clock()
+        with self._lock:
+            method_stats = self.method_stats.setdefault(method, MemoStats())
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    method_stats.hits += 1
+                    return copy.copy(value)
+                del self._entries[key]
+                self.stats.expirations += 1
+                method_stats.expirations += 1
+            self.stats.misses += 1
+            method_stats.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (now + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return copy.copy(value)
+
+    def invalidate(self, schema_name: Optional[str] = None) -> int:
+        """
+        Drop memoized results.
+
+        Args:
+            schema_name: Only drop the results of lookups in this schema (plus the
+                schema-independent ones, such as list_schemas); None drops everything
+
+        Returns:
+            Number of results dropped
+        """
+        with self._lock:
+            if schema_name is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+
+            stale = [
+                key for key in self._entries
+                if dict(key[3]).get('schema_name', schema_name) == schema_name
+            ]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop every memoized result and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = MemoStats()
+            self.method_stats = {}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Describe the memo: one row with the totals, then one per memoized method.
+
+        Returns:
+            List of dictionaries with the counters of each row
+        """
+        with self._lock:
+            rows = [{'method': '(all)', 'entries': len(self._entries), **self.stats.as_dict()}]
+            per_method: Dict[str, int] = {}
+            for key in self._entries:
+                per_method[key[2]] = per_method.get(key[2], 0) + 1
+            for method, stats in sorted(self.method_stats.items()):
+                rows.append({'method': method, 'entries': per_method.get(method, 0), **stats.as_dict()})
+        return rows
+
+
+def memoized(method: F) -> F:
+    """
+    Memoize a PostgreSQLCatalog lookup method in the catalog's memo, if it has one.
+
+    Calls are keyed by their arguments with defaults applied, so
+    describe_table('users') and describe_table('users', 'public') share an entry.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        memo: Optional[CatalogMemo] = getattr(self, 'memo', None)
+        if memo is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments: Tuple[Tuple[str, Hashable], ...] = tuple(
+            (name, value) for name, value in bound.arguments.items() if name != 'self'
+        )
+        key = (self.connection_string, self.backend.name, method.__name__, arguments)
+        return memo.lookup(method.__name__, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper  # type: ignore[return-value]
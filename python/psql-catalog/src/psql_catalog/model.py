@@ -0,0 +1,333 @@
+"""
+Memory-lean catalog model for psql-catalog.
+
+Catalog rows are small and extremely repetitive: every column row repeats the keys
+column_name, data_type, is_nullable, ... and values such as 'NO', 'public' or
+'character varying'. A Record stores one row in an object with one slot per
+column (no per-row dictionary), its record class is shared by all rows with the
+same keys, and short strings are interned so that equal values are stored once
+for the whole catalog.
+
+Records are read-only mappings, so code written for the list-of-dicts rows
+(row['column_name'], row.get(...), dict(row), row.keys()) keeps working, and a
+TableStructure whose sections are lists of Records serializes to the same JSON
+as one holding dictionaries. Both the catalog queries (PostgreSQLCatalog with
+interned_rows=True) and SQLAlchemy reflection (table_from_reflection, used by
+get_schema_info.py) produce this model.
+"""
+
+import keyword
+import sys
+import threading
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .serialization import TableStructure
+
+# Strings up to this length are interned; longer ones (defaults, check clauses) rarely repeat
+INTERN_MAX_LENGTH = 64
+
+_TABLE_SECTIONS = ('columns', 'indexes', 'constraints', 'foreign_key_details')
+
+
+def intern_value(value: Any) -> Any:
+    """Intern short strings so that equal values share one object; other values are returned as is."""
+    if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class Record(Mapping):
+    """
+    Read-only row with one slot per column.
+
+    Concrete record classes are created by record_type() for each distinct tuple of
+    column names and shared by all the rows having those columns.
+    """
+
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+    _slot_of: Dict[str, str] = {}
+    _values: Any = None
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._slot_of.get(key)
+        if slot is None:
+            raise KeyError(key)
+        return getattr(self, slot)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def __repr__(self) -> str:
+        return f"Record({dict(self)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return _rebuild, (self._fields, self.as_tuple())
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Get the row values in column order."""
+        values = self._values(self)
+        return values if len(self._fields) != 1 else (values,)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the row to a dictionary."""
+        return dict(zip(self._fields, self.as_tuple()))
+
+
+_record_types: Dict[Tuple[str, ...], Type[Record]] = {}
+_record_types_lock = threading.Lock()
+
+
+def _slot_name(position: int, field: str) -> str:
+    """Slot holding a field: the field name itself when it is a usable attribute name."""
+    # Names of Record/Mapping attributes (keys, get, items, as_dict, ...) would shadow them
+    if (field.isidentifier() and not keyword.iskeyword(field) and not field.startswith('_')
+            and not hasattr(Record, field)):
+        return field
+    return f"_{position}"
+
+
+def record_type(fields: Sequence[str]) -> Type[Record]:
+    """
+    Get the record class of a tuple of column names, creating it on first use.
+
+    Columns whose name is a valid identifier, other than the name of a Record
+    method (keys, get, items, as_dict, ...), are also readable as attributes
+    (record.column_name).
+
+    Args:
+        fields: Column names, in row order
+
+    Returns:
+        Record subclass whose constructor takes the values in column order
+    """
+    fields = tuple(fields)
+    cls = _record_types.get(fields)
+    if cls is not None:
+        return cls
+
+    with _record_types_lock:
+        cls = _record_types.get(fields)
+        if cls is None:
+            slots = tuple(_slot_name(position, field) for position, field in enumerate(fields))
+            if len(set(slots)) != len(slots):
+                slots = tuple(f"_{position}" for position in range(len(fields)))
+            arguments = ', '.join(f"v{position}" for position in range(len(slots)))
+            body = ''.join(f"\n    self.{slot} = v{position}" for position, slot in enumerate(slots)) or "\n    pass"
+            namespace: Dict[str, Any] = {}
+            exec(f"def __init__(self{', ' if arguments else ''}{arguments}):{body}", namespace)
+            cls = type('Record', (Record,), {
+                '__slots__': slots,
+                '__init__': namespace['__init__'],
+                '_fields': fields,
+                '_slot_of': dict(zip(fields, slots)),
+                '_values': staticmethod(attrgetter(*slots)) if slots else staticmethod(lambda record: ()),
+            })
+            _record_types[fields] = cls
+    return cls
+
+
+def _rebuild(fields: Tuple[str, ...], values: Tuple[Any, ...]) -> Record:
+    """Unpickle a record."""
+    return record_type(fields)(*values)
+
+
+def records_from_tuples(columns: Sequence[str], batches: Iterable[Sequence[Tuple[Any, ...]]]) -> List[Record]:
+    """
+    Build interned records from batches of row tuples, one batch at a time.
+
+    Args:
+        columns: Column names, in the order of the row values
+        batches: Iterable of lists of row tuples (e.g. repeated cursor.fetchmany())
+
+    Returns:
+        One record per row
+    """
+    cls = record_type([intern_value(column) for column in columns])
+    records: List[Record] = []
+    append = records.append
+    for rows in batches:
+        for row in rows:
+            append(cls(*map(intern_value, row)))
+    return records
+
+
+def compact_rows(rows: Optional[Iterable[Mapping]]) -> Optional[List[Record]]:
+    """
+    Convert row mappings (dicts, ResultSet rows, records) to interned records.
+
+    Args:
+        rows: Row mappings, or None
+
+    Returns:
+        List of records (None stays None)
+    """
+    if rows is None:
+        return None
+    compacted = []
+    cls: Optional[Type[Record]] = None
+    for row in rows:
+        if isinstance(row, Record):
+            compacted.append(row)
+            continue
+        keys = tuple(row)
+        if cls is None or cls._fields != keys:
+            cls = record_type([intern_value(key) for key in keys])
+        compacted.append(cls(*map(intern_value, row.values())))
+    return compacted
+
+
+def split_records(rows: List[Record], key: str) -> Dict[Any, List[Record]]:
+    """
+    Group records by the value of one column, leaving that column out.
+
+    Each input slot is cleared once its row is regrouped, so the full and the
+    projected records are never all alive at the same time.
+
+    Args:
+        rows: Records sharing the same columns (emptied in the process)
+        key: Column to group by
+
+    Returns:
+        Dictionary with the column values as keys and the projected records as values
+    """
+    grouped: Dict[Any, List[Record]] = {}
+    if not rows:
+        return grouped
+    fields = rows[0]._fields
+    position = fields.index(key)
+    cls = record_type(fields[:position] + fields[position + 1:])
+    for index, row in enumerate(rows):
+        values = row.as_tuple()
+        rows[index] = None  # type: ignore[call-overload]
+        grouped.setdefault(values[position], []).append(cls(*values[:position], *values[position + 1:]))
+    rows.clear()
+    return grouped
+
+
+def compact_table(sections: Any) -> TableStructure:
+    """
+    Build a TableStructure whose sections are lists of interned records.
+
+    Args:
+        sections: A TableStructure or the dictionary of its sections
+
+    Returns:
+        The compact TableStructure (sections that are None stay None)
+    """
+    get = sections.get if isinstance(sections, Mapping) else lambda name: getattr(sections, name)
+    columns, indexes, constraints, fk_details = (compact_rows(get(section)) for section in _TABLE_SECTIONS)
+    return TableStructure(columns or [], indexes or [], constraints, fk_details)
+
+
+def compact_tables(tables: Mapping) -> Dict[str, TableStructure]:
+    """
+    Compact every table of a describe-all result.
+
+    Args:
+        tables: Mapping of table name to TableStructure or section dictionary
+
+    Returns:
+        Dictionary of table name to compact TableStructure
+    """
+    return {intern_value(table_name): compact_table(sections) for table_name, sections in tables.items()}
+
+
+def table_from_reflection(
+    schema_name: str,
+    table_name: str,
+    columns: List[Dict[str, Any]],
+    primary_key: Optional[Dict[str, Any]] = None,
+    indexes: Optional[List[Dict[str, Any]]] = None,
+    foreign_keys: Optional[List[Dict[str, Any]]] = None
+) -> TableStructure:
+    """
+    Build the compact model of a table from SQLAlchemy reflection results.
+
+    The rows get the keys of the catalog queries (as returned by describe and
+    describe-all), so both paths serialize to the same JSON shape. Type details
+    are read from the SQLAlchemy type (None when it has none), primary keys are
+    reported as not deferrable and missing referential actions as NO ACTION.
+
+    Args:
+        schema_name: Schema of the table
+        table_name: Table name
+        columns: Inspector.get_columns() result
+        primary_key: Inspector.get_pk_constraint() result
+        indexes: Inspector.get_indexes() result
+        foreign_keys: Inspector.get_foreign_keys() result
+
+    Returns:
+        The TableStructure, with constraints and foreign key details
+    """
+    column_type = record_type((
+        'column_name', 'data_type', 'is_nullable', 'column_default',
+        'character_maximum_length', 'numeric_precision', 'numeric_scale'
+    ))
+    index_type = record_type(('index_name', 'column_name', 'is_unique', 'is_primary'))
+    constraint_type = record_type((
+        'constraint_name', 'constraint_type', 'table_name', 'table_schema', 'column_name',
+        'foreign_table_column', 'check_clause', 'is_deferrable', 'initially_deferred'
+    ))
+    fk_type = record_type((
+        'constraint_name', 'column_name', 'foreign_table_schema', 'foreign_table_name',
+        'foreign_column_name', 'on_update', 'on_delete', 'is_deferrable', 'initially_deferred'
+    ))
+    schema_name, table_name = intern_value(schema_name), intern_value(table_name)
+
+    column_rows = []
+    for column in columns:
+        sql_type = column['type']
+        column_rows.append(column_type(
+            intern_value(column['name']),
+            intern_value(str(sql_type).lower()),
+            'YES' if column.get('nullable', True) else 'NO',
+            intern_value(column.get('default')),
+            getattr(sql_type, 'length', None),
+            getattr(sql_type, 'precision', None),
+            getattr(sql_type, 'scale', None),
+        ))
+
+    index_rows, constraint_rows, fk_rows = [], [], []
+    pk_columns = (primary_key or {}).get('constrained_columns') or []
+    pk_name = intern_value((primary_key or {}).get('name'))
+    for column_name in pk_columns:
+        index_rows.append(index_type(pk_name, intern_value(column_name), True, True))
+        constraint_rows.append(constraint_type(
+            pk_name, 'PRIMARY KEY', table_name, schema_name, intern_value(column_name), None, None, 'NO', 'NO'
+        ))
+    for index in indexes or []:
+        for column_name in index.get('column_names') or []:
+            index_rows.append(index_type(
+                intern_value(index.get('name')), intern_value(column_name), bool(index.get('unique')), False
+            ))
+    for fk in foreign_keys or []:
+        referred_schema = intern_value(fk.get('referred_schema') or schema_name)
+        referred_table = intern_value(fk['referred_table'])
+        name = intern_value(fk.get('name'))
+        options = fk.get('options') or {}
+        deferrable = 'YES' if options.get('deferrable') else 'NO'
+        initially_deferred = 'YES' if str(options.get('initially', '')).upper() == 'DEFERRED' else 'NO'
+        for column_name, referred_column in zip(fk['constrained_columns'], fk['referred_columns']):
+            column_name, referred_column = intern_value(column_name), intern_value(referred_column)
+            constraint_rows.append(constraint_type(
+                name, 'FOREIGN KEY', table_name, schema_name, column_name,
+                f"{referred_schema}.{referred_table}.{referred_column}", None, deferrable, initially_deferred
+            ))
+            fk_rows.append(fk_type(
+                name, column_name, referred_schema, referred_table, referred_column,
+                intern_value((options.get('onupdate') or 'NO ACTION').upper()),
+                intern_value((options.get('ondelete') or 'NO ACTION').upper()),
+                deferrable, initially_deferred
+            ))
+
+    return TableStructure(column_rows, index_rows, constraint_rows, fk_rows)
@@ -0,0 +1,354 @@
+"""
+Connection pooling for psql-catalog.
+
+A small thread-safe pool of psycopg2 connections that can be shared by
+PostgreSQLCatalog, DatabaseBatchOperations and the interactive REPL, so that
+repeated commands reuse established connections instead of paying the
+connection (TLS/authentication) setup every time.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+from .exceptions import DatabaseConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how a ConnectionPool has been used."""
+
+    connections_opened: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    wait_time_ms: float = 0.0
+    timeouts: int = 0
+    pings: int = 0
+    reconnects: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert the counters to a dictionary."""
+        return asdict(self)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections.
+
+    Connections are opened lazily up to maxconn. When every connection is checked
+    out, getconn() waits (up to timeout seconds) for one to be returned instead of
+    failing. Idle connections are kept open for reuse and, with pre_ping enabled,
+    checked with a cheap round trip before being handed out, so connections dropped
+    by the server are replaced transparently.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        minconn: int = 0,
+        maxconn: int = 5,
+        timeout: float = 30.0,
+        pre_ping: bool = True
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            connection_string: PostgreSQL connection string
+            minconn: Number of connections opened up front
+            maxconn: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before failing
+            pre_ping: Check idle connections before handing them out
+
+        Raises:
+            ValueError: If the pool limits are invalid
+            DatabaseConnectionError: If the initial connections cannot be opened
+        """
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError(f"Invalid pool limits: minconn={minconn}, maxconn={maxconn}")
+
+        self.connection_string = connection_string
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.stats = PoolStats()
+
+        self._cond = threading.Condition()
+        self._idle: List[extensions.connection] = []
+        self._used: Dict[int, extensions.connection] = {}
+        self._size = 0
+        self._closed = False
+
+        for _ in range(minconn):
+            self._size += 1
+            self._idle.append(self._open())
+
+    @property
+    def closed(self) -> bool:
+        """Whether closeall() has been called."""
+        return self._closed
+
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle and checked out)."""
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        """Number of checked out connections."""
+        return len(self._used)
+
+    def getconn(self) -> extensions.connection:
+        """
+        Check out a connection, waiting for one to be returned if the pool is full.
+
+        Returns:
+            An open psycopg2 connection
+
+        Raises:
+            DatabaseConnectionError: If the pool is closed, no connection became free
+                within the timeout, or a new connection could not be opened
+        """
+        conn: Optional[extensions.connection] = None
+        started = time.perf_counter()
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DatabaseConnectionError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.maxconn:
+                    self._size += 1
+                    break
+                if not waited:
+                    waited = True
+                    self.stats.waits += 1
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise DatabaseConnectionError(
+                        f"Timed out after {self.timeout}s waiting for a pooled connection "
+                        f"({self.maxconn} in use)"
+                    )
+                self._cond.wait(remaining)
+
+            self.stats.checkouts += 1
+            if waited:
+                self.stats.wait_time_ms += (time.perf_counter() - started) * 1000
+
+        try:
+            if conn is None:
+                conn = self._open()
+            elif self.pre_ping and not self._is_alive(conn):
+                logger.info("Pooled connection is no longer usable, reconnecting")
+                self._close_quietly(conn)
+                conn = self._open()
+                with self._cond:
+                    self.stats.reconnects += 1
+        except DatabaseConnectionError:
+            self._release_slot()
+            raise
+
+        with self._cond:
+            self._used[id(conn)] = conn
+        return conn
+
+    def putconn(self, conn: extensions.connection, close: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Open transactions are rolled back; broken connections are discarded.
+
+        Args:
+            conn: Connection obtained from getconn()
+            close: Close the connection instead of keeping it for reuse
+        """
+        with self._cond:
+            if self._used.pop(id(conn), None) is None:
+                logger.warning("Ignoring a connection that was not checked out from this pool")
+                return
+
+        if not close and not conn.closed:
+            close = not self.reset(conn)
+
+        with self._cond:
+            if close or conn.closed or self._closed:
+                self._close_quietly(conn)
+                self._size -= 1
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def reconnect(self, conn: extensions.connection) -> extensions.connection:
+        """
+        Replace a checked out connection that was lost with a new one.
+
+        The caller keeps its slot in the pool, so this never waits.
+
+        Args:
+            conn: Broken connection obtained from getconn()
+
+        Returns:
+            A new open connection, checked out in place of the old one
+
+        Raises:
+            DatabaseConnectionError: If a new connection cannot be opened
+        """
+        with self._cond:
+            self._used.pop(id(conn), None)
+        self._close_quietly(conn)
+
+        try:
+            new_conn = self._open()
+        except DatabaseConnectionError:
+            self._release_slot()
+            raise
+
+        with self._cond:
+            self._used[id(new_conn)] = new_conn
+            self.stats.reconnects += 1
+        return new_conn
+
+    def reset(self, conn: extensions.connection) -> bool:
+        """
+        Bring a connection back to a clean state after its work is done or has failed.
+
+        The base pool rolls back any open transaction. Subclasses that keep session
+        state across checkouts (such as a shared snapshot) restore it here.
+
+        Args:
+            conn: Checked out connection
+
+        Returns:
+            True if the connection can be reused, False if it should be discarded
+        """
+        if conn.closed:
+            return False
+        status = conn.info.transaction_status
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        return True
+
+    @contextmanager
+    def connection(self) -> Iterator[extensions.connection]:
+        """
+        Check out a connection for the duration of a with block.
+
+        Yields:
+            An open psycopg2 connection
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self) -> None:
+        """Close the idle connections; checked out connections are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.closeall()
+
+    def _open(self) -> extensions.connection:
+        """Open a new connection."""
+        try:
+            conn = psycopg2.connect(self.connection_string)
+        except psycopg2.Error as e:
+            logger.error(f"Database connection failed: {e}")
+            raise DatabaseConnectionError(f"Failed to connect to database: {e}")
+        with self._cond:
+            self.stats.connections_opened += 1
+        logger.debug("Opened pooled database connection")
+        return conn
+
+    def _is_alive(self, conn: extensions.connection) -> bool:
+        """Check a connection with a cheap round trip, leaving its transaction state as it was."""
+        if conn.closed:
+            return False
+        with self._cond:
+            self.stats.pings += 1
+        try:
+            was_idle = conn.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if was_idle and not conn.autocommit:
+                conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.debug(f"Pooled connection failed pre-ping: {e}")
+            return False
+
+    def _release_slot(self) -> None:
+        """Give back the slot reserved for a connection that could not be opened."""
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn: extensions.connection) -> None:
+        """Close a connection, ignoring errors."""
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+
+_shared_pools: Dict[str, ConnectionPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def shared_pool(connection_string: str, **kwargs: Any) -> ConnectionPool:
+    """
+    Get the process-wide pool for a connection string, creating it on first use.
+
+    Args:
+        connection_string: PostgreSQL connection string
+        **kwargs: ConnectionPool options used when the pool is created
+
+    Returns:
+        The shared ConnectionPool for the connection string
+    """
+    with _shared_pools_lock:
+        pool = _shared_pools.get(connection_string)
+        if pool is None or pool.closed:
+            pool = ConnectionPool(connection_string, **kwargs)
+            _shared_pools[connection_string] = pool
+        return pool
+
+
+def close_shared_pools() -> None:
+    """Close every pool created by shared_pool()."""
+    with _shared_pools_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        pool.closeall()
@@ -0,0 +1,374 @@
+"""
+Python-side profiling of psql-catalog commands.
+
+Three profilers, each started before a command and stopped after it (the global
+--profile and --trace-malloc options of the CLI):
+
+- SamplingProfiler: a background thread records the Python stack of every other
+  thread every few milliseconds, weighted by wall-clock time. The stacks are
+  written as a speedscope profile (https://www.speedscope.app) or in the
+  collapsed format of flamegraph.pl / inferno ("folded" stacks).
+- DeterministicProfiler: cProfile, written as a pstats file (snakeviz, gprof2dot).
+- AllocationTracer: tracemalloc, reporting the peak traced memory and the
+  allocation sites alive when the heap was largest.
+
+Each profiler summarizes its top-N hotspots as rows for display.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Default seconds between two stack samples. The interpreter switches threads
+# every sys.getswitchinterval() (5 ms) while Python code runs, so busier
+# sampling only has effect while the command waits on I/O.
+DEFAULT_SAMPLE_INTERVAL = 0.002
+
+# Default number of hotspots reported
+DEFAULT_TOP = 15
+
+PROFILERS = ('sampling', 'cprofile')
+
+FOLDED_EXTENSIONS = ('.folded', '.collapsed', '.txt')
+
+# Name prefix of the profilers' own threads, left out of the samples
+PROFILER_THREAD = 'psql-catalog-profiler'
+
+Frame = Tuple[str, int, str]
+
+
+def short_path(filename: str) -> str:
+    """Shorten a source path to its module path below the longest matching sys.path entry."""
+    best = ''
+    for entry in sys.path:
+        if entry and filename.startswith(entry.rstrip(os.sep) + os.sep) and len(entry) > len(best):
+            best = entry
+    return filename[len(best.rstrip(os.sep)) + 1:] if best else filename
+
+
+def frame_label(frame: Frame) -> str:
+    """Format a (filename, line, function) frame as 'function (module/path.py:line)'."""
+    filename, line, function = frame
+    return f"{function} ({short_path(filename)}:{line})"
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler of every thread of the process."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            interval: Seconds between two samples
+        """
+        self.interval = interval
+        self.duration = 0.0
+        # (thread name, stack from root to leaf) -> [samples, seconds]
+        self._stacks: Dict[Tuple[str, Tuple[Frame, ...]], List[float]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    @property
+    def sample_count(self) -> int:
+        return int(sum(samples for samples, _ in self._stacks.values()))
+
+    def start(self) -> None:
+        """Start sampling on a background thread."""
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=PROFILER_THREAD, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        code_frames: Dict[Any, Frame] = {}
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or names.get(ident, '').startswith(PROFILER_THREAD):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    entry = code_frames.get(code)
+                    if entry is None:
+                        entry = code_frames[code] = (
+                            code.co_filename, code.co_firstlineno, getattr(code, 'co_qualname', code.co_name)
+                        )
+                    stack.append(entry)
+                    frame = frame.f_back
+                stack.reverse()
+                key = (names.get(ident, str(ident)), tuple(stack))
+                counts = self._stacks.get(key)
+                if counts is None:
+                    self._stacks[key] = [1, elapsed]
+                else:
+                    counts[0] += 1
+                    counts[1] += elapsed
+
+    def hotspots(self, top: int = DEFAULT_TOP) -> List[Dict[str, Any]]:
+        """
+        Summarize the functions where most wall-clock time was spent.
+
+        Args:
+            top: Number of functions to report
+
+        Returns:
+            Rows with the function, its own time (as the leaf frame) and its
+            total time (anywhere in the stack), in seconds and as a share of the
+            sampled time, ordered by own time
+        """
+        own: Dict[Frame, float] = defaultdict(float)
+        total: Dict[Frame, float] = defaultdict(float)
+        sampled = 0.0
+        for (_, stack), (_, seconds) in self._stacks.items():
+            if not stack:
+                continue
+            sampled += seconds
+            own[stack[-1]] += seconds
+            for frame in set(stack):
+                total[frame] += seconds
+
+        sampled = sampled or 1.0
+        ranked = sorted(own.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [
+            {
+                'function': frame_label(frame),
+                'self_sec': round(seconds, 3),
+                'self_pct': f"{seconds / sampled:.1%}",
+                'total_sec': round(total[frame], 3),
+                'total_pct': f"{total[frame] / sampled:.1%}",
+            }
+            for frame, seconds in ranked
+        ]
+
+    def write(self, path: str, name: str = 'psql-catalog') -> None:
+        """
+        Write the samples as collapsed stacks (.folded, .collapsed, .txt) or a speedscope profile.
+
+        Args:
+            path: Output file; the extension selects the format
+            name: Name of the profile
+        """
+        if path.endswith(FOLDED_EXTENSIONS):
+            self.write_folded(path)
+        else:
+            self.write_speedscope(path, name)
+
+    def write_folded(self, path: str) -> None:
+        """Write one 'thread;frame;...;frame samples' line per distinct stack (flamegraph.pl, inferno)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for (thread_name, stack), (samples, _) in sorted(self._stacks.items()):
+                frames = ';'.join(frame_label(frame).replace(';', ':') for frame in stack)
+                f.write(f"{thread_name};{frames} {int(samples)}\n")
+
+    def write_speedscope(self, path: str, name: str = 'psql-catalog') -> None:
+        """Write a speedscope 'sampled' profile per thread, weighted in seconds."""
+        frame_ids: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        threads: Dict[str, Dict[str, list]] = {}
+
+        for (thread_name, stack), (_, seconds) in self._stacks.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_ids:
+                    frame_ids[frame] = len(frames)
+                    frames.append({'name': frame[2], 'file': short_path(frame[0]), 'line': frame[1]})
+                indices.append(frame_ids[frame])
+            profile = threads.setdefault(thread_name, {'samples': [], 'weights': []})
+            profile['samples'].append(indices)
+            profile['weights'].append(seconds)
+
+        document = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'psql-catalog',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': thread_name,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': sum(profile['weights']),
+                    'samples': profile['samples'],
+                    'weights': profile['weights'],
+                }
+                for thread_name, profile in sorted(threads.items(), key=lambda item: item[0] != 'MainThread')
+            ],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+
+class DeterministicProfiler:
+    """cProfile wrapper: exact call counts and times, at a higher overhead than sampling."""
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling the current thread."""
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self._profile.disable()
+
+    def hotspots(self, top: int = DEFAULT_TOP) -> List[Dict[str, Any]]:
+        """
+        Summarize the functions with the most own time.
+
+        Args:
+            top: Number of functions to report
+
+        Returns:
+            Rows with the function, its call count, own time and cumulative time
+        """
+        stats = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+        ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        return [
+            {
+                'function': frame_label(frame),
+                'calls': calls,
+                'self_sec': round(own_time, 3),
+                'total_sec': round(cumulative, 3),
+            }
+            for frame, (_, calls, own_time, cumulative, _) in ranked
+        ]
+
+    def write(self, path: str, name: str = 'psql-catalog') -> None:
+        """Write the statistics as a pstats file."""
+        self._profile.dump_stats(path)
+
+
+class AllocationTracer:
+    """
+    tracemalloc session reporting the peak memory and where it was allocated.
+
+    tracemalloc only keeps the peak size, not the allocations alive at the peak,
+    so a watcher thread takes a snapshot whenever the traced memory grows past
+    the largest snapshot so far by `growth`; the largest snapshot then holds the
+    allocation sites of the heap within that margin of its peak.
+    """
+
+    def __init__(self, frames: int = 1, poll: float = 0.01, growth: float = 1.25):
+        """
+        Args:
+            frames: Frames stored per allocation (1 attributes each to its line)
+            poll: Seconds between two checks of the traced memory
+            growth: Factor by which the memory must grow before a new snapshot
+        """
+        self.frames = frames
+        self.poll = poll
+        self.growth = growth
+        self.peak = 0
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._snapshot_size = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start tracing allocations."""
+        tracemalloc.start(self.frames)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name=f'{PROFILER_THREAD}-tracemalloc', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop tracing, keeping the snapshot nearest to the peak."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._take_snapshot_if_grown()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll):
+            self._take_snapshot_if_grown()
+
+    def _take_snapshot_if_grown(self) -> None:
+        current = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            if current > self._snapshot_size * self.growth:
+                self._snapshot = tracemalloc.take_snapshot()
+                self._snapshot_size = current
+
+    @property
+    def snapshot_size(self) -> int:
+        """Traced memory when the kept snapshot was taken."""
+        return self._snapshot_size
+
+    def hotspots(self, top: int = DEFAULT_TOP) -> List[Dict[str, Any]]:
+        """
+        Summarize the source lines holding the most memory in the kept snapshot.
+
+        Args:
+            top: Number of lines to report
+
+        Returns:
+            Rows with the allocation site, its size in KiB and share, and the
+            number of blocks
+        """
+        if self._snapshot is None:
+            return []
+        snapshot = self._snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ])
+        statistics = snapshot.statistics('lineno')
+        traced = sum(stat.size for stat in statistics) or 1
+        return [
+            {
+                'allocation_site': f"{short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                'kib': round(stat.size / 1024, 1),
+                'share_pct': f"{stat.size / traced:.1%}",
+                'blocks': stat.count,
+            }
+            for stat in statistics[:top]
+        ]
+
+
+def create_profiler(kind: str, interval: float = DEFAULT_SAMPLE_INTERVAL) -> Any:
+    """
+    Create a profiler by name.
+
+    Args:
+        kind: 'sampling' or 'cprofile'
+        interval: Seconds between two samples (sampling only)
+
+    Returns:
+        A SamplingProfiler or DeterministicProfiler
+
+    Raises:
+        ValueError: If the profiler is unknown
+    """
+    if kind == 'sampling':
+        return SamplingProfiler(interval)
+    if kind == 'cprofile':
+        return DeterministicProfiler()
+    raise ValueError(f"Unknown profiler '{kind}'. Available: {', '.join(PROFILERS)}")
@@ -0,0 +1,278 @@
+"""
+Compact query result container for psql-catalog.
+
+A ResultSet keeps the column names once and stores the values column by column,
+instead of one dictionary per row:
+
+- integer and float columns are packed into typed arrays (8 bytes per value instead
+  of a pointer plus a Python object)
+- repeated strings and date/time values within a column are stored once, which is
+  what makes catalog dumps (data types, nullability, schema names, ...) small
+
+Rows are exposed as read-only Row mappings created on access, so code written for the
+list-of-dicts results (row['column'], row.get(...), row.keys(), dict(row), len(result),
+result[0]) keeps working while using several times less memory on large results.
+"""
+
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Values of these types are deduplicated within a column
+_DEDUPLICATED_TYPES = (str, date, time)
+
+# Deduplication of a column stops once this many values were seen and most were distinct
+_DEDUPLICATION_SAMPLE = 1000
+
+
+def _extend_column(
+    column: Optional[Sequence[Any]],
+    values: Sequence[Any],
+    seen: Optional[Dict[Any, Any]]
+) -> Tuple[Sequence[Any], Optional[Dict[Any, Any]]]:
+    """
+    Append values to a packed column.
+
+    Args:
+        column: Column packed so far (None for the first values)
+        values: New values, in row order
+        seen: Deduplication table of the column (None once deduplication is off)
+
+    Returns:
+        Tuple of (packed column: a typed array for int/float columns, otherwise a list in
+        which equal strings and date/time values share one object; deduplication table)
+    """
+    if column is None or isinstance(column, array):
+        value_type = type(values[0]) if column is None else (int if column.typecode == 'q' else float)
+        if value_type in (int, float) and all(type(value) is value_type for value in values):
+            try:
+                packed = array('q' if value_type is int else 'd', values)
+                if column is None:
+                    return packed, seen
+                column.extend(packed)
+                return column, seen
+            except OverflowError:
+                pass
+        column = list(column) if column is not None else []
+
+    if seen is None:
+        column.extend(values)
+        return column, seen
+
+    for value in values:
+        if isinstance(value, _DEDUPLICATED_TYPES):
+            # Equal aware date/times may differ in their UTC offset, which must be kept
+            key = (value, value.utcoffset()) if isinstance(value, (datetime, time)) else value
+            value = seen.setdefault(key, value)
+        column.append(value)
+
+    if len(column) >= _DEDUPLICATION_SAMPLE and len(seen) > len(column) // 2:
+        # Mostly distinct values (ids, hashes, ...): deduplicating only costs memory
+        seen = None
+    return column, seen
+
+
+class Row(Mapping):
+    """Read-only, dictionary-like view of one result row."""
+
+    __slots__ = ('_values', '_index')
+
+    def __init__(self, values: Tuple[Any, ...], index: Dict[str, int]):
+        """
+        Initialize the row.
+
+        Args:
+            values: Column values in column order
+            index: Mapping of column name to position, shared by all rows of a result
+        """
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, key: Union[str, int]) -> Any:
+        """Get a value by column name (or by position when key is an int)."""
+        if isinstance(key, int):
+            return self._values[key]
+        return self._values[self._index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"Row({dict(self)!r})"
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Get the row values in column order."""
+        return self._values
+
+
+class ResultSet(Sequence):
+    """
+    Query result stored column by column.
+
+    Indexing returns Row objects (slices return a ResultSet), so a ResultSet can be
+    used wherever a list of row dictionaries is expected for reading.
+    """
+
+    __slots__ = ('columns', '_data', '_index', '_length')
+
+    def __init__(self, columns: Sequence[str], rows: Optional[List[Tuple[Any, ...]]] = None):
+        """
+        Initialize the result from row tuples.
+
+        Args:
+            columns: Column names, in the order of the row values
+            rows: Row tuples (e.g. cursor.fetchall())
+        """
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._index: Dict[str, int] = {name: position for position, name in enumerate(self.columns)}
+        self._data: List[Sequence[Any]] = []
+        self._length = 0
+        self._pack([rows] if rows else [])
+
+    @classmethod
+    def from_batches(cls, columns: Sequence[str], batches: Iterable[List[Tuple[Any, ...]]]) -> 'ResultSet':
+        """
+        Create a result from batches of row tuples, packing each batch as it arrives.
+
+        Only one batch of unpacked rows exists at a time, so the peak memory stays
+        close to the size of the packed result.
+
+        Args:
+            columns: Column names, in the order of the row values
+            batches: Iterable of lists of row tuples (e.g. repeated cursor.fetchmany())
+
+        Returns:
+            The packed result
+        """
+        result = cls(columns)
+        result._pack(batches)
+        return result
+
+    def _pack(self, batches: Iterable[List[Tuple[Any, ...]]]) -> None:
+        """Pack batches of row tuples into the columns."""
+        packed: List[Optional[Sequence[Any]]] = [None] * len(self.columns)
+        seen: List[Optional[Dict[Any, Any]]] = [{} for _ in self.columns]
+
+        for rows in batches:
+            if not rows:
+                continue
+            self._length += len(rows)
+            for position, values in enumerate(zip(*rows)):
+                packed[position], seen[position] = _extend_column(packed[position], values, seen[position])
+
+        self._data = [column if column is not None else [] for column in packed]
+
+    @classmethod
+    def _from_columns(
+        cls,
+        columns: Tuple[str, ...],
+        data: List[Sequence[Any]],
+        length: int,
+        index: Optional[Dict[str, int]] = None
+    ) -> 'ResultSet':
+        """Create a result from already packed columns."""
+        result = cls.__new__(cls)
+        result.columns = columns
+        result._data = data
+        result._length = length
+        result._index = index if index is not None else {name: i for i, name in enumerate(columns)}
+        return result
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Row, 'ResultSet']:
+        if isinstance(item, slice):
+            data = [column[item] for column in self._data]
+            return ResultSet._from_columns(self.columns, data, len(range(*item.indices(self._length))), self._index)
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError("ResultSet index out of range")
+        return Row(tuple(column[item] for column in self._data), self._index)
+
+    def __iter__(self) -> Iterator[Row]:
+        index = self._index
+        for values in self.iter_tuples():
+            yield Row(values, index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResultSet):
+            return self.columns == other.columns and list(self.iter_tuples()) == list(other.iter_tuples())
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(row == expected for row, expected in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ResultSet(columns={list(self.columns)!r}, rows={self._length})"
+
+    def iter_tuples(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over the rows as tuples of values in column order."""
+        if not self._data:
+            return iter([()] * self._length)
+        return zip(*self._data)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        Get all values of one column (shared, not copied).
+
+        Args:
+            name: Column name
+
+        Returns:
+            Sequence with the column value of every row
+        """
+        return self._data[self._index[name]]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to the list-of-dicts representation."""
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in self.iter_tuples()]
+
+    def group_by(self, name: str) -> Dict[Any, 'ResultSet']:
+        """
+        Split the rows by the value of one column, leaving that column out.
+
+        Args:
+            name: Column to group by
+
+        Returns:
+            Dictionary with the column values as keys and the matching rows as values
+        """
+        position = self._index[name]
+        columns = self.columns[:position] + self.columns[position + 1:]
+        data = self._data[:position] + self._data[position + 1:]
+        index = {column: i for i, column in enumerate(columns)}
+
+        positions: Dict[Any, List[int]] = defaultdict(list)
+        for row_number, key in enumerate(self._data[position]):
+            positions[key].append(row_number)
+
+        groups = {}
+        for key, row_numbers in positions.items():
+            group_data = [
+                array(column.typecode, (column[i] for i in row_numbers)) if isinstance(column, array)
+                else [column[i] for i in row_numbers]
+                for column in data
+            ]
+            groups[key] = ResultSet._from_columns(columns, group_data, len(row_numbers), index)
+        return groups
+
+
+def to_builtin(obj: Any) -> Any:
+    """
+    Convert a ResultSet or Row to plain lists and dicts (e.g. as a json 'default' hook).
+
+    Raises:
+        TypeError: If obj is neither a ResultSet nor a Row
+    """
+    if isinstance(obj, ResultSet):
+        return obj.to_dicts()
+    if isinstance(obj, Row):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj)} is not a ResultSet or Row")
@@ -3,31 +3,28 @@ JSON serialization utilities for psql-catalog.
 """
 
 import json
-from typing import Self, Dict, Any, List, Optional
-from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from collections.abc import Mapping
+from itertools import chain, islice
+from typing import Self, Dict, Any, Iterable, List, Optional, TextIO, Tuple, Union
+from datetime import date, datetime, time
+from dataclasses import dataclass, field
+
+from . import codec
 
 class JSONSerializableMixin:
     """Mixin class for JSON serialization support."""
 
+    __slots__ = ()
+
     @classmethod
     def from_json(cls, json_string: str) -> Self:
-        """Create instance from JSON string."""
-        return cls(**json.loads(json_string))
+        """Create instance from JSON string, rebuilding nested result objects."""
+        return codec.loads(cls, json_string)
 
     def as_json(self, indent: Optional[int] = None) -> str:
         """Convert instance to JSON string."""
-        # Deve suportar objetos aninhados
-        # return json.dumps(vars(self), indent=indent, default=self._json_serializer)
-        # TODO: CUIDADO type: ignore abaixo vale apenas para situações em que o Mixin está aplicado a dataclass.
-        return json.dumps(asdict(self), indent=indent, default=self._json_serializer) # type: ignore
-
-    @staticmethod
-    def _json_serializer(obj):
-        """Custom JSON serializer for special types."""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+        # Objetos aninhados são serializados pelo codec sem a cópia profunda de asdict
+        return codec.dumps(self, indent=indent)
 
 
 @dataclass
@@ -68,7 +65,7 @@ class TablesResult(CatalogResult):
 
 
 
-@dataclass
+@dataclass(slots=True)
 class TableStructure(JSONSerializableMixin):
     """Structure information for a table."""
 
@@ -166,6 +163,20 @@ class InfoResult(CatalogResult):
         self.command = "info"
 
 
+@dataclass
+class SearchResult(CatalogResult):
+    """Result for search command (matches from the offline catalog store)."""
+
+    kind: str = 'columns'
+    patterns: Dict[str, str] = field(default_factory=dict)
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+    match_count: int = 0
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.command = "search"
+
+
 def create_schemas_result(schemas: List[Dict[str, Any]], database: str) -> SchemasResult:
     """Create a SchemasResult instance."""
     return SchemasResult(
@@ -271,6 +282,24 @@ def create_info_result(db_info: Dict[str, Any], database: str) -> InfoResult:
     )
 
 
+def create_search_result(
+    kind: str,
+    patterns: Dict[str, str],
+    matches: List[Dict[str, Any]],
+    store: str
+) -> SearchResult:
+    """Create a SearchResult instance (database holds the catalog store path)."""
+    return SearchResult(
+        command="search",
+        timestamp=datetime.now(),
+        database=store,
+        kind=kind,
+        patterns=patterns,
+        matches=matches,
+        match_count=len(matches)
+    )
+
+
 def output_json(result: CatalogResult, indent: Optional[int] = 2) -> str:
     """Output a catalog result as formatted JSON."""
     return result.as_json(indent=indent)
@@ -280,3 +309,221 @@ def save_json_to_file(result: CatalogResult, filename: str, indent: Optional[int
     """Save a catalog result to a JSON file."""
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(result.as_json(indent=indent))
+
+
+def _streamed_value_serializer(obj: Any) -> Any:
+    """JSON serializer for the column values of streamed query results."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, memoryview):
+        return obj.tobytes().hex()
+    return str(obj)
+
+
+class _RowEncoder:
+    """
+    Encode flat result rows as JSON, formatted exactly like json.dumps(row, indent=...).
+
+    Scalars are encoded with the C encoder and the key prefixes of each column are
+    built once per column set, which makes indented output several times faster than
+    calling json.dumps for every row.
+    """
+
+    def __init__(self, indent: Optional[int], depth: int):
+        self.indent = indent
+        self.pad = ' ' * (indent or 0)
+        self.depth = depth
+        self.scalar = json.JSONEncoder(default=_streamed_value_serializer).encode
+        self.nested = json.JSONEncoder(indent=indent, default=_streamed_value_serializer).encode
+        self._keys: Optional[tuple] = None
+        self._prefixes: List[str] = []
+
+    def encode(self, row: Dict[str, Any]) -> str:
+        """Encode one row."""
+        if self.indent is None:
+            return self.scalar(row)
+        if not row:
+            return '{}'
+
+        keys = tuple(row)
+        if keys != self._keys:
+            inner = '\n' + self.pad * (self.depth + 1)
+            self._keys = keys
+            self._prefixes = [f"{inner}{json.dumps(key)}: " for key in keys]
+
+        parts = []
+        for prefix, value in zip(self._prefixes, row.values()):
+            if isinstance(value, (dict, list, tuple)):
+                value_json = self.nested(value).replace('\n', '\n' + self.pad * (self.depth + 1))
+            else:
+                value_json = self.scalar(value)
+            parts.append(prefix + value_json)
+        return '{' + ','.join(parts) + '\n' + self.pad * self.depth + '}'
+
+
+def write_query_result_stream(
+    sql: str,
+    rows: Iterable[Dict[str, Any]],
+    database: str,
+    out: TextIO,
+    indent: Optional[int] = 2,
+    max_rows: Optional[int] = None
+) -> int:
+    """
+    Write a query result as JSON while its rows are being fetched.
+
+    The document has the same keys, in the same order, as QueryResult.as_json, but
+    rows are written one at a time, so memory use does not depend on the number of
+    rows. row_count comes last because it is only known at the end.
+
+    Args:
+        sql: The executed SQL
+        rows: Iterable of dictionaries (e.g. PostgreSQLCatalog.stream_query)
+        database: Database name
+        out: Text stream to write to
+        indent: JSON indentation (None for compact output)
+        max_rows: Stop after this many rows (None for no limit)
+
+    Returns:
+        Number of rows written
+    """
+    # Fetch the first row before writing anything, so that a failing query
+    # does not leave a half-written document behind
+    iterator = iter(islice(rows, max_rows))
+    first_row = next(iterator, None)
+
+    header = {
+        'command': 'query',
+        'timestamp': datetime.now().isoformat(),
+        'database': database,
+        'schema': None,
+        'table': None,
+        'sql': sql,
+    }
+    newline = '\n' if indent is not None else ''
+    pad = ' ' * (indent or 0)
+    item_separator = ',' if indent is not None else ', '
+    encoder = _RowEncoder(indent, depth=2)
+
+    # Header without its closing brace, followed by the opening of the results array
+    out.write(json.dumps(header, indent=indent)[:-len(newline) - 1].rstrip())
+    out.write(f'{item_separator}{newline}{pad}"results": [')
+
+    count = 0
+    if first_row is not None:
+        out.write(f'{newline}{pad * 2}{encoder.encode(first_row)}')
+        count = 1
+        for row in iterator:
+            out.write(f'{item_separator}{newline}{pad * 2}{encoder.encode(row)}')
+            count += 1
+
+    out.write(f'{newline}{pad}]' if count else ']')
+    out.write(f'{item_separator}{newline}{pad}"row_count": {count}{newline}}}')
+    if indent is not None:
+        out.write('\n')
+    return count
+
+
+_TABLE_SECTIONS = ('columns', 'indexes', 'constraints', 'foreign_key_details')
+
+
+def _table_sections(structure: Union[TableStructure, Dict[str, Any]]) -> Dict[str, Any]:
+    """Get the sections of a table description, in TableStructure field order, without copying them."""
+    if isinstance(structure, dict):
+        return {section: structure.get(section) for section in _TABLE_SECTIONS}
+    return {section: getattr(structure, section) for section in _TABLE_SECTIONS}
+
+
+def write_describe_all_stream(
+    tables: Iterable[Tuple[str, Optional[Union[TableStructure, Dict[str, Any]]]]],
+    database: str,
+    schema: str,
+    out: TextIO,
+    show_constraints: bool = False,
+    indent: Optional[int] = 2,
+    ndjson: bool = False
+) -> Tuple[int, List[str]]:
+    """
+    Write a describe-all result table by table, as the tables are described.
+
+    The JSON document is formatted exactly like DescribeAllResult.as_json, but each
+    table is serialized and written as soon as it arrives and then dropped, so the
+    output is never built in memory. total_tables and failed_tables come last, as in
+    DescribeAllResult, so they are known by then.
+
+    Peak memory is only bounded by the largest table when the tables are described
+    one at a time (per-table describes, or DESCRIBE_CHUNK_SIZE tables at a time in
+    pipeline mode): batched describes load the rows of the schema-wide queries first
+    and hold them until the last table is written.
+
+    In NDJSON mode every described table is written as one compact JSON object per
+    line ({"schema": ..., "table": ..., "columns": ..., ...}) and there is no envelope.
+
+    Args:
+        tables: (table name, TableStructure or section dictionary) pairs, with None
+            for the tables that could not be described
+            (e.g. PostgreSQLCatalog.iter_describe_tables)
+        database: Database name
+        schema: Schema name
+        out: Text stream to write to
+        show_constraints: Whether constraints were requested
+        indent: JSON indentation (None for compact output; ignored for NDJSON)
+        ndjson: Write one table per line instead of a single JSON document
+
+    Returns:
+        Tuple of (number of tables written, names of the tables that failed)
+    """
+    failed_tables: List[str] = []
+    count = 0
+
+    # Describe the first table before writing anything, so that a failing catalog
+    # query does not leave a half-written document behind
+    iterator = iter(tables)
+    first = next(iterator, None)
+    described = chain([first], iterator) if first is not None else iterator
+
+    if ndjson:
+        for table_name, structure in described:
+            if structure is None:
+                failed_tables.append(table_name)
+                continue
+            out.write(codec.dumps({'schema': schema, 'table': table_name, **_table_sections(structure)}))
+            out.write('\n')
+            count += 1
+        return count, failed_tables
+
+    header = {
+        'command': 'describe-all',
+        'timestamp': datetime.now().isoformat(),
+        'database': database,
+        'schema': schema,
+        'table': None,
+    }
+    newline = '\n' if indent is not None else ''
+    pad = ' ' * (indent or 0)
+    item_separator, key_separator = codec.separators(indent)
+
+    # Header without its closing brace, followed by the opening of the tables object
+    out.write(codec.dumps(header, indent=indent)[:-len(newline) - 1].rstrip())
+    out.write(f'{item_separator}{newline}{pad}"tables"{key_separator}{{')
+
+    for table_name, structure in described:
+        if structure is None:
+            failed_tables.append(table_name)
+            continue
+        table_json = codec.dumps(_table_sections(structure), indent=indent)
+        if indent is not None:
+            table_json = table_json.replace('\n', '\n' + pad * 2)
+        out.write(f'{item_separator if count else ""}{newline}{pad * 2}{codec.dumps(table_name)}{key_separator}{table_json}')
+        count += 1
+
+    failed_json = codec.dumps(failed_tables, indent=indent)
+    if indent is not None:
+        failed_json = failed_json.replace('\n', '\n' + pad)
+    out.write(f'{newline}{pad}}}' if count else '}')
+    out.write(f'{item_separator}{newline}{pad}"show_constraints"{key_separator}{codec.dumps(show_constraints)}')
+    out.write(f'{item_separator}{newline}{pad}"total_tables"{key_separator}{count}')
+    out.write(f'{item_separator}{newline}{pad}"failed_tables"{key_separator}{failed_json}{newline}}}')
+    return count, failed_tables
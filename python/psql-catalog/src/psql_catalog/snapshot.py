@@ -0,0 +1,428 @@
+"""
+Binary catalog snapshot format for psql-catalog.
+
+A snapshot stores a DescribeAllResult in a compact, memory-mappable file:
+
+    header      magic, version, section offsets and counts
+    strings     every distinct string (keys and values) stored once, UTF-8, with
+                an offset array so that string i is read without touching the others
+    index       one entry per table, sorted by table name: name string id, offset
+                and length of the table record
+    tables      one record per table: the four TableStructure sections, each with
+                its keys (string ids) followed by the row values as an array of
+                type tags and an array of 64-bit payloads (integer, float bits or
+                string id)
+    metadata    database, schema, timestamp, show_constraints and failed tables
+
+Opening a snapshot maps the file and reads the header only. Looking up a table
+binary-searches the index and decodes that table's record, so reading one table
+of a 4k-table snapshot costs a few string reads instead of parsing the whole file.
+"""
+
+import json
+import mmap
+import struct
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import codec
+from .exceptions import SnapshotError
+from .model import record_type
+from .serialization import DescribeAllResult, TableStructure
+
+MAGIC = b'PSQLCAT\x01'
+FORMAT_VERSION = 1
+
+# magic, version, flags, string count, table count, string offsets, index, metadata offset/length
+_HEADER = struct.Struct('<8sHHIIQQQI')
+_INDEX_ENTRY = struct.Struct('<IQI')
+_U8 = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+
+_SECTIONS = ('columns', 'indexes', 'constraints', 'foreign_key_details')
+
+# Section encodings
+_ABSENT, _UNIFORM, _PER_ROW = 0, 1, 2
+
+# Value tags; the first three need no payload
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STRING, _JSON = range(7)
+_CONSTANTS = (None, False, True)
+
+# String table as seen by the decoder: all strings, or the lazily filled cache
+Strings = Union[List[str], Dict[int, str]]
+
+
+class _LazyStrings(dict):
+    """String id -> string cache that decodes a string on first access."""
+
+    def __init__(self, read: Callable[[int], str]):
+        super().__init__()
+        self._read = read
+
+    def __missing__(self, string_id: int) -> str:
+        string = self[string_id] = self._read(string_id)
+        return string
+
+
+class _SnapshotWriter:
+    """Encode tables into records, interning every string."""
+
+    def __init__(self) -> None:
+        self.strings: Dict[str, int] = {}
+
+    def string_id(self, value: str) -> int:
+        """Get the id of a string, adding it to the string table on first use."""
+        string_id = self.strings.get(value)
+        if string_id is None:
+            string_id = self.strings[value] = len(self.strings)
+        return string_id
+
+    def value(self, value: Any) -> Tuple[int, int]:
+        """Encode one value as a (tag, 64-bit payload) pair."""
+        if value is None:
+            return _NONE, 0
+        if value is True:
+            return _TRUE, 0
+        if value is False:
+            return _FALSE, 0
+        if isinstance(value, str):
+            return _STRING, self.string_id(value)
+        if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            return _INT, value
+        if isinstance(value, float):
+            return _FLOAT, _I64.unpack(_F64.pack(value))[0]
+        # Anything else (large integers, Decimals, lists, ...) is kept as JSON text
+        return _JSON, self.string_id(codec.dumps(value))
+
+    def table(self, structure: TableStructure) -> bytes:
+        """Encode one table record."""
+        out = bytearray()
+        for section in _SECTIONS:
+            rows = getattr(structure, section)
+            if rows is None:
+                out += _U8.pack(_ABSENT)
+                continue
+
+            rows = [dict(row) for row in rows]
+            keys = list(rows[0]) if rows else []
+            uniform = all(list(row) == keys for row in rows)
+            out += _U8.pack(_UNIFORM if uniform else _PER_ROW) + _U32.pack(len(rows))
+            if uniform:
+                self.keys(out, keys)
+            else:
+                for row in rows:
+                    self.keys(out, list(row))
+
+            # Values are stored column-wise as one tag array and one payload array,
+            # so a section is decoded with two unpack calls
+            encoded = [self.value(value) for row in rows for value in row.values()]
+            out += bytes(tag for tag, _ in encoded)
+            out += struct.pack(f'<{len(encoded)}q', *(payload for _, payload in encoded))
+        return bytes(out)
+
+    def keys(self, out: bytearray, keys: List[str]) -> None:
+        """Append a key list."""
+        out += _U16.pack(len(keys))
+        for key in keys:
+            out += _U32.pack(self.string_id(key))
+
+
+def save_snapshot(result: DescribeAllResult, path: str) -> int:
+    """
+    Write a describe-all result to a binary snapshot file.
+
+    Args:
+        result: The describe-all result
+        path: Output file path
+
+    Returns:
+        Size of the snapshot in bytes
+
+    Raises:
+        SnapshotError: If a table has more than 65535 columns in a row
+    """
+    writer = _SnapshotWriter()
+    names = sorted(result.tables)
+    try:
+        records = [(writer.string_id(name), writer.table(result.tables[name])) for name in names]
+    except struct.error as e:
+        raise SnapshotError(f"Catalog cannot be stored in a snapshot: {e}")
+
+    encoded = [string.encode('utf-8') for string in writer.strings]
+    string_offsets = bytearray()
+    position = 0
+    for data in encoded:
+        string_offsets += _U32.pack(position)
+        position += len(data)
+    string_offsets += _U32.pack(position)
+    string_data = b''.join(encoded)
+
+    metadata = codec.dumps({
+        'command': result.command,
+        'timestamp': result.timestamp,
+        'database': result.database,
+        'schema': result.schema,
+        'table': result.table,
+        'show_constraints': result.show_constraints,
+        'total_tables': result.total_tables,
+        'failed_tables': result.failed_tables,
+    }).encode('utf-8')
+
+    strings_offset = _HEADER.size
+    index_offset = strings_offset + len(string_offsets) + len(string_data)
+    data_offset = index_offset + _INDEX_ENTRY.size * len(records)
+
+    index = bytearray()
+    position = data_offset
+    for name_id, record in records:
+        index += _INDEX_ENTRY.pack(name_id, position, len(record))
+        position += len(record)
+    metadata_offset = position
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(encoded), len(records),
+        strings_offset, index_offset, metadata_offset, len(metadata)
+    )
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(string_offsets)
+        f.write(string_data)
+        f.write(index)
+        for _, record in records:
+            f.write(record)
+        f.write(metadata)
+        return f.tell()
+
+
+class CatalogSnapshot:
+    """
+    Read-only, memory-mapped view of a binary catalog snapshot.
+
+    Only the header is read when the snapshot is opened; tables and strings are
+    decoded on access.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a snapshot file.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            SnapshotError: If the file is not a snapshot or has an unsupported version
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"'{path}' is not a catalog snapshot (empty file)")
+        self._buffer = memoryview(self._mmap)
+
+        if len(self._buffer) < _HEADER.size:
+            self.close()
+            raise SnapshotError(f"'{path}' is not a catalog snapshot")
+        (magic, version, _, self._string_count, self._table_count, self._strings_offset,
+         self._index_offset, self._metadata_offset, self._metadata_length) = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self.close()
+            raise SnapshotError(f"'{path}' is not a catalog snapshot")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise SnapshotError(f"Unsupported snapshot version {version} in '{path}'")
+
+        self._string_data_offset = self._strings_offset + _U32.size * (self._string_count + 1)
+        self._strings = _LazyStrings(self._read_string)
+        self._metadata: Optional[Dict[str, Any]] = None
+
+    def _read_string(self, string_id: int) -> str:
+        """Decode one string of the string table."""
+        start, end = struct.unpack_from('<II', self._buffer, self._strings_offset + _U32.size * string_id)
+        offset = self._string_data_offset
+        return str(self._buffer[offset + start:offset + end], 'utf-8')
+
+    def _all_strings(self) -> List[str]:
+        """Decode the whole string table at once (used when every table is read)."""
+        offsets = struct.unpack_from(f'<{self._string_count + 1}I', self._buffer, self._strings_offset)
+        data = self._buffer[self._string_data_offset:self._string_data_offset + offsets[-1]]
+        return [str(data[start:end], 'utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def _index_entry(self, position: int) -> Tuple[int, int, int]:
+        return _INDEX_ENTRY.unpack_from(self._buffer, self._index_offset + _INDEX_ENTRY.size * position)
+
+    def _table_name(self, position: int) -> str:
+        return self._strings[self._index_entry(position)[0]]
+
+    def _find(self, table_name: str) -> int:
+        """Binary-search the index; return the entry position or -1."""
+        position = bisect_left(range(self._table_count), table_name, key=self._table_name)
+        if position < self._table_count and self._table_name(position) == table_name:
+            return position
+        return -1
+
+    def _read_keys(self, offset: int, strings: Strings) -> Tuple[List[str], int]:
+        (count,) = _U16.unpack_from(self._buffer, offset)
+        ids = struct.unpack_from(f'<{count}I', self._buffer, offset + _U16.size)
+        return [strings[string_id] for string_id in ids], offset + _U16.size + _U32.size * count
+
+    def _read_values(self, offset: int, count: int, strings: Strings) -> Tuple[List[Any], int]:
+        tags = self._buffer[offset:offset + count]
+        payloads = struct.unpack_from(f'<{count}q', self._buffer, offset + count)
+        values = [
+            strings[payload] if tag == _STRING else _CONSTANTS[tag] if tag < _INT else
+            payload if tag == _INT else self._decode_other(tag, payload, strings)
+            for tag, payload in zip(tags, payloads)
+        ]
+        return values, offset + count + _I64.size * count
+
+    def _decode_other(self, tag: int, payload: int, strings: Strings) -> Any:
+        if tag == _FLOAT:
+            return _F64.unpack(_I64.pack(payload))[0]
+        if tag == _JSON:
+            return json.loads(strings[payload])
+        raise SnapshotError(f"Corrupt snapshot '{self.path}': unknown value tag {tag}")
+
+    def _read_table(self, position: int, strings: Optional[Strings] = None) -> TableStructure:
+        """Decode the table at an index position, resolving strings through strings (default: lazily)."""
+        if strings is None:
+            strings = self._strings
+        _, offset, _ = self._index_entry(position)
+        sections: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+        for section in _SECTIONS:
+            mode = self._buffer[offset]
+            offset += 1
+            if mode == _ABSENT:
+                sections[section] = None
+                continue
+
+            (row_count,) = _U32.unpack_from(self._buffer, offset)
+            offset += _U32.size
+            if mode == _UNIFORM:
+                keys, offset = self._read_keys(offset, strings)
+                values, offset = self._read_values(offset, row_count * len(keys), strings)
+                width = len(keys)
+                # Strings are already shared through the string table; records drop the per-row dicts
+                record = record_type(keys)
+                sections[section] = [
+                    record(*values[start:start + width]) for start in range(0, row_count * width, width)
+                ] if width else [{} for _ in range(row_count)]
+            else:
+                row_keys = []
+                for _ in range(row_count):
+                    keys, offset = self._read_keys(offset, strings)
+                    row_keys.append(keys)
+                values, offset = self._read_values(offset, sum(map(len, row_keys)), strings)
+                rows, start = [], 0
+                for keys in row_keys:
+                    rows.append(dict(zip(keys, values[start:start + len(keys)])))
+                    start += len(keys)
+                sections[section] = rows
+        return TableStructure(**sections)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Snapshot metadata: database, schema, timestamp, show_constraints, failed_tables, ..."""
+        if self._metadata is None:
+            start = self._metadata_offset
+            self._metadata = json.loads(str(self._buffer[start:start + self._metadata_length], 'utf-8'))
+        return self._metadata
+
+    @property
+    def database(self) -> str:
+        return self.metadata['database']
+
+    @property
+    def schema(self) -> Optional[str]:
+        return self.metadata['schema']
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromisoformat(self.metadata['timestamp'])
+
+    def table_names(self) -> List[str]:
+        """Get the names of all tables, sorted."""
+        return [self._table_name(position) for position in range(self._table_count)]
+
+    def table(self, table_name: str) -> TableStructure:
+        """
+        Decode one table.
+
+        Args:
+            table_name: Table name
+
+        Returns:
+            The table structure
+
+        Raises:
+            KeyError: If the snapshot has no such table
+        """
+        position = self._find(table_name)
+        if position < 0:
+            raise KeyError(table_name)
+        return self._read_table(position)
+
+    def get(self, table_name: str, default: Optional[TableStructure] = None) -> Optional[TableStructure]:
+        """Decode one table, or return default if the snapshot has no such table."""
+        position = self._find(table_name)
+        return self._read_table(position) if position >= 0 else default
+
+    def tables(self) -> Iterator[Tuple[str, TableStructure]]:
+        """Iterate over (table name, table structure), decoding one table at a time."""
+        strings = self._all_strings()
+        for position in range(self._table_count):
+            yield strings[self._index_entry(position)[0]], self._read_table(position, strings)
+
+    def to_result(self) -> DescribeAllResult:
+        """Decode the whole snapshot into a DescribeAllResult."""
+        metadata = self.metadata
+        return DescribeAllResult(
+            command=metadata['command'],
+            timestamp=metadata['timestamp'],
+            database=metadata['database'],
+            schema=metadata['schema'],
+            table=metadata['table'],
+            tables=dict(self.tables()),
+            show_constraints=metadata['show_constraints'],
+            total_tables=metadata['total_tables'],
+            failed_tables=metadata['failed_tables']
+        )
+
+    def __len__(self) -> int:
+        return self._table_count
+
+    def __contains__(self, table_name: object) -> bool:
+        return isinstance(table_name, str) and self._find(table_name) >= 0
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        if self._mmap is not None:
+            self._buffer.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'CatalogSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def load_snapshot(path: str) -> CatalogSnapshot:
+    """
+    Open a binary catalog snapshot.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        Memory-mapped snapshot; use it as a context manager or call close()
+
+    Raises:
+        SnapshotError: If the file is not a valid snapshot
+    """
+    return CatalogSnapshot(path)
@@ -0,0 +1,452 @@
+"""
+Offline catalog store for psql-catalog.
+
+Describe-all results of many databases are kept in a local SQLite file with
+indexes on table name, column name, data type and foreign key target, so that
+questions such as "which tables have a customer_id column?" are answered across
+every indexed database without connecting to any of them.
+
+Patterns are SQLite GLOB patterns (case-sensitive, * and ?) by default, or
+Python regular expressions with regex=True. Patterns on schema, table, column
+and type names are first matched against the small table of distinct names
+(names), and the matching names are then looked up through the indexes, so
+regular expressions and *infix* globs cost one test per distinct name instead
+of one per stored column.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .cache import database_identity, database_label, default_cache_dir
+from .serialization import TableStructure
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS databases (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    host TEXT,
+    port TEXT,
+    dbname TEXT,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tables (
+    id INTEGER PRIMARY KEY,
+    database_id INTEGER NOT NULL REFERENCES databases (id) ON DELETE CASCADE,
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    table_type TEXT
+);
+CREATE TABLE IF NOT EXISTS columns (
+    table_id INTEGER NOT NULL REFERENCES tables (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    column_name TEXT NOT NULL,
+    data_type TEXT,
+    is_nullable TEXT,
+    column_default TEXT,
+    character_maximum_length INTEGER,
+    numeric_precision INTEGER,
+    numeric_scale INTEGER
+);
+CREATE TABLE IF NOT EXISTS foreign_keys (
+    table_id INTEGER NOT NULL REFERENCES tables (id) ON DELETE CASCADE,
+    constraint_name TEXT,
+    column_name TEXT,
+    foreign_table_schema TEXT,
+    foreign_table_name TEXT,
+    foreign_column_name TEXT,
+    on_update TEXT,
+    on_delete TEXT
+);
+CREATE TABLE IF NOT EXISTS names (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (kind, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tables_database_idx ON tables (database_id);
+CREATE INDEX IF NOT EXISTS tables_name_idx ON tables (table_name);
+CREATE INDEX IF NOT EXISTS columns_table_idx ON columns (table_id);
+CREATE INDEX IF NOT EXISTS columns_name_idx ON columns (column_name);
+CREATE INDEX IF NOT EXISTS columns_type_idx ON columns (data_type);
+CREATE INDEX IF NOT EXISTS foreign_keys_table_idx ON foreign_keys (table_id);
+CREATE INDEX IF NOT EXISTS foreign_keys_target_idx ON foreign_keys (foreign_table_name, foreign_column_name);
+"""
+
+_COLUMN_FIELDS = (
+    'column_name', 'data_type', 'is_nullable', 'column_default',
+    'character_maximum_length', 'numeric_precision', 'numeric_scale'
+)
+_FOREIGN_KEY_FIELDS = (
+    'constraint_name', 'column_name', 'foreign_table_schema', 'foreign_table_name',
+    'foreign_column_name', 'on_update', 'on_delete'
+)
+
+# Table data accepted by the store: a TableStructure or the dictionary of its sections
+TableData = Union[TableStructure, Mapping[str, Any]]
+
+
+def default_store_path() -> Path:
+    """
+    Get the default catalog store file.
+
+    Uses $PSQL_CATALOG_STORE if set, otherwise catalog-store.sqlite3 in the cache
+    directory (see cache.default_cache_dir).
+    """
+    if os.environ.get('PSQL_CATALOG_STORE'):
+        return Path(os.environ['PSQL_CATALOG_STORE'])
+    return default_cache_dir() / 'catalog-store.sqlite3'
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    """SQLite REGEXP implementation (re caches the compiled patterns)."""
+    return value is not None and re.search(pattern, value) is not None
+
+
+def _section(data: TableData, name: str) -> List[Dict[str, Any]]:
+    """Get a section of a TableStructure or of its dictionary form (None becomes [])."""
+    rows = data.get(name) if isinstance(data, Mapping) else getattr(data, name)
+    return rows or []
+
+
+class CatalogStore:
+    """
+    SQLite store of catalog descriptions from many databases.
+
+    Each indexed database is replaced as a whole when it is indexed again.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create if needed) a catalog store.
+
+        Args:
+            path: SQLite file (default: default_store_path())
+        """
+        self.path = Path(path) if path else default_store_path()
+        if str(self.path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.create_function('REGEXP', 2, _regexp, deterministic=True)
+        self.connection.executescript(_SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {STORE_FORMAT_VERSION}")
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self.connection.close()
+
+    def __enter__(self) -> 'CatalogStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def replace_database(
+        self,
+        name: str,
+        schemas: Mapping[str, Mapping[str, TableData]],
+        connection_string: Optional[str] = None,
+        table_types: Optional[Mapping[Tuple[str, str], str]] = None
+    ) -> int:
+        """
+        Store the description of a database, replacing what was stored under its name.
+
+        Args:
+            name: Name of the database in the store
+            schemas: Mapping of schema name to {table name: TableStructure or section dict}
+            connection_string: Connection string the host, port and dbname are taken from
+            table_types: Optional table_type of each (schema, table)
+
+        Returns:
+            Number of stored tables
+        """
+        identity = database_identity(connection_string) if connection_string else {}
+        table_types = table_types or {}
+        table_count = 0
+        names = set()
+        with self.connection:
+            self.connection.execute("DELETE FROM databases WHERE name = ?", (name,))
+            database_id = self.connection.execute(
+                "INSERT INTO databases (name, host, port, dbname, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                (name, identity.get('host'), identity.get('port'), identity.get('dbname'), datetime.now().isoformat())
+            ).lastrowid
+
+            for schema_name, tables in schemas.items():
+                for table_name, data in tables.items():
+                    table_id = self.connection.execute(
+                        "INSERT INTO tables (database_id, schema_name, table_name, table_type) VALUES (?, ?, ?, ?)",
+                        (database_id, schema_name, table_name, table_types.get((schema_name, table_name)))
+                    ).lastrowid
+                    self.connection.executemany(
+                        "INSERT INTO columns (table_id, position, column_name, data_type, is_nullable, column_default, "
+                        "character_maximum_length, numeric_precision, numeric_scale) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (table_id, position, *(column.get(key) for key in _COLUMN_FIELDS))
+                            for position, column in enumerate(_section(data, 'columns'), 1)
+                        ]
+                    )
+                    self.connection.executemany(
+                        "INSERT INTO foreign_keys (table_id, constraint_name, column_name, foreign_table_schema, "
+                        "foreign_table_name, foreign_column_name, on_update, on_delete) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (table_id, *(fk.get(key) for key in _FOREIGN_KEY_FIELDS))
+                            for fk in _section(data, 'foreign_key_details')
+                        ]
+                    )
+                    names.add(('schema', schema_name))
+                    names.add(('table', table_name))
+                    for column in _section(data, 'columns'):
+                        names.add(('column', column.get('column_name')))
+                        names.add(('type', column.get('data_type')))
+                    for fk in _section(data, 'foreign_key_details'):
+                        names.add(('table', fk.get('foreign_table_name')))
+                        names.add(('column', fk.get('foreign_column_name')))
+                    table_count += 1
+
+            # Names of removed databases are left behind; they only cost a lookup
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO names (kind, name) VALUES (?, ?)",
+                [(kind, value) for kind, value in names if value is not None]
+            )
+        return table_count
+
+    def index_database(
+        self,
+        catalog: Any,
+        schemas: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+        batched: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Describe the schemas of a live database and store them.
+
+        Args:
+            catalog: Connected PostgreSQLCatalog
+            schemas: Schemas to index (default: every schema list_schemas returns)
+            name: Name of the database in the store (default: database_label())
+            batched: Whether to use the schema-wide describe queries
+
+        Returns:
+            Dictionary with the store name, the number of indexed schemas and tables,
+            and the failed tables as schema.table
+        """
+        name = name or database_label(catalog.connection_string)
+        if schemas is None:
+            schemas = [row['schema_name'] for row in catalog.list_schemas()]
+
+        described: Dict[str, Dict[str, Any]] = {}
+        table_types: Dict[Tuple[str, str], str] = {}
+        failed: List[str] = []
+        for schema_name in schemas:
+            tables_list = catalog.list_tables(schema_name)
+            for table_info in tables_list:
+                table_types[(schema_name, table_info['table_name'])] = table_info.get('table_type')
+            table_names = [table_info['table_name'] for table_info in tables_list]
+            described[schema_name], failed_tables = catalog.describe_tables(
+                table_names, schema_name, include_constraints=True, batched=batched
+            )
+            failed.extend(f"{schema_name}.{table_name}" for table_name in failed_tables)
+
+        table_count = self.replace_database(name, described, catalog.connection_string, table_types)
+        logger.debug(f"Indexed {table_count} tables of {name} into {self.path}")
+        return {'name': name, 'schemas': len(described), 'tables': table_count, 'failed_tables': failed}
+
+    def remove_database(self, name: str) -> bool:
+        """
+        Remove a database from the store.
+
+        Returns:
+            True if the database was stored
+        """
+        with self.connection:
+            return self.connection.execute("DELETE FROM databases WHERE name = ?", (name,)).rowcount > 0
+
+    def databases(self) -> List[Dict[str, Any]]:
+        """List the stored databases with their table and column counts."""
+        return self._fetch(
+            """
+            SELECT d.name, d.host, d.port, d.dbname, d.indexed_at,
+                   count(DISTINCT t.id) AS table_count, count(c.table_id) AS column_count
+            FROM databases d
+            LEFT JOIN tables t ON t.database_id = d.id
+            LEFT JOIN columns c ON c.table_id = t.id
+            GROUP BY d.id
+            ORDER BY d.name
+            """
+        )
+
+    def search_columns(
+        self,
+        column: Optional[str] = None,
+        table: Optional[str] = None,
+        data_type: Optional[str] = None,
+        database: Optional[str] = None,
+        schema: Optional[str] = None,
+        regex: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find columns by name, table, data type, database and schema patterns.
+
+        Args:
+            column: Column name pattern
+            table: Table name pattern
+            data_type: Data type pattern
+            database: Store database name pattern
+            schema: Schema name pattern
+            regex: Whether the patterns are regular expressions instead of GLOB patterns
+            limit: Maximum number of matches
+
+        Returns:
+            List of dictionaries with database, schema_name, table_name, column_name,
+            data_type and is_nullable
+
+        Raises:
+            ValueError: If a regular expression is invalid
+        """
+        where, params = self._filters(regex, [
+            ('c.column_name', 'column', column), ('t.table_name', 'table', table), ('c.data_type', 'type', data_type),
+            ('d.name', None, database), ('t.schema_name', 'schema', schema)
+        ])
+        return self._fetch(
+            f"""
+            SELECT d.name AS database, t.schema_name, t.table_name, c.column_name, c.data_type, c.is_nullable
+            FROM columns c
+            JOIN tables t ON t.id = c.table_id
+            JOIN databases d ON d.id = t.database_id
+            {where}
+            ORDER BY d.name, t.schema_name, t.table_name, c.position
+            """,
+            params, limit
+        )
+
+    def search_tables(
+        self,
+        table: Optional[str] = None,
+        database: Optional[str] = None,
+        schema: Optional[str] = None,
+        regex: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find tables by name, database and schema patterns.
+
+        Args:
+            table: Table name pattern
+            database: Store database name pattern
+            schema: Schema name pattern
+            regex: Whether the patterns are regular expressions instead of GLOB patterns
+            limit: Maximum number of matches
+
+        Returns:
+            List of dictionaries with database, schema_name, table_name, table_type and column_count
+
+        Raises:
+            ValueError: If a regular expression is invalid
+        """
+        where, params = self._filters(regex, [
+            ('t.table_name', 'table', table), ('d.name', None, database), ('t.schema_name', 'schema', schema)
+        ])
+        return self._fetch(
+            f"""
+            SELECT d.name AS database, t.schema_name, t.table_name, t.table_type,
+                   (SELECT count(*) FROM columns c WHERE c.table_id = t.id) AS column_count
+            FROM tables t
+            JOIN databases d ON d.id = t.database_id
+            {where}
+            ORDER BY d.name, t.schema_name, t.table_name
+            """,
+            params, limit
+        )
+
+    def search_foreign_keys(
+        self,
+        references: Optional[str] = None,
+        referenced_column: Optional[str] = None,
+        table: Optional[str] = None,
+        database: Optional[str] = None,
+        schema: Optional[str] = None,
+        regex: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find foreign keys by target table and column patterns.
+
+        Args:
+            references: Referenced (foreign) table name pattern
+            referenced_column: Referenced column name pattern
+            table: Referencing table name pattern
+            database: Store database name pattern
+            schema: Referencing schema name pattern
+            regex: Whether the patterns are regular expressions instead of GLOB patterns
+            limit: Maximum number of matches
+
+        Returns:
+            List of dictionaries with database, schema_name, table_name, column_name,
+            constraint_name, foreign_table_schema, foreign_table_name and foreign_column_name
+
+        Raises:
+            ValueError: If a regular expression is invalid
+        """
+        where, params = self._filters(regex, [
+            ('f.foreign_table_name', 'table', references), ('f.foreign_column_name', 'column', referenced_column),
+            ('t.table_name', 'table', table), ('d.name', None, database), ('t.schema_name', 'schema', schema)
+        ])
+        return self._fetch(
+            f"""
+            SELECT d.name AS database, t.schema_name, t.table_name, f.column_name, f.constraint_name,
+                   f.foreign_table_schema, f.foreign_table_name, f.foreign_column_name
+            FROM foreign_keys f
+            JOIN tables t ON t.id = f.table_id
+            JOIN databases d ON d.id = t.database_id
+            {where}
+            ORDER BY d.name, t.schema_name, t.table_name, f.constraint_name, f.column_name
+            """,
+            params, limit
+        )
+
+    @staticmethod
+    def _filters(
+        regex: bool,
+        filters: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the WHERE clause of (column, name kind, pattern) filters, skipping empty patterns.
+
+        Columns with a name kind are matched through the names table; the others
+        (the database name) directly.
+        """
+        operator = 'REGEXP' if regex else 'GLOB'
+        conditions, params = [], []
+        for column, kind, pattern in filters:
+            if pattern is None:
+                continue
+            if regex:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid regular expression '{pattern}': {e}")
+            if kind is None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(pattern)
+            else:
+                conditions.append(f"{column} IN (SELECT name FROM names WHERE kind = ? AND name {operator} ?)")
+                params.extend((kind, pattern))
+        return ("WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def _fetch(self, sql: str, params: Iterable[Any] = (), limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Run a query and return its rows as dictionaries."""
+        params = list(params)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, params)]
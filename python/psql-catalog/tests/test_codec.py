@@ -0,0 +1,97 @@
+"""
+Tests for the result dataclass codec.
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from psql_catalog import codec
+from psql_catalog.resultset import ResultSet
+from psql_catalog.serialization import (
+    DatabaseInfo,
+    DescribeAllResult,
+    DescribeResult,
+    InfoResult,
+    TableStructure,
+    create_describe_all_result,
+    create_describe_result
+)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request):
+    """Run a test with orjson (when installed) and with the json module."""
+    if request.param == "orjson":
+        if codec.orjson is None:
+            pytest.skip("orjson is not installed")
+        yield
+    else:
+        with patch.object(codec, 'orjson', None):
+            yield
+
+
+class TestCodec:
+    """Test cases for codec.dumps and codec.loads."""
+
+    def test_describe_all_round_trip_rebuilds_tables(self, backend):
+        """Test that nested TableStructure objects survive a round trip."""
+        result = create_describe_all_result(
+            {"users": TableStructure(columns=[{"column_name": "id"}], indexes=[], constraints=[])},
+            "testdb", "public", True, ["broken"]
+        )
+
+        decoded = DescribeAllResult.from_json(result.as_json(indent=2))
+
+        assert isinstance(decoded.tables["users"], TableStructure)
+        assert isinstance(decoded.timestamp, datetime)
+        assert decoded == result
+
+    def test_nested_dataclass_fields(self, backend):
+        """Test DescribeResult.structure and InfoResult.info (with its own datetime)."""
+        describe = create_describe_result([{"column_name": "id"}], [], "testdb", "public", "users")
+        info = InfoResult(
+            command="info", timestamp=datetime(2024, 1, 2, 3, 4, 5), database="testdb",
+            info=DatabaseInfo(database_name="testdb", timestamp=datetime(2024, 1, 2))
+        )
+
+        assert codec.loads(DescribeResult, codec.dumps(describe)) == describe
+        decoded_info = codec.loads(InfoResult, codec.dumps(info))
+        assert isinstance(decoded_info.info, DatabaseInfo)
+        assert decoded_info.info.timestamp == datetime(2024, 1, 2)
+
+    def test_layout_matches_json_module(self, backend):
+        """Test that indented output has the json module layout."""
+        structure = TableStructure(columns=[{"column_name": "id", "default": None}], indexes=[])
+        expected = json.dumps(
+            {"columns": [{"column_name": "id", "default": None}], "indexes": [],
+             "constraints": None, "foreign_key_details": None},
+            indent=2
+        )
+
+        assert codec.dumps(structure, indent=2) == expected
+
+    def test_special_values(self, backend):
+        """Test values json cannot encode natively and integers over 64 bits."""
+        value = {
+            "price": Decimal("1.50"),
+            "rows": ResultSet(["id"], [(1,)]),
+            "at": datetime(2024, 1, 2),
+            "big": 2 ** 70,
+        }
+
+        assert json.loads(codec.dumps(value)) == {
+            "price": "1.50", "rows": [{"id": 1}], "at": "2024-01-02T00:00:00", "big": 2 ** 70
+        }
+        with pytest.raises(TypeError):
+            codec.dumps({"x": object()})
+
+    def test_separators(self, backend):
+        """Test that separators() describes the compact output actually produced."""
+        item_separator, key_separator = codec.separators(None)
+
+        assert codec.dumps({"a": 1, "b": 2}) == '{"a"' + key_separator + '1' + item_separator + '"b"' + key_separator + '2}'
+        assert codec.separators(2) == (',', ': ')
@@ -0,0 +1,44 @@
+"""
+Tests for the table dependency graph ordering.
+"""
+
+import pytest
+
+from psql_catalog.dependency_graph import CycleDetectionError, TableDependencyGraph
+
+
+def fk(target):
+    """Foreign key detail row referencing a table."""
+    return {'foreign_table_name': target, 'constraint_name': f'fk_{target}'}
+
+
+class TestTopologicalSort:
+    """Test cases for the insert and drop orders."""
+
+    def test_chains_are_sorted(self):
+        """Test that every table comes after (insert) or before (drop) the tables it references."""
+        graph = TableDependencyGraph({'tables': {
+            'items': {'foreign_key_details': [fk('orders'), fk('products')]},
+            'orders': {'foreign_key_details': [fk('users')]},
+            'products': {'foreign_key_details': []},
+            'users': {'foreign_key_details': []},
+            'logs': {},
+        }})
+
+        insert_order = graph.get_insert_order()
+        drop_order = graph.get_drop_order()
+
+        assert sorted(insert_order) == sorted(drop_order) == ['items', 'logs', 'orders', 'products', 'users']
+        for source, target in (('items', 'orders'), ('items', 'products'), ('orders', 'users')):
+            assert insert_order.index(target) < insert_order.index(source)
+            assert drop_order.index(source) < drop_order.index(target)
+
+    def test_cycles_are_rejected(self):
+        """Test that cyclic schemas cannot be sorted."""
+        graph = TableDependencyGraph({'tables': {
+            'a': {'foreign_key_details': [fk('b')]},
+            'b': {'foreign_key_details': [fk('a')]},
+        }})
+
+        with pytest.raises(CycleDetectionError):
+            graph.get_insert_order()
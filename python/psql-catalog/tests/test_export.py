@@ -0,0 +1,116 @@
+"""
+Tests for the Arrow / Parquet export.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from psql_catalog.exceptions import ExportError
+from psql_catalog import export
+from psql_catalog.export import arrow_schema, write_catalog_arrow, write_query_result_arrow
+from psql_catalog.serialization import TableStructure
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def column(name, type_code, precision=None, scale=None):
+    """Build a DB-API description entry."""
+    return (name, type_code, None, None, precision, scale, None)
+
+
+DESCRIPTION = (
+    column('id', 23),
+    column('name', 25),
+    column('amount', 1700, 10, 2),
+    column('ratio', 1700, 65535, 65535),
+    column('created_at', 1184),
+    column('day', 1082),
+    column('tags', 1009),
+    column('doc', 3802),
+    column('elapsed', 1186),
+)
+
+ROWS = [
+    (1, 'a', Decimal('1.50'), Decimal('0.333333333333333333333'),
+     datetime(2024, 1, 1, tzinfo=timezone.utc), date(2024, 1, 1), ['x', 'y'], {'k': 1}, timedelta(seconds=5)),
+    (2, None, None, None, None, None, None, None, None),
+]
+
+
+class TestArrowExport:
+    """Test cases for the Arrow / Parquet writers."""
+
+    def test_arrow_schema_uses_postgresql_types(self):
+        """Test the mapping of PostgreSQL type OIDs to Arrow types."""
+        schema = arrow_schema(DESCRIPTION)
+
+        assert schema.field('id').type == pa.int32()
+        assert schema.field('name').type == pa.string()
+        assert schema.field('amount').type == pa.decimal128(10, 2)
+        assert schema.field('ratio').type == pa.string()
+        assert schema.field('created_at').type == pa.timestamp('us', tz='UTC')
+        assert schema.field('day').type == pa.date32()
+        assert schema.field('tags').type == pa.list_(pa.string())
+        assert schema.field('elapsed').type == pa.duration('us')
+
+    @pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+    def test_write_query_result_round_trip(self, tmp_path, file_format):
+        """Test that batches are written and read back with their values."""
+        path = str(tmp_path / f"result.{file_format}")
+        batches = [(DESCRIPTION, ROWS[:1]), (DESCRIPTION, ROWS[1:])]
+
+        assert write_query_result_arrow(iter(batches), path, file_format) == 2
+
+        if file_format == 'parquet':
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        first = table.to_pylist()[0]
+        assert first['amount'] == Decimal('1.50')
+        assert first['ratio'] == '0.333333333333333333333'
+        assert first['tags'] == ['x', 'y']
+        assert first['doc'] == '{"k": 1}'
+        assert table.column('name').to_pylist() == ['a', None]
+
+    def test_max_rows_and_empty_result(self, tmp_path):
+        """Test the row limit and that an empty result still gets a schema."""
+        path = str(tmp_path / "limited.parquet")
+        batches = [(DESCRIPTION, ROWS), (DESCRIPTION, ROWS)]
+        assert write_query_result_arrow(iter(batches), path, max_rows=3) == 3
+        assert pq.read_table(path).num_rows == 3
+
+        empty = str(tmp_path / "empty.parquet")
+        assert write_query_result_arrow(iter([(DESCRIPTION, [])]), empty) == 0
+        assert pq.read_table(empty).schema.names == [desc[0] for desc in DESCRIPTION]
+
+    def test_value_not_fitting_type(self, tmp_path):
+        """Test that a value outside its column type raises ExportError."""
+        batches = [((column('id', 23),), [(2 ** 40,)])]
+        with pytest.raises(ExportError):
+            write_query_result_arrow(iter(batches), str(tmp_path / "bad.parquet"))
+
+    def test_write_catalog(self, tmp_path):
+        """Test the describe-all snapshot layout (one row per table)."""
+        path = str(tmp_path / "catalog.parquet")
+        tables = {
+            'users': TableStructure(
+                columns=[{'column_name': 'id', 'data_type': 'integer'}],
+                indexes=[{'index_name': 'users_pkey', 'is_primary': True}]
+            )
+        }
+
+        assert write_catalog_arrow(tables, 'public', path) == 1
+        row = pq.read_table(path).to_pylist()[0]
+        assert row['schema_name'] == 'public'
+        assert row['columns'] == [{'column_name': 'id', 'data_type': 'integer'}]
+        assert row['constraints'] is None
+
+    def test_missing_pyarrow(self, tmp_path):
+        """Test the error raised when pyarrow is not installed."""
+        with patch.object(export, 'pa', None):
+            with pytest.raises(ExportError, match="pyarrow"):
+                write_query_result_arrow(iter([]), str(tmp_path / "x.parquet"))
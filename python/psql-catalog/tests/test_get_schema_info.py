@@ -0,0 +1,109 @@
+"""
+Tests for the bulk SQLAlchemy reflection of get_schema_info.
+"""
+
+import gzip
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('pydantic')
+yaml = pytest.importorskip('yaml')
+
+from psql_catalog import get_schema_info  # noqa: E402
+
+
+def make_inspector():
+    """Create an inspector mock answering the get_multi_* calls for the requested tables."""
+    inspector = MagicMock()
+    inspector.get_schema_names.return_value = ['public', 'sales']
+    inspector.get_table_names.side_effect = lambda schema: {'public': ['b', 'a', 'c'], 'sales': ['s']}[schema]
+
+    def multi(section):
+        def reflect(schema, filter_names):
+            return {(schema, name): section(name) for name in filter_names}
+        return reflect
+
+    inspector.get_multi_columns.side_effect = multi(lambda name: [
+        {'name': 'z', 'type': 'TEXT', 'nullable': True, 'default': None},
+        {'name': 'id', 'type': 'INTEGER', 'nullable': False, 'default': None, 'autoincrement': True},
+    ])
+    inspector.get_multi_pk_constraint.side_effect = multi(
+        lambda name: {'name': f'{name}_pkey', 'constrained_columns': ['id']}
+    )
+    inspector.get_multi_indexes.side_effect = multi(lambda name: [])
+    inspector.get_multi_foreign_keys.side_effect = multi(lambda name: [
+        {'name': f'{name}_fk', 'constrained_columns': ['z'], 'referred_schema': None,
+         'referred_table': 'a', 'referred_columns': ['id'], 'options': {}}
+    ] if name != 'a' else [])
+    return inspector
+
+
+class TestBulkReflection:
+    """Test cases for iter_database_schema and the YAML generation."""
+
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_tables_are_reflected_in_batches(self, workers):
+        """Test four get_multi_* queries per batch and tables yielded in schema and name order."""
+        inspector = make_inspector()
+        with patch.object(get_schema_info, 'create_engine'), \
+                patch.object(get_schema_info, 'inspect', return_value=inspector):
+            tables = list(get_schema_info.iter_database_schema(
+                'postgresql://u@h/db', ['public', 'missing', 'sales'], workers=workers, batch_size=2
+            ))
+
+        assert [(t.schema_name, t.table_name) for t in tables] == [
+            ('public', 'a'), ('public', 'b'), ('public', 'c'), ('sales', 's')
+        ]
+        assert inspector.get_multi_columns.call_count == 3
+        assert inspector.get_multi_foreign_keys.call_count == 3
+        inspector.get_columns.assert_not_called()
+        assert [c.column_name for c in tables[0].columns] == ['id', 'z']
+        assert tables[0].primary_key.constrained_columns == ['id']
+        assert tables[1].foreign_keys[0].referred_table == 'a'
+
+    def test_catalog_model(self):
+        """Test that inspect_database_catalog builds the compact describe-all model."""
+        inspector = make_inspector()
+        with patch.object(get_schema_info, 'create_engine'), \
+                patch.object(get_schema_info, 'inspect', return_value=inspector):
+            catalog = get_schema_info.inspect_database_catalog('postgresql://u@h/db', 'public')
+
+        assert list(catalog) == ['a', 'b', 'c']
+        assert catalog['b'].foreign_key_details[0]['foreign_table_name'] == 'a'
+        assert catalog['a'].constraints[0]['constraint_type'] == 'PRIMARY KEY'
+
+    def test_yaml_is_streamed_table_by_table(self, tmp_path):
+        """Test that the streamed file equals the YAML of the whole list."""
+        inspector = make_inspector()
+        with patch.object(get_schema_info, 'create_engine'), \
+                patch.object(get_schema_info, 'inspect', return_value=inspector):
+            tables = list(get_schema_info.iter_database_schema('postgresql://u@h/db', 'public'))
+        path = tmp_path / 'schema.yaml'
+
+        count = get_schema_info.generate_yaml_from_tables_schema(iter(tables), str(path))
+
+        assert count == 3
+        expected = yaml.dump([t.model_dump(mode='json') for t in tables], allow_unicode=True, sort_keys=False, indent=2)
+        assert path.read_text(encoding='utf-8') == expected
+        assert get_schema_info.generate_yaml_from_tables_schema(iter([]), str(tmp_path / 'empty.yaml')) == 0
+        assert not (tmp_path / 'empty.yaml').exists()
+
+    def test_yaml_documents_and_gzip(self, tmp_path):
+        """Test one YAML document per table and the gzip-compressed output."""
+        inspector = make_inspector()
+        with patch.object(get_schema_info, 'create_engine'), \
+                patch.object(get_schema_info, 'inspect', return_value=inspector):
+            tables = list(get_schema_info.iter_database_schema('postgresql://u@h/db', ['public', 'sales']))
+        dumped = [t.model_dump(mode='json') for t in tables]
+
+        documents = tmp_path / 'schema.yaml'
+        assert get_schema_info.generate_yaml_from_tables_schema(tables, str(documents), documents=True) == 4
+        assert documents.read_text(encoding='utf-8').startswith('---\n')
+        assert list(yaml.safe_load_all(documents.read_text(encoding='utf-8'))) == dumped
+
+        compressed = tmp_path / 'schema.yaml.gz'
+        get_schema_info.generate_yaml_from_tables_schema(tables, str(compressed))
+        with gzip.open(compressed, 'rt', encoding='utf-8') as f:
+            assert yaml.safe_load(f) == dumped
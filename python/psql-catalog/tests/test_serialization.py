@@ -2,9 +2,12 @@
 Tests for the serialization module.
 """
 
+import io
 import json
 import pytest
+from dataclasses import asdict
 from datetime import datetime
+from decimal import Decimal
 from psql_catalog.serialization import (
     JSONSerializableMixin,
     CatalogResult,
@@ -20,7 +23,10 @@ from psql_catalog.serialization import (
     create_describe_result,
     create_query_result,
     create_info_result,
-    output_json
+    output_json,
+    create_describe_all_result,
+    write_query_result_stream,
+    write_describe_all_stream
 )
 
 
@@ -309,5 +315,102 @@ class TestUtilityFunctions:
         assert len(json_str_compact) < len(json_str_pretty)
 
 
+
+class TestQueryResultStream:
+    """Test cases for write_query_result_stream."""
+
+    ROWS = [
+        {"id": 1, "name": "Ana", "tags": ["a", "b"], "meta": {"x": 1}},
+        {"id": 2, "name": "Bruno", "tags": [], "meta": None},
+    ]
+
+    @pytest.mark.parametrize("indent", [2, None])
+    def test_matches_query_result_layout(self, indent):
+        """Test that the streamed document is formatted exactly like QueryResult."""
+        out = io.StringIO()
+
+        count = write_query_result_stream("SELECT 1", iter(self.ROWS), "testdb", out, indent=indent)
+
+        streamed = json.loads(out.getvalue())
+        expected = asdict(create_query_result("SELECT 1", self.ROWS, "testdb"))
+        expected["timestamp"] = streamed["timestamp"]
+        assert count == 2
+        assert out.getvalue().rstrip("\n") == json.dumps(expected, indent=indent)
+
+    def test_max_rows_and_special_values(self):
+        """Test the row limit and values the json module cannot encode."""
+        rows = ({"n": i, "price": Decimal("1.50"), "at": datetime(2024, 1, 2)} for i in range(10))
+        out = io.StringIO()
+
+        count = write_query_result_stream("SELECT 1", rows, "testdb", out, max_rows=3)
+
+        parsed = json.loads(out.getvalue())
+        assert count == parsed["row_count"] == 3
+        assert parsed["results"][0] == {"n": 0, "price": "1.50", "at": "2024-01-02T00:00:00"}
+
+    def test_failing_query_writes_nothing(self):
+        """Test that an error on the first fetch leaves the output untouched."""
+        def failing_rows():
+            raise RuntimeError("query failed")
+            yield
+
+        out = io.StringIO()
+        with pytest.raises(RuntimeError):
+            write_query_result_stream("SELECT 1", failing_rows(), "testdb", out)
+
+        assert out.getvalue() == ""
+
+
+class TestDescribeAllStream:
+    """Test cases for write_describe_all_stream."""
+
+    TABLES = {
+        "users": TableStructure(
+            columns=[{"column_name": "id", "data_type": "integer"}],
+            indexes=[{"index_name": "users_pkey", "is_primary": True}]
+        ),
+        "orders": TableStructure(
+            columns=[{"column_name": "user_id", "data_type": "integer"}],
+            constraints=[],
+            foreign_key_details=[{"constraint_name": "orders_user_id_fkey"}]
+        ),
+    }
+
+    @pytest.mark.parametrize("indent", [2, None])
+    def test_matches_describe_all_result_layout(self, indent):
+        """Test that the streamed document is formatted exactly like DescribeAllResult."""
+        out = io.StringIO()
+        described = list(self.TABLES.items()) + [("broken", None)]
+
+        count, failed = write_describe_all_stream(iter(described), "testdb", "public", out, True, indent=indent)
+
+        streamed = json.loads(out.getvalue())
+        expected = create_describe_all_result(self.TABLES, "testdb", "public", True, ["broken"])
+        expected.timestamp = datetime.fromisoformat(streamed["timestamp"])
+        assert (count, failed) == (2, ["broken"])
+        assert out.getvalue() == expected.as_json(indent=indent)
+
+    def test_ndjson_writes_one_table_per_line(self):
+        """Test the NDJSON mode, with section dictionaries as input."""
+        out = io.StringIO()
+        described = [("users", {"columns": [{"column_name": "id"}], "indexes": []}), ("broken", None)]
+
+        count, failed = write_describe_all_stream(iter(described), "testdb", "public", out, ndjson=True)
+
+        lines = out.getvalue().splitlines()
+        assert (count, failed) == (1, ["broken"])
+        assert json.loads(lines[0]) == {
+            "schema": "public", "table": "users", "columns": [{"column_name": "id"}],
+            "indexes": [], "constraints": None, "foreign_key_details": None
+        }
+
+    def test_empty_schema(self):
+        """Test the document of a schema without tables."""
+        out = io.StringIO()
+
+        assert write_describe_all_stream(iter([]), "testdb", "public", out) == (0, [])
+        assert json.loads(out.getvalue())["tables"] == {}
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,119 @@
+"""
+Tests for the binary catalog snapshot format.
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from psql_catalog.exceptions import SnapshotError
+from psql_catalog.serialization import TableStructure, create_describe_all_result
+from psql_catalog.snapshot import CatalogSnapshot, load_snapshot, save_snapshot
+
+
+def make_result():
+    """Create a describe-all result with a few differently shaped tables."""
+    tables = {
+        'users': TableStructure(
+            columns=[
+                {'column_name': 'id', 'data_type': 'integer', 'is_nullable': 'NO', 'numeric_precision': 32},
+                {'column_name': 'name', 'data_type': 'text', 'is_nullable': 'YES', 'numeric_precision': None},
+            ],
+            indexes=[{'index_name': 'users_pkey', 'column_name': 'id', 'is_unique': True, 'is_primary': True}],
+            constraints=[{'constraint_name': 'users_pkey', 'constraint_type': 'PRIMARY KEY'}],
+            foreign_key_details=[]
+        ),
+        'orders': TableStructure(
+            columns=[{'column_name': 'total', 'data_type': 'numeric', 'ratio': 0.5, 'big': 2 ** 70}],
+            indexes=[],
+            constraints=[
+                {'constraint_name': 'orders_user_fkey', 'constraint_type': 'FOREIGN KEY'},
+                {'constraint_name': 'orders_total_check', 'check_clause': 'total > 0'},
+            ],
+            foreign_key_details=[{'constraint_name': 'orders_user_fkey', 'foreign_table_name': 'users'}]
+        ),
+        'ünïcode': TableStructure(columns=[{'column_name': 'naïve'}], indexes=[]),
+    }
+    return create_describe_all_result(tables, 'testdb', 'public', show_constraints=True, failed_tables=['broken'])
+
+
+class TestSnapshot:
+    """Test cases for save_snapshot and CatalogSnapshot."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that the whole result is restored, including heterogeneous rows and odd values."""
+        path = str(tmp_path / 'catalog.pcs')
+        result = make_result()
+
+        size = save_snapshot(result, path)
+
+        with load_snapshot(path) as snapshot:
+            assert size == (tmp_path / 'catalog.pcs').stat().st_size
+            assert len(snapshot) == 3
+            assert snapshot.table_names() == sorted(result.tables)
+            assert snapshot.database == 'testdb'
+            assert snapshot.timestamp == result.timestamp
+            assert snapshot.to_result() == result
+
+    def test_lookup_decodes_only_the_requested_table(self, tmp_path):
+        """Test that a lookup reads a handful of strings, not the whole string table."""
+        path = str(tmp_path / 'catalog.pcs')
+        result = make_result()
+        save_snapshot(result, path)
+
+        with load_snapshot(path) as snapshot, \
+                patch.object(CatalogSnapshot, '_read_table', wraps=snapshot._read_table) as read_table:
+            structure = snapshot.table('orders')
+
+            assert structure == result.tables['orders']
+            assert read_table.call_count == 1
+            assert 'users_pkey' not in snapshot._strings.values()
+
+    def test_missing_table(self, tmp_path):
+        """Test that unknown tables raise KeyError or return the default."""
+        path = str(tmp_path / 'catalog.pcs')
+        save_snapshot(make_result(), path)
+
+        with load_snapshot(path) as snapshot:
+            assert 'missing' not in snapshot
+            assert 'users' in snapshot
+            assert snapshot.get('missing') is None
+            with pytest.raises(KeyError):
+                snapshot.table('missing')
+
+    def test_absent_sections_stay_none(self, tmp_path):
+        """Test that sections that were not queried are restored as None, not empty lists."""
+        path = str(tmp_path / 'catalog.pcs')
+        result = create_describe_all_result(
+            {'users': TableStructure(columns=[], indexes=[{'index_name': 'users_pkey'}])}, 'testdb', 'public'
+        )
+        save_snapshot(result, path)
+
+        with load_snapshot(path) as snapshot:
+            structure = snapshot.table('users')
+
+        assert structure.columns == []
+        assert structure.constraints is None
+        assert structure.foreign_key_details is None
+
+    def test_values_without_native_encoding_use_json(self, tmp_path):
+        """Test that values other than scalars and strings survive as their JSON form."""
+        path = str(tmp_path / 'catalog.pcs')
+        result = create_describe_all_result(
+            {'t': TableStructure(columns=[{'default': Decimal('1.50'), 'options': ['a', 'b']}], indexes=[])},
+            'testdb', 'public'
+        )
+        save_snapshot(result, path)
+
+        with load_snapshot(path) as snapshot:
+            assert snapshot.table('t').columns == [{'default': '1.50', 'options': ['a', 'b']}]
+
+    @pytest.mark.parametrize("content", [b"", b"{\"command\": \"describe-all\"}", b"PSQLCAT\x01" + b"\x00" * 60])
+    def test_rejects_other_files(self, tmp_path, content):
+        """Test that empty files, JSON documents and unknown versions are rejected."""
+        path = tmp_path / 'catalog.pcs'
+        path.write_bytes(content)
+
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(path))